@@ -1,5 +1,19 @@
 """Backtesting module for strategy testing and evaluation"""
 
 from .engine import Backtester
+from .sweep import ParameterSweep, parameter_grid, random_samples, latin_hypercube
+from .walk_forward import WalkForward, walk_forward_windows
+from .portfolio import PortfolioBacktester, EqualWeight, VolatilityTarget, MaxPositions, build_signal_matrix
+from .monte_carlo import MonteCarlo
+from .shared_data import SharedArrays, share_frame, attach_frame, attach_arrays, attach_index
+from .result_store import ResultStore, data_fingerprint
 
-__all__ = ['Backtester']
\ No newline at end of file
+__all__ = [
+    'Backtester',
+    'ParameterSweep', 'parameter_grid', 'random_samples', 'latin_hypercube',
+    'WalkForward', 'walk_forward_windows',
+    'PortfolioBacktester', 'EqualWeight', 'VolatilityTarget', 'MaxPositions', 'build_signal_matrix',
+    'MonteCarlo',
+    'SharedArrays', 'share_frame', 'attach_frame', 'attach_arrays', 'attach_index',
+    'ResultStore', 'data_fingerprint',
+]
@@ -2,7 +2,33 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from .kernels import simulate_with_stops
+from .metrics import MetricsAccumulator
+from .profiling import Profiler, as_profiler, stage
+from .results import BacktestResult, TradeLog, equity_curve_frame
+from .shared_data import resolve_frame, share_frame, shareable
+from .vectorized import simulate_long_only, simulate_long_only_batch
+
+
+# Price data shared with signal worker processes (set once per worker)
+_signal_worker_df = None
+
+
+def _init_signal_worker(df):
+    """Store the price data (DataFrame or SharedSpec to attach) in the worker process"""
+    global _signal_worker_df
+    _signal_worker_df = resolve_frame(df)
+
+
+def _generate_signal(strategy) -> np.ndarray:
+    """Generate one strategy's signal array inside a worker"""
+    return strategy.generate_signals(_signal_worker_df)['signal'].to_numpy(dtype=float)
 
 
 class Backtester:
@@ -14,9 +40,12 @@ class Backtester:
     - Portfolio tracking over time
     - Comprehensive performance metrics
     - Multi-strategy comparison
+    - Vectorized (NumPy) execution mode for long histories
+    - Intrabar stop-loss / take-profit / trailing stops (compiled kernel)
     """
     
-    def __init__(self, initial_capital=10000, commission=0.001, slippage=0.0005):
+    def __init__(self, initial_capital=10000, commission=0.001, slippage=0.0005,
+                 stop_loss=None, take_profit=None, trailing_stop=None, result_store=None):
         """
         Initialize backtester with trading parameters
         
@@ -24,217 +53,403 @@ class Backtester:
             initial_capital: Starting portfolio value in dollars
             commission: Commission per trade as percentage (0.001 = 0.1%)
             slippage: Price slippage as percentage (0.0005 = 0.05%)
+            stop_loss: Exit when the low falls this fraction below the entry
+                price (0.05 = 5%), None to disable
+            take_profit: Exit when the high rises this fraction above the
+                entry price, None to disable
+            trailing_stop: Exit when the low falls this fraction below the
+                highest high since entry, None to disable
+            result_store: ResultStore that memoizes run_backtest on disk
+                (same strategy, settings and data return the stored result)
         """
         self.initial_capital = initial_capital
         self.commission = commission  # Trading fee per trade
         self.slippage = slippage  # Price impact when entering/exiting
+        
+        # Protective exits checked against each bar's high/low
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.trailing_stop = trailing_stop
+        
+        # Optional on-disk cache of finished runs
+        self.result_store = result_store
+    
+    @property
+    def uses_stops(self) -> bool:
+        """True if any intrabar exit is configured"""
+        return bool(self.stop_loss or self.take_profit or self.trailing_stop)
     
-    def run_backtest(self, strategy, df: pd.DataFrame) -> Dict:
+    def run_backtest(self, strategy, df: pd.DataFrame, vectorized: bool = False,
+                     keep_equity_curve: bool = True, profile=None) -> Dict:
         """
         Run backtest for a single strategy on historical data
         
         Args:
             strategy: Trading strategy object with generate_signals() method
             df: DataFrame with OHLCV data
+            vectorized: Simulate with NumPy arrays instead of looping over bars
+                (same trades, equity curve and metrics, much faster)
+            keep_equity_curve: Keep the per-bar portfolio values; when False
+                metrics are still computed (streamed while running) and
+                'equity_curve' is None
+            profile: True or a Profiler to time each stage (signals,
+                simulation, metrics) and count bars, trades and indicator
+                cache hits; the report is added as result['profile']
+        
+        When stops are configured the compiled kernel is always used (it
+        needs high/low columns); trades then also carry an 'exit_reason'.
+        
+        With a result_store, a run already stored for the same strategy
+        parameters, settings and data is loaded instead of simulated
+        (profiled runs always simulate).
         
         Returns:
             Dictionary with:
             - trades: List of all trades executed
             - equity_curve: Portfolio value over time
             - metrics: Performance metrics dictionary
+            - profile: Profiling report (only when profile is set)
         """
         
-        # Generate trading signals
-        df = strategy.generate_signals(df)
+        profiler = as_profiler(profile)
+        
+        store = self.result_store if profiler is None else None
+        if store is not None:
+            description = store.describe(strategy, self, df)
+            key = store.make_key(description)
+            stored = store.load(key, need_equity=keep_equity_curve)
+            if stored is not None:
+                return self._restore_result(stored, df.index, keep_equity_curve)
+        
+        with profiler.capture() if profiler else nullcontext():
+            # Generate trading signals
+            with stage(profiler, 'signals'):
+                df = strategy.generate_signals(df)
+            
+            if self.uses_stops:
+                result = self._run_kernel(strategy, df, keep_equity_curve, profiler)
+            elif vectorized:
+                result = self._run_vectorized(strategy, df, keep_equity_curve, profiler)
+            else:
+                result = self._run_loop(strategy, df, keep_equity_curve, profiler)
+        
+        if profiler:
+            profiler.count('bars', len(df))
+            profiler.count('trades', len(result['trades']))
+            result['profile'] = profiler.report()
+        
+        if store is not None:
+            store.save(key, description, result)
+        
+        return result
+    
+    def _restore_result(self, stored: Dict, timestamps, keep_equity_curve: bool = True) -> Dict:
+        """Rebuild a run_backtest result from ResultStore.load parts"""
+        trade_log = TradeLog(timestamps, stored['records'], stored['exit_reason'])
+        equity_values = stored['equity_values'] if keep_equity_curve else None
+        return self._make_result(stored['strategy_name'], trade_log, timestamps, equity_values, stored['metrics'])
+    
+    def _run_loop(self, strategy, df: pd.DataFrame, keep_equity_curve: bool = True,
+                  profiler: Optional[Profiler] = None) -> Dict:
+        """
+        Simulate trades bar by bar
+        
+        Args:
+            strategy: Strategy that produced the signals
+            df: DataFrame with close prices and a signal column
+            keep_equity_curve: Include the equity curve DataFrame
+            profiler: Optional Profiler for stage timings
+        
+        Returns:
+            Same dictionary as run_backtest
+        """
         
         # Initialize tracking variables
         portfolio_value = self.initial_capital  # Current portfolio value
         cash = self.initial_capital  # Available cash
         position = 0  # Current position size (0 = no position)
-        trades = []  # List of completed trades
-        equity_curve = []  # Portfolio value at each timestamp
+        trades = []  # Completed trades (entry bar, exit bar, prices, shares, exit commission)
+        equity_values = np.empty(len(df)) if keep_equity_curve else None  # Portfolio value at each bar
+        accumulator = MetricsAccumulator(self.initial_capital)  # Metrics updated bar by bar
+        entered = False  # Whether any position was ever opened
         
         # Track entry price for open positions
         entry_price = 0
-        entry_time = None
+        entry_bar = None
         
-        # Simulate trading through each bar
-        for timestamp, row in df.iterrows():
-            
-            # Get current signal
-            if pd.notna(row['signal']):
-                current_signal = row['signal']
-                
-                # BUY SIGNAL (1) - enter long position
-                if current_signal == 1 and position == 0:
-                    buy_price = row['close'] * (1 + self.slippage)
-                    commission_cost = cash * self.commission
-                    shares = (cash - commission_cost) / buy_price
-                    position = shares
-                    cash = 0
-                    entry_price = buy_price
-                    entry_time = timestamp
+        with stage(profiler, 'simulation'):
+            # Simulate trading through each bar
+            for bar, (timestamp, row) in enumerate(df.iterrows()):
                 
-                # SELL SIGNAL (-1) OR HOLD (0) - exit if we have position
-                elif (current_signal == -1 or current_signal == 0) and position > 0:
-                    sell_price = row['close'] * (1 - self.slippage)
-                    sale_proceeds = position * sell_price
-                    commission_cost = sale_proceeds * self.commission
-                    cash = sale_proceeds - commission_cost
+                # Get current signal
+                if pd.notna(row['signal']):
+                    current_signal = row['signal']
                     
-                    trade_return = ((sell_price - entry_price) / entry_price) * 100
+                    # BUY SIGNAL (1) - enter long position
+                    if current_signal == 1 and position == 0:
+                        buy_price = row['close'] * (1 + self.slippage)
+                        commission_cost = cash * self.commission
+                        shares = (cash - commission_cost) / buy_price
+                        position = shares
+                        cash = 0
+                        entry_price = buy_price
+                        entry_bar = bar
+                        entered = True
                     
-                    trades.append({
-                        'entry_time': entry_time,
-                        'exit_time': timestamp,
-                        'entry_price': entry_price,
-                        'exit_price': sell_price,
-                        'shares': position,
-                        'return_pct': trade_return,
-                        'pnl': (sell_price - entry_price) * position - (commission_cost * 2)
-                    })
-                    
-                    position = 0
-                    entry_price = 0
-                    entry_time = None
-            
-            # Calculate current portfolio value
-            if position > 0:
-                # If holding position, value = cash + position value
-                portfolio_value = cash + (position * row['close'])
-            else:
-                # If no position, value = cash only
-                portfolio_value = cash
-            
-            # Record portfolio value at this timestamp
-            equity_curve.append({
-                'timestamp': timestamp,
-                'portfolio_value': portfolio_value
-            })
+                    # SELL SIGNAL (-1) OR HOLD (0) - exit if we have position
+                    elif (current_signal == -1 or current_signal == 0) and position > 0:
+                        sell_price = row['close'] * (1 - self.slippage)
+                        sale_proceeds = position * sell_price
+                        commission_cost = sale_proceeds * self.commission
+                        cash = sale_proceeds - commission_cost
+                        
+                        trade_return = ((sell_price - entry_price) / entry_price) * 100
+                        pnl = (sell_price - entry_price) * position - (commission_cost * 2)
+                        
+                        trades.append((entry_bar, bar, entry_price, sell_price, position, commission_cost))
+                        accumulator.add_trade(trade_return, pnl)
+                        
+                        position = 0
+                        entry_price = 0
+                        entry_bar = None
+                
+                # Calculate current portfolio value
+                if position > 0:
+                    # If holding position, value = cash + position value
+                    portfolio_value = cash + (position * row['close'])
+                else:
+                    # If no position, value = cash only
+                    portfolio_value = cash
+                
+                # Record portfolio value at this timestamp
+                accumulator.update(portfolio_value)
+                if keep_equity_curve:
+                    equity_values[bar] = portfolio_value
         
-        # Calculate performance metrics
-        metrics = self._calculate_metrics(trades, equity_curve)
+        # Never traded: the value stays exactly the starting capital (and its type)
+        if keep_equity_curve and not entered:
+            equity_values = np.full(len(df), self.initial_capital)
+        
+        with stage(profiler, 'metrics'):
+            # Calculate performance metrics
+            metrics = accumulator.metrics()
+            
+            # Pack the trades into a structured-array log
+            columns = list(zip(*trades)) if trades else [[]] * 6
+            trade_log = TradeLog.from_arrays(df.index, *[np.asarray(col) for col in columns])
         
         # Return results
-        return {
-            'strategy_name': strategy.name,
-            'trades': trades,
-            'equity_curve': pd.DataFrame(equity_curve),
+        return self._make_result(strategy.name, trade_log, df.index, equity_values, metrics)
+    
+    def _run_vectorized(self, strategy, df: pd.DataFrame, keep_equity_curve: bool = True,
+                        profiler: Optional[Profiler] = None) -> Dict:
+        """
+        Simulate trades on signal arrays instead of iterating rows
+        
+        Args:
+            strategy: Strategy that produced the signals
+            df: DataFrame with close prices and a signal column
+            keep_equity_curve: Include the equity curve DataFrame
+            profiler: Optional Profiler for stage timings
+        
+        Returns:
+            Same dictionary as run_backtest
+        """
+        return self._simulate_arrays(
+            strategy.name,
+            df.index,
+            df['close'].to_numpy(dtype=float),
+            df['signal'].to_numpy(dtype=float),
+            keep_equity_curve,
+            profiler
+        )
+    
+    def _simulate_arrays(self, strategy_name, timestamps, close, signal, keep_equity_curve: bool = True,
+                         profiler: Optional[Profiler] = None) -> Dict:
+        """
+        Vectorized simulation of aligned timestamp, close and signal arrays
+        
+        Args:
+            strategy_name: Name reported in the result
+            timestamps: Index of bar timestamps
+            close: Array of closing prices
+            signal: Array of signals
+            keep_equity_curve: Include the equity curve DataFrame
+            profiler: Optional Profiler for stage timings
+        
+        Returns:
+            Same dictionary as run_backtest
+        """
+        
+        # Run the array simulation
+        with stage(profiler, 'simulation'):
+            sim = simulate_long_only(close, signal, self.initial_capital, self.commission, self.slippage)
+        
+        with stage(profiler, 'metrics'):
+            return self._build_result(strategy_name, timestamps, sim, keep_equity_curve)
+    
+    def _run_kernel(self, strategy, df: pd.DataFrame, keep_equity_curve: bool = True,
+                    profiler: Optional[Profiler] = None) -> Dict:
+        """
+        Simulate with the compiled bar kernel, including intrabar stops
+        
+        Args:
+            strategy: Strategy that produced the signals
+            df: DataFrame with OHLC prices and a signal column
+            keep_equity_curve: Include the equity curve DataFrame
+            profiler: Optional Profiler for stage timings
+        
+        Returns:
+            Same dictionary as run_backtest
+        """
+        with stage(profiler, 'simulation'):
+            sim = simulate_with_stops(
+                df['open'].to_numpy(dtype=float),
+                df['high'].to_numpy(dtype=float),
+                df['low'].to_numpy(dtype=float),
+                df['close'].to_numpy(dtype=float),
+                df['signal'].to_numpy(dtype=float),
+                self.initial_capital, self.commission, self.slippage,
+                self.stop_loss, self.take_profit, self.trailing_stop
+            )
+        
+        with stage(profiler, 'metrics'):
+            return self._build_result(strategy.name, df.index, sim, keep_equity_curve)
+    
+    def _build_result(self, strategy_name, timestamps, sim, keep_equity_curve: bool = True) -> Dict:
+        """
+        Turn simulation arrays into the run_backtest result dictionary
+        
+        Args:
+            strategy_name: Name reported in the result
+            timestamps: Index of bar timestamps
+            sim: Arrays returned by simulate_long_only / simulate_with_stops
+            keep_equity_curve: Include the equity curve DataFrame
+        
+        Returns:
+            Same dictionary as run_backtest
+        """
+        
+        # Trade log from completed round trips only
+        n_trades = len(sim['exit_idx'])
+        trade_log = TradeLog.from_arrays(
+            timestamps,
+            sim['entry_idx'][:n_trades],
+            sim['exit_idx'],
+            sim['entry_price'][:n_trades],
+            sim['exit_price'],
+            sim['shares'][:n_trades],
+            sim['exit_commission'],
+            sim.get('exit_reason')
+        )
+        
+        # Calculate performance metrics straight from the value array
+        metrics = self._calculate_metrics(trade_log, sim['portfolio_value'])
+        
+        equity_values = sim['portfolio_value'] if keep_equity_curve else None
+        return self._make_result(strategy_name, trade_log, timestamps, equity_values, metrics)
+    
+    def _make_result(self, strategy_name, trade_log, timestamps, equity_values, metrics) -> Dict:
+        """
+        Result dictionary with the equity curve DataFrame built on first access
+        
+        Args:
+            strategy_name: Name reported in the result
+            trade_log: TradeLog of completed trades
+            timestamps: Index of bar timestamps
+            equity_values: Portfolio value array (None to leave out the equity curve)
+            metrics: Performance metrics dictionary
+        
+        Returns:
+            BacktestResult with strategy_name, trades, equity_curve and metrics
+        """
+        
+        lazy = {}
+        if equity_values is not None:
+            lazy['equity_curve'] = partial(equity_curve_frame, timestamps, equity_values)
+        
+        result = BacktestResult({
+            'strategy_name': strategy_name,
+            'trades': trade_log,
             'metrics': metrics
-        }
+        }, lazy=lazy)
+        if equity_values is None:
+            result['equity_curve'] = None
+        
+        # Raw portfolio values stay reachable without building the DataFrame
+        result.equity_values = equity_values
+        return result
     
-    def _calculate_metrics(self, trades: List[Dict], equity_curve: List[Dict]) -> Dict:
+    def _calculate_metrics(self, trades: List[Dict], equity_curve) -> Dict:
         """
         Calculate comprehensive performance metrics
         
         Args:
             trades: List of trade dictionaries
-            equity_curve: List of portfolio values over time
+            equity_curve: List of portfolio values over time (dicts with a
+                portfolio_value key), a DataFrame with a portfolio_value
+                column, or an array of portfolio values
         
         Returns:
             Dictionary of performance metrics
         """
         
-        # Convert equity curve to DataFrame for easier calculations
-        equity_df = pd.DataFrame(equity_curve)
-        
-        # Handle case with no trades
-        if len(trades) == 0:
-            return {
-                'total_return': 0,
-                'total_trades': 0,
-                'winning_trades': 0,
-                'losing_trades': 0,
-                'win_rate': 0,
-                'avg_win': 0,
-                'avg_loss': 0,
-                'profit_factor': 0,
-                'max_drawdown': 0,
-                'sharpe_ratio': 0,
-                'final_portfolio_value': self.initial_capital
-            }
-        
-        # Calculate basic metrics
-        final_value = equity_df['portfolio_value'].iloc[-1]
-        total_return = ((final_value - self.initial_capital) / self.initial_capital) * 100
-        
-        # Trade statistics
-        winning_trades = [t for t in trades if t['return_pct'] > 0]
-        losing_trades = [t for t in trades if t['return_pct'] <= 0]
-        
-        total_trades = len(trades)
-        num_wins = len(winning_trades)
-        num_losses = len(losing_trades)
-        win_rate = (num_wins / total_trades * 100) if total_trades > 0 else 0
-        
-        # Average win/loss
-        avg_win = np.mean([t['return_pct'] for t in winning_trades]) if winning_trades else 0
-        avg_loss = np.mean([t['return_pct'] for t in losing_trades]) if losing_trades else 0
-        
-        # Profit factor (total wins / total losses)
-        total_wins = sum([t['pnl'] for t in winning_trades]) if winning_trades else 0
-        total_losses = abs(sum([t['pnl'] for t in losing_trades])) if losing_trades else 1
-        profit_factor = total_wins / total_losses if total_losses != 0 else 0
-        
-        # Calculate max drawdown (worst peak-to-trough decline)
-        equity_df['cummax'] = equity_df['portfolio_value'].cummax()  # Running maximum
-        equity_df['drawdown'] = (equity_df['portfolio_value'] - equity_df['cummax']) / equity_df['cummax'] * 100
-        max_drawdown = equity_df['drawdown'].min()  # Most negative drawdown
-        
-        # Calculate Sharpe ratio (risk-adjusted return)
-        # First calculate returns between each timestamp
-        equity_df['returns'] = equity_df['portfolio_value'].pct_change()
-        
-        # Sharpe = (mean return - risk free rate) / std deviation of returns
-        # Assuming 0% risk-free rate for simplicity
-        mean_return = equity_df['returns'].mean()
-        std_return = equity_df['returns'].std()
-        
-        # Annualize Sharpe ratio (assuming daily data, 252 trading days/year)
-        periods_per_year = 252  # For daily data
-        sharpe_ratio = (mean_return / std_return) * np.sqrt(periods_per_year) if std_return != 0 else 0
-        
-        # Return all metrics
-        return {
-            'total_return': total_return,
-            'total_trades': total_trades,
-            'winning_trades': num_wins,
-            'losing_trades': num_losses,
-            'win_rate': win_rate,
-            'avg_win': avg_win,
-            'avg_loss': avg_loss,
-            'profit_factor': profit_factor,
-            'max_drawdown': max_drawdown,
-            'sharpe_ratio': sharpe_ratio,
-            'final_portfolio_value': final_value
-        }
+        # Extract the portfolio values
+        if isinstance(equity_curve, pd.DataFrame):
+            values = equity_curve['portfolio_value'].to_numpy(dtype=float)
+        elif isinstance(equity_curve, list):
+            values = np.fromiter((row['portfolio_value'] for row in equity_curve), dtype=float,
+                                 count=len(equity_curve))
+        else:
+            values = np.asarray(equity_curve, dtype=float)
+        
+        # Same streaming calculation the bar loop uses, fed in one go
+        accumulator = MetricsAccumulator(self.initial_capital)
+        if isinstance(trades, TradeLog):
+            accumulator.add_trades(trades.column('return_pct'), trades.column('pnl'))
+        else:
+            for trade in trades:
+                accumulator.add_trade(trade['return_pct'], trade['pnl'])
+        accumulator.update_many(values)
+        
+        return accumulator.metrics()
     
-    def compare_strategies(self, strategies: List, df: pd.DataFrame) -> pd.DataFrame:
+    def compare_strategies(self, strategies: List, df: pd.DataFrame, batched: bool = False,
+                           max_workers: Optional[int] = None) -> pd.DataFrame:
         """
         Run multiple strategies on same data and compare results
         
         Args:
             strategies: List of strategy objects
             df: DataFrame with OHLCV data
+            batched: Generate every strategy's signals on one shared price
+                frame and simulate them all in a single 2-D array pass
+                (same comparison, much faster for many strategies)
+            max_workers: With batched=True, generate signals in this many
+                worker processes (None or 1 = in-process, worth it only
+                for expensive strategies)
         
         Returns:
             DataFrame comparing all strategies' performance
         """
         
-        results = []
-        
-        # Run backtest for each strategy
-        for strategy in strategies:
-            print(f"Testing {strategy.name}...")
-            
-            # Run backtest
-            result = self.run_backtest(strategy, df.copy())
-            
-            # Extract metrics
-            metrics = result['metrics']
-            metrics['strategy'] = strategy.name
+        if batched:
+            results = self._compare_batched(strategies, df, max_workers)
+        else:
+            results = []
             
-            results.append(metrics)
+            # Run backtest for each strategy
+            for strategy in strategies:
+                print(f"Testing {strategy.name}...")
+                
+                # Run backtest
+                result = self.run_backtest(strategy, df.copy())
+                
+                # Extract metrics
+                metrics = result['metrics']
+                metrics['strategy'] = strategy.name
+                
+                results.append(metrics)
         
         # Convert to DataFrame for easy comparison
         comparison_df = pd.DataFrame(results)
@@ -243,4 +458,68 @@ class Backtester:
         cols = ['strategy'] + [col for col in comparison_df.columns if col != 'strategy']
         comparison_df = comparison_df[cols]
         
-        return comparison_df
\ No newline at end of file
+        return comparison_df
+    
+    def _compare_batched(self, strategies: List, df: pd.DataFrame, max_workers: Optional[int]) -> List[Dict]:
+        """
+        Metrics of every strategy from one stacked signal matrix
+        
+        Args:
+            strategies: List of strategy objects
+            df: DataFrame with OHLCV data (read-only, never copied per strategy)
+            max_workers: Processes used for signal generation
+        
+        Returns:
+            List of metrics dictionaries with a 'strategy' key
+        """
+        
+        start = time.perf_counter()
+        
+        # Stack all signals into a (bars x strategies) matrix
+        if max_workers and max_workers > 1 and len(strategies) > 1:
+            # Workers attach to one shared copy of the prices
+            with share_frame(df) if shareable(df) else nullcontext() as shared:
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_signal_worker,
+                                         initargs=(shared.spec if shared else df,)) as executor:
+                    columns = list(executor.map(_generate_signal, strategies))
+        else:
+            _init_signal_worker(df)
+            columns = [_generate_signal(strategy) for strategy in strategies]
+        signals = np.column_stack(columns) if columns else np.empty((len(df), 0))
+        
+        results = self.batch_metrics(df, signals)
+        for strategy, metrics in zip(strategies, results):
+            metrics['strategy'] = strategy.name
+        
+        elapsed = time.perf_counter() - start
+        print(f"✓ Compared {len(strategies)} strategies in {elapsed:.1f}s")
+        
+        return results
+    
+    def batch_metrics(self, df: pd.DataFrame, signals, profiler: Optional[Profiler] = None) -> List[Dict]:
+        """
+        Metrics of every column of a signal matrix on the same prices
+        
+        Args:
+            df: DataFrame with OHLCV data
+            signals: (bars x strategies) array of signals
+            profiler: Optional Profiler for stage timings
+        
+        Returns:
+            List with one metrics dictionary per column
+        """
+        
+        # Simulate every column at once (stops need the per-strategy kernel)
+        with stage(profiler, 'simulation'):
+            if self.uses_stops:
+                prices = [df[col].to_numpy(dtype=float) for col in ['open', 'high', 'low', 'close']]
+                sims = [simulate_with_stops(*prices, np.asarray(signals[:, k], dtype=float), self.initial_capital,
+                                            self.commission, self.slippage, self.stop_loss, self.take_profit,
+                                            self.trailing_stop)
+                        for k in range(signals.shape[1])]
+            else:
+                sims = simulate_long_only_batch(df['close'].to_numpy(dtype=float), signals,
+                                                self.initial_capital, self.commission, self.slippage)
+        
+        with stage(profiler, 'metrics'):
+            return [self._build_result(None, df.index, sim, keep_equity_curve=False)['metrics'] for sim in sims]
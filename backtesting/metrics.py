@@ -0,0 +1,185 @@
+"""Online (streaming) performance metrics for backtests"""
+
+import math
+from typing import Dict
+
+import numpy as np
+
+
+class MetricsAccumulator:
+    """
+    Builds Backtester metrics while the backtest runs, without keeping the equity curve
+
+    Portfolio values are buffered in fixed-size blocks. Each full block is
+    folded into running statistics:
+    - mean/variance of bar returns, merged block by block (Welford / Chan)
+    - running peak and worst drawdown
+    - last value for the final portfolio value and the next block's first return
+    Trades are tallied as they close (wins, losses, return and P&L sums).
+
+    Memory stays at one block no matter how long the run is. Values are
+    always folded on the same block boundaries, so feeding bars one at a time
+    (update) or as arrays (update_many) gives bit-identical metrics.
+    """
+
+    def __init__(self, initial_capital, periods_per_year=252, block_size=4096):
+        """
+        Initialize accumulator
+
+        Args:
+            initial_capital: Starting portfolio value (used for total return)
+            periods_per_year: Bars per year for annualizing the Sharpe ratio
+            block_size: Portfolio values buffered before folding
+        """
+        self.initial_capital = initial_capital
+        self.periods_per_year = periods_per_year
+
+        self._buffer = np.empty(block_size)
+        self._buffered = 0
+
+        # Equity statistics
+        self.n_bars = 0
+        self.last_value = None
+        self.peak = -np.inf
+        self.max_drawdown = np.inf
+        self.n_returns = 0
+        self.mean_return = 0.0
+        self.m2_return = 0.0  # Sum of squared deviations from the mean
+
+        # Trade tallies
+        self.num_wins = 0
+        self.num_losses = 0
+        self.win_return_sum = 0.0
+        self.loss_return_sum = 0.0
+        self.win_pnl = 0.0
+        self.loss_pnl = 0.0
+
+    def update(self, portfolio_value):
+        """Add the portfolio value of one bar"""
+        self._buffer[self._buffered] = portfolio_value
+        self._buffered += 1
+        if self._buffered == len(self._buffer):
+            self._flush()
+
+    def update_many(self, portfolio_values):
+        """Add the portfolio values of consecutive bars"""
+        values = np.asarray(portfolio_values, dtype=float)
+        position = 0
+        while position < len(values):
+            take = min(len(self._buffer) - self._buffered, len(values) - position)
+            self._buffer[self._buffered:self._buffered + take] = values[position:position + take]
+            self._buffered += take
+            position += take
+            if self._buffered == len(self._buffer):
+                self._flush()
+
+    def add_trade(self, return_pct, pnl):
+        """Tally one closed trade"""
+        if return_pct > 0:
+            self.num_wins += 1
+            self.win_return_sum += return_pct
+            self.win_pnl += pnl
+        else:
+            self.num_losses += 1
+            self.loss_return_sum += return_pct
+            self.loss_pnl += pnl
+
+    def add_trades(self, return_pct, pnl):
+        """Tally closed trades from aligned arrays (in order, same sums as add_trade)"""
+        for trade_return, trade_pnl in zip(np.asarray(return_pct).tolist(), np.asarray(pnl).tolist()):
+            self.add_trade(trade_return, trade_pnl)
+
+    def _flush(self):
+        """Fold the buffered block into the running statistics"""
+
+        block = self._buffer[:self._buffered]
+        self._buffered = 0
+        if len(block) == 0:
+            return
+
+        # Drawdown against the peak so far
+        peaks = np.maximum.accumulate(block)
+        np.maximum(peaks, self.peak, out=peaks)
+        drawdown = (block - peaks) / peaks * 100
+        self.peak = peaks[-1]
+        self.max_drawdown = min(self.max_drawdown, drawdown.min())
+
+        # Bar returns, including the step from the previous block
+        if self.last_value is not None:
+            values = np.concatenate(([self.last_value], block))
+        else:
+            values = block
+        returns = values[1:] / values[:-1] - 1
+
+        # Merge block mean/variance into the running totals (Chan et al.)
+        if len(returns):
+            count = len(returns)
+            mean = returns.mean()
+            m2 = ((returns - mean) ** 2).sum()
+            total = self.n_returns + count
+            delta = mean - self.mean_return
+            self.mean_return += delta * count / total
+            self.m2_return += m2 + delta ** 2 * self.n_returns * count / total
+            self.n_returns = total
+
+        self.n_bars += len(block)
+        self.last_value = block[-1]
+
+    def metrics(self) -> Dict:
+        """
+        Metrics of everything added so far
+
+        Returns:
+            Same dictionary as Backtester._calculate_metrics
+        """
+
+        self._flush()
+        total_trades = self.num_wins + self.num_losses
+
+        # Handle case with no trades
+        if total_trades == 0:
+            return {
+                'total_return': 0,
+                'total_trades': 0,
+                'winning_trades': 0,
+                'losing_trades': 0,
+                'win_rate': 0,
+                'avg_win': 0,
+                'avg_loss': 0,
+                'profit_factor': 0,
+                'max_drawdown': 0,
+                'sharpe_ratio': 0,
+                'final_portfolio_value': self.initial_capital
+            }
+
+        final_value = self.last_value
+        total_return = ((final_value - self.initial_capital) / self.initial_capital) * 100
+
+        win_rate = self.num_wins / total_trades * 100
+        avg_win = self.win_return_sum / self.num_wins if self.num_wins else 0
+        avg_loss = self.loss_return_sum / self.num_losses if self.num_losses else 0
+
+        # Profit factor (total wins / total losses)
+        total_losses = abs(self.loss_pnl) if self.num_losses else 1
+        profit_factor = self.win_pnl / total_losses if total_losses != 0 else 0
+
+        # Sharpe from the sample standard deviation of bar returns
+        std_return = math.sqrt(self.m2_return / (self.n_returns - 1)) if self.n_returns > 1 else np.nan
+        if std_return != 0:
+            sharpe_ratio = (self.mean_return / std_return) * np.sqrt(self.periods_per_year)
+        else:
+            sharpe_ratio = 0
+
+        return {
+            'total_return': total_return,
+            'total_trades': total_trades,
+            'winning_trades': self.num_wins,
+            'losing_trades': self.num_losses,
+            'win_rate': win_rate,
+            'avg_win': avg_win,
+            'avg_loss': avg_loss,
+            'profit_factor': profit_factor,
+            'max_drawdown': self.max_drawdown,
+            'sharpe_ratio': sharpe_ratio,
+            'final_portfolio_value': final_value
+        }
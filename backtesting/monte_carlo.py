@@ -0,0 +1,255 @@
+"""Monte Carlo robustness checks: resample trade or bar returns and look at the spread of outcomes"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .results import TradeLog
+
+METHODS = ('bootstrap', 'block', 'shuffle')
+
+# Resampled values held in memory at once (rows x returns per batch)
+MAX_BATCH_ELEMENTS = 20_000_000
+
+
+def trade_returns(trades) -> np.ndarray:
+    """
+    Net return of each trade as a fraction of the capital it used
+
+    Args:
+        trades: run_backtest()['trades'] (TradeLog or list of trade dicts)
+
+    Returns:
+        Array of per-trade returns (0.05 = +5%) after commissions
+    """
+    if isinstance(trades, TradeLog):
+        pnl, price, shares = trades.column('pnl'), trades.column('entry_price'), trades.column('shares')
+    else:
+        pnl = np.array([t['pnl'] for t in trades], dtype=float)
+        price = np.array([t['entry_price'] for t in trades], dtype=float)
+        shares = np.array([t['shares'] for t in trades], dtype=float)
+    return pnl / (price * shares)
+
+
+def equity_returns(equity_curve) -> np.ndarray:
+    """
+    Bar-to-bar returns of an equity curve
+
+    Args:
+        equity_curve: DataFrame with a portfolio_value column, or an array of values
+
+    Returns:
+        Array of returns (one fewer than the number of bars)
+    """
+    if isinstance(equity_curve, pd.DataFrame):
+        values = equity_curve['portfolio_value'].to_numpy(dtype=float)
+    else:
+        values = np.asarray(equity_curve, dtype=float)
+    return values[1:] / values[:-1] - 1
+
+
+def resample_indices(rng: np.random.Generator, n_rows: int, n_returns: int,
+                     method: str, block_size: int = 5) -> np.ndarray:
+    """
+    Index matrix picking which return goes where in each simulated path
+
+    Args:
+        rng: NumPy random generator
+        n_rows: Number of simulated paths
+        n_returns: Length of the original return sequence (and of each path)
+        method: 'bootstrap' (draw with replacement), 'block' (circular blocks
+            of consecutive returns, keeps autocorrelation/streaks) or
+            'shuffle' (random order of the same returns)
+        block_size: Returns per block for 'block'
+
+    Returns:
+        (n_rows x n_returns) integer array
+    """
+    if method == 'bootstrap':
+        return rng.integers(0, n_returns, (n_rows, n_returns))
+
+    if method == 'block':
+        n_blocks = -(-n_returns // block_size)
+        starts = rng.integers(0, n_returns, (n_rows, n_blocks, 1))
+        idx = (starts + np.arange(block_size)) % n_returns
+        return idx.reshape(n_rows, -1)[:, :n_returns]
+
+    if method == 'shuffle':
+        return rng.permuted(np.broadcast_to(np.arange(n_returns), (n_rows, n_returns)), axis=1)
+
+    raise ValueError(f"Unknown method: {method} (expected one of {METHODS})")
+
+
+def path_metrics(returns: np.ndarray, periods_per_year: float) -> Dict[str, np.ndarray]:
+    """
+    Total return, max drawdown and Sharpe of each row of a return matrix
+
+    Uses the same conventions as Backtester metrics (percentages, drawdown
+    measured from the running peak including the starting capital).
+
+    Args:
+        returns: (paths x periods) array of returns
+        periods_per_year: Periods per year for annualizing the Sharpe ratio
+
+    Returns:
+        Dictionary of arrays, one value per path
+    """
+    equity = np.cumprod(1 + returns, axis=1)
+    peaks = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    drawdown = np.minimum(((equity - peaks) / peaks).min(axis=1), 0.0)
+
+    mean = returns.mean(axis=1)
+    std = returns.std(axis=1, ddof=1) if returns.shape[1] > 1 else np.full(len(returns), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(periods_per_year), 0.0)
+
+    return {
+        'total_return': (equity[:, -1] - 1) * 100,
+        'max_drawdown': drawdown * 100,
+        'sharpe_ratio': sharpe,
+    }
+
+
+def _simulate_batch(returns: np.ndarray, n_rows: int, method: str, block_size: int,
+                    periods_per_year: float, seed) -> Dict[str, np.ndarray]:
+    """Simulate one batch of paths (runs in-process or in a worker)"""
+    rng = np.random.default_rng(seed)
+    idx = resample_indices(rng, n_rows, len(returns), method, block_size)
+    return path_metrics(returns[idx], periods_per_year)
+
+
+class MonteCarlo:
+    """
+    Resampling engine for backtest results
+
+    Paths are generated in batches as 2-D NumPy arrays (one row per path), so
+    tens of thousands of simulations cost a few array operations each. Each
+    batch gets its own child seed, which makes results identical whether the
+    batches run in-process or across worker processes.
+    """
+
+    def __init__(self, n_simulations: int = 10000, method: str = 'bootstrap', block_size: int = 5,
+                 percentiles: Iterable[float] = (5, 25, 50, 75, 95), seed: Optional[int] = None,
+                 batch_size: int = 5000, max_workers: Optional[int] = 1):
+        """
+        Initialize Monte Carlo engine
+
+        Args:
+            n_simulations: Number of resampled paths
+            method: 'bootstrap', 'block' or 'shuffle' (see resample_indices)
+            block_size: Block length for the block bootstrap
+            percentiles: Percentiles reported in the summary
+            seed: Random seed for reproducible results
+            batch_size: Paths simulated per batch (reduced automatically for
+                long return series to bound memory)
+            max_workers: Worker processes (1 = in-process, None = all cores)
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown method: {method} (expected one of {METHODS})")
+
+        self.n_simulations = n_simulations
+        self.method = method
+        self.block_size = block_size
+        self.percentiles = list(percentiles)
+        self.seed = seed
+        self.batch_size = batch_size
+        self.max_workers = max_workers or os.cpu_count()
+
+    def run(self, returns, periods_per_year: float = 252) -> Dict:
+        """
+        Resample a return sequence
+
+        Args:
+            returns: Per-trade or per-bar returns (fractions)
+            periods_per_year: Return periods per year for the Sharpe ratio
+
+        Returns:
+            Dictionary with:
+            - samples: DataFrame with total_return, max_drawdown and
+              sharpe_ratio of every simulated path
+            - summary: DataFrame of mean, std and percentiles per metric
+            - observed: Metrics of the original sequence
+            - probability_of_loss: Share of paths ending below the start
+        """
+
+        started = time.perf_counter()
+        returns = np.asarray(returns, dtype=float)
+        if len(returns) < 2:
+            raise ValueError("Need at least 2 returns to resample")
+
+        # Batches sized so rows x returns stays bounded
+        rows = max(1, min(self.batch_size, MAX_BATCH_ELEMENTS // len(returns)))
+        sizes = [rows] * (self.n_simulations // rows)
+        if self.n_simulations % rows:
+            sizes.append(self.n_simulations % rows)
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        tasks = [(returns, size, self.method, self.block_size, periods_per_year, seed)
+                 for size, seed in zip(sizes, seeds)]
+
+        if self.max_workers == 1 or len(tasks) == 1:
+            batches = [_simulate_batch(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                batches = list(executor.map(_simulate_batch, *zip(*tasks)))
+
+        samples = pd.DataFrame({key: np.concatenate([batch[key] for batch in batches]) for key in batches[0]})
+        observed = {key: value[0] for key, value in path_metrics(returns[None, :], periods_per_year).items()}
+
+        elapsed = time.perf_counter() - started
+        print(f"✓ Ran {self.n_simulations:,} {self.method} simulations of {len(returns):,} returns in {elapsed:.1f}s")
+
+        return {
+            'samples': samples,
+            'summary': self.summarize(samples),
+            'observed': observed,
+            'probability_of_loss': float((samples['total_return'] < 0).mean()),
+        }
+
+    def run_trades(self, trades, periods_per_year: Optional[float] = None) -> Dict:
+        """
+        Resample the trades of a backtest
+
+        Args:
+            trades: run_backtest()['trades']
+            periods_per_year: Trades per year for the Sharpe ratio (estimated
+                from the first entry and last exit when omitted)
+
+        Returns:
+            Same dictionary as run
+        """
+        if periods_per_year is None:
+            periods_per_year = self._trades_per_year(trades)
+        return self.run(trade_returns(trades), periods_per_year)
+
+    def run_equity(self, equity_curve, periods_per_year: float = 252) -> Dict:
+        """
+        Resample the bar returns of an equity curve
+
+        Args:
+            equity_curve: run_backtest()['equity_curve'] or an array of values
+            periods_per_year: Bars per year (252 for daily bars, as in Backtester)
+
+        Returns:
+            Same dictionary as run
+        """
+        return self.run(equity_returns(equity_curve), periods_per_year)
+
+    def summarize(self, samples: pd.DataFrame) -> pd.DataFrame:
+        """Mean, standard deviation and percentiles of each metric"""
+        rows = {'mean': samples.mean(), 'std': samples.std()}
+        for q in self.percentiles:
+            rows[f"p{q:g}"] = samples.quantile(q / 100)
+        return pd.DataFrame(rows).T
+
+    @staticmethod
+    def _trades_per_year(trades) -> float:
+        """Trade frequency from the span between the first entry and last exit"""
+        if len(trades) < 2:
+            return 1.0
+        span = pd.Timestamp(trades[-1]['exit_time']) - pd.Timestamp(trades[0]['entry_time'])
+        years = span / pd.Timedelta(days=365.25)
+        return len(trades) / years if years > 0 else 1.0
@@ -0,0 +1,348 @@
+"""Multi-symbol portfolio backtesting on aligned (time x symbol) arrays"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .vectorized import position_state
+
+
+def build_signal_matrix(strategy, frames: Dict[str, pd.DataFrame]):
+    """
+    Run a strategy on every symbol and align the results into matrices
+
+    Args:
+        strategy: Strategy object with generate_signals() method
+        frames: Mapping of symbol to OHLCV DataFrame
+
+    Returns:
+        Tuple of (close, signal) DataFrames indexed by timestamp with one
+        column per symbol (NaN where a symbol has no bar)
+    """
+    close = {}
+    signal = {}
+
+    for symbol, df in frames.items():
+        signals_df = strategy.generate_signals(df)
+        close[symbol] = signals_df['close']
+        signal[symbol] = signals_df['signal']
+
+    # Outer join on timestamps so every symbol shares one time axis
+    close = pd.DataFrame(close).sort_index()
+    signal = pd.DataFrame(signal).reindex(close.index)
+    return close, signal
+
+
+class PositionSizer(ABC):
+    """Interface for rules that turn the set of wanted symbols into target weights"""
+
+    def prepare(self, close: np.ndarray):
+        """Precompute anything needed from the full (time x symbol) price matrix"""
+        pass
+
+    @abstractmethod
+    def target_weights(self, t: int, candidates: np.ndarray, held: np.ndarray) -> np.ndarray:
+        """
+        Compute target portfolio weights at bar t
+
+        Args:
+            t: Bar index
+            candidates: Boolean array, True for symbols whose signal says be long
+            held: Boolean array, True for symbols currently held
+
+        Returns:
+            Array of weights per symbol (sum <= 1, zero for non-candidates)
+        """
+        pass
+
+
+class EqualWeight(PositionSizer):
+    """Split capital equally between all candidate symbols"""
+
+    def target_weights(self, t, candidates, held):
+        n_candidates = candidates.sum()
+        if n_candidates == 0:
+            return np.zeros(len(candidates))
+        return candidates / n_candidates
+
+
+class VolatilityTarget(PositionSizer):
+    """
+    Size each position so it contributes an equal share of a target volatility
+
+    Weight per symbol = target_vol / (annualized vol * number of candidates),
+    scaled down if the total would exceed max_gross. Symbols without enough
+    history for a volatility estimate get no allocation.
+    """
+
+    def __init__(self, target_vol=0.15, lookback=20, periods_per_year=252, max_gross=1.0):
+        """
+        Args:
+            target_vol: Annualized portfolio volatility target (0.15 = 15%)
+            lookback: Bars used for the rolling volatility estimate
+            periods_per_year: Bars per year used to annualize
+            max_gross: Maximum sum of weights (1.0 = no leverage)
+        """
+        self.target_vol = target_vol
+        self.lookback = lookback
+        self.periods_per_year = periods_per_year
+        self.max_gross = max_gross
+        self.volatility = None
+
+    def prepare(self, close):
+        # Rolling volatility of every symbol computed once up front
+        returns = pd.DataFrame(close).pct_change(fill_method=None)
+        vol = returns.rolling(window=self.lookback).std() * np.sqrt(self.periods_per_year)
+        self.volatility = vol.to_numpy()
+
+    def target_weights(self, t, candidates, held):
+        n_candidates = candidates.sum()
+        if n_candidates == 0:
+            return np.zeros(len(candidates))
+
+        vol = self.volatility[t]
+        usable = candidates & np.isfinite(vol) & (vol > 0)
+        weights = np.zeros(len(candidates))
+        weights[usable] = self.target_vol / (vol[usable] * n_candidates)
+
+        # Cap gross exposure
+        gross = weights.sum()
+        if gross > self.max_gross:
+            weights *= self.max_gross / gross
+        return weights
+
+
+class MaxPositions(PositionSizer):
+    """
+    Limit the number of open positions, then size with another rule
+
+    Symbols already held keep priority; remaining slots go to new candidates
+    in column order.
+    """
+
+    def __init__(self, max_positions: int, sizer: Optional[PositionSizer] = None):
+        """
+        Args:
+            max_positions: Maximum number of symbols held at once
+            sizer: Rule applied to the selected symbols (defaults to EqualWeight)
+        """
+        self.max_positions = max_positions
+        self.sizer = sizer or EqualWeight()
+
+    def prepare(self, close):
+        self.sizer.prepare(close)
+
+    def target_weights(self, t, candidates, held):
+        kept = candidates & held
+        if kept.sum() > self.max_positions:
+            kept[np.flatnonzero(kept)[self.max_positions:]] = False
+
+        # Fill free slots with new candidates
+        free_slots = self.max_positions - kept.sum()
+        new = np.flatnonzero(candidates & ~held)[:free_slots]
+        selected = kept.copy()
+        selected[new] = True
+
+        return self.sizer.target_weights(t, selected, held)
+
+
+class PortfolioBacktester:
+    """
+    Simulates one portfolio trading many symbols with shared cash
+
+    Each symbol's signal decides whether it should be held (same rules as
+    Backtester: 1 = enter, -1/0 = exit, NaN = no change). Whenever the set of
+    wanted symbols changes, the portfolio rebalances to the weights from the
+    position sizer. Slippage and commission are charged on every fill.
+    """
+
+    def __init__(self, initial_capital=10000, commission=0.001, slippage=0.0005,
+                 sizer: Optional[PositionSizer] = None, periods_per_year=252):
+        """
+        Initialize portfolio backtester
+
+        Args:
+            initial_capital: Starting portfolio value in dollars
+            commission: Commission per trade as percentage (0.001 = 0.1%)
+            slippage: Price slippage as percentage (0.0005 = 0.05%)
+            sizer: Position sizing rule (defaults to EqualWeight)
+            periods_per_year: Bars per year used to annualize the Sharpe ratio
+        """
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.slippage = slippage
+        self.sizer = sizer or EqualWeight()
+        self.periods_per_year = periods_per_year
+
+    def run_strategy(self, strategy, frames: Dict[str, pd.DataFrame]) -> Dict:
+        """
+        Run a strategy across a universe of symbols as one portfolio
+
+        Args:
+            strategy: Strategy object with generate_signals() method
+            frames: Mapping of symbol to OHLCV DataFrame
+
+        Returns:
+            Same dictionary as run()
+        """
+        close, signal = build_signal_matrix(strategy, frames)
+        result = self.run(close, signal)
+        result['strategy_name'] = strategy.name
+        return result
+
+    def run(self, close, signal) -> Dict:
+        """
+        Simulate the portfolio on aligned price and signal matrices
+
+        Args:
+            close: (time x symbol) closing prices, DataFrame or array (NaN = no bar)
+            signal: (time x symbol) signals, same shape as close
+
+        Returns:
+            Dictionary with:
+            - fills: DataFrame of every fill (timestamp, symbol, shares, price, commission)
+            - equity_curve: DataFrame of portfolio value, cash and open positions
+            - weights: Final target weights per symbol
+            - metrics: Performance metrics dictionary
+        """
+
+        # Keep labels if DataFrames were given
+        index = close.index if isinstance(close, pd.DataFrame) else pd.RangeIndex(len(close))
+        symbols = list(close.columns) if isinstance(close, pd.DataFrame) else list(range(close.shape[1]))
+        close = np.asarray(close, dtype=float)
+        signal = np.asarray(signal, dtype=float)
+
+        # Symbols can only trade on bars where they have a price;
+        # holdings are valued at the last known price in between
+        tradeable = np.isfinite(close)
+        mark_price = np.nan_to_num(pd.DataFrame(close).ffill().to_numpy(), nan=0.0)
+        candidates = position_state(signal).astype(bool) & tradeable
+
+        self.sizer.prepare(close)
+
+        n_bars, n_symbols = close.shape
+        cash = float(self.initial_capital)
+        shares = np.zeros(n_symbols)
+        weights = np.zeros(n_symbols)
+        portfolio_value = np.empty(n_bars)
+        cash_curve = np.empty(n_bars)
+        open_positions = np.empty(n_bars, dtype=np.int64)
+        fills = []
+
+        # Only rebalance on bars where the wanted set of symbols changes
+        wanted = np.zeros(n_symbols, dtype=bool)
+        for t in range(n_bars):
+            prices = mark_price[t]
+
+            if not np.array_equal(candidates[t], wanted):
+                wanted = candidates[t]
+                held = shares > 0
+                equity = cash + prices @ shares
+                weights = self.sizer.target_weights(t, wanted.copy(), held)
+
+                # Target share counts, leaving untradeable symbols alone
+                target = np.zeros(n_symbols)
+                priced = prices > 0
+                target[priced] = equity * weights[priced] / prices[priced]
+                delta = np.where(tradeable[t], target - shares, 0.0)
+
+                # Sells first to free up cash
+                sell = delta < 0
+                sell_value = -delta[sell] * prices[sell] * (1 - self.slippage)
+                sell_commission = sell_value * self.commission
+                cash += sell_value.sum() - sell_commission.sum()
+
+                # Buys, scaled down if costs would overdraw cash
+                buy = delta > 0
+                buy_cost = delta[buy] * prices[buy] * (1 + self.slippage)
+                buy_commission = buy_cost * self.commission
+                total_cost = buy_cost.sum() + buy_commission.sum()
+                if total_cost > cash:
+                    scale = cash / total_cost
+                    delta[buy] *= scale
+                    buy_cost *= scale
+                    buy_commission *= scale
+                cash -= buy_cost.sum() + buy_commission.sum()
+
+                shares += delta
+                shares[np.abs(shares) < 1e-12] = 0.0
+
+                # Record fills
+                traded = np.flatnonzero(sell | buy)
+                fill_commission = np.zeros(n_symbols)
+                fill_commission[sell] = sell_commission
+                fill_commission[buy] = buy_commission
+                fill_price = np.where(buy, prices * (1 + self.slippage), prices * (1 - self.slippage))
+                fills.append((np.full(len(traded), t), traded, delta[traded],
+                              fill_price[traded], fill_commission[traded]))
+
+            portfolio_value[t] = cash + prices @ shares
+            cash_curve[t] = cash
+            open_positions[t] = np.count_nonzero(shares)
+
+        equity_curve = pd.DataFrame({
+            'timestamp': index,
+            'portfolio_value': portfolio_value,
+            'cash': cash_curve,
+            'positions': open_positions,
+        })
+        
+        # Stack per-rebalance fill arrays into one table
+        if fills:
+            bar, symbol, fill_shares, fill_price, fill_commission = map(np.concatenate, zip(*fills))
+        else:
+            bar = symbol = np.array([], dtype=np.int64)
+            fill_shares = fill_price = fill_commission = np.array([])
+        fills = pd.DataFrame({
+            'timestamp': index[bar],
+            'symbol': np.asarray(symbols, dtype=object)[symbol],
+            'shares': fill_shares,
+            'price': fill_price,
+            'commission': fill_commission,
+        })
+
+        return {
+            'fills': fills,
+            'equity_curve': equity_curve,
+            'weights': pd.Series(weights, index=symbols),
+            'metrics': self._calculate_metrics(equity_curve, fills),
+        }
+
+    def _calculate_metrics(self, equity_curve: pd.DataFrame, fills: pd.DataFrame) -> Dict:
+        """Portfolio-level return, risk and activity metrics"""
+
+        values = equity_curve['portfolio_value']
+        if len(values) == 0:
+            return {
+                'total_return': 0,
+                'max_drawdown': 0,
+                'sharpe_ratio': 0,
+                'total_fills': 0,
+                'total_commission': 0,
+                'avg_positions': 0,
+                'final_portfolio_value': self.initial_capital
+            }
+
+        final_value = values.iloc[-1]
+        total_return = ((final_value - self.initial_capital) / self.initial_capital) * 100
+
+        # Max drawdown (worst peak-to-trough decline)
+        running_max = values.cummax()
+        max_drawdown = ((values - running_max) / running_max * 100).min()
+
+        # Annualized Sharpe ratio of bar returns (0% risk-free rate)
+        returns = values.pct_change()
+        std_return = returns.std()
+        sharpe_ratio = (returns.mean() / std_return) * np.sqrt(self.periods_per_year) if std_return else 0
+
+        return {
+            'total_return': total_return,
+            'max_drawdown': max_drawdown,
+            'sharpe_ratio': sharpe_ratio,
+            'total_fills': len(fills),
+            'total_commission': fills['commission'].sum(),
+            'avg_positions': equity_curve['positions'].mean(),
+            'final_portfolio_value': final_value
+        }
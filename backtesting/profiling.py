@@ -0,0 +1,190 @@
+"""Low-overhead stage timers and counters for backtest runs, with optional cProfile/tracemalloc capture"""
+
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterable, Optional
+
+from utils.indicator_cache import indicator_cache
+
+
+class Profiler:
+    """
+    Collects per-stage wall time and counters for one or more runs
+
+    Stages are timed with perf_counter, so instrumentation costs well under a
+    microsecond per stage; it wraps whole stages (data load, signal
+    generation, simulation, metrics), never individual bars. The same
+    profiler can be passed to several runs and keeps adding to its totals.
+
+    Usage:
+        profiler = Profiler()
+        with profiler.stage('data_load'):
+            df = analyzer.get_df('SPY', start, end)
+        result = backtester.run_backtest(strategy, df, profile=profiler)
+        result['profile']['timings']
+    """
+
+    def __init__(self, cprofile: bool = False, memory: bool = False, top: int = 25):
+        """
+        Initialize profiler
+
+        Args:
+            cprofile: Also record a cProfile of everything inside capture()
+            memory: Also track peak Python memory with tracemalloc inside capture()
+            top: Number of functions kept in the cProfile summary
+        """
+        self.cprofile = cprofile
+        self.memory = memory
+        self.top = top
+        self.timings = {}
+        self.counters = {}
+        self.profile_text = None
+        self.memory_peak = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block and add it to the stage total"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name: str, value=1):
+        """Add to a counter"""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def capture(self):
+        """Run a block under cProfile and/or tracemalloc when enabled"""
+
+        # Indicator cache activity during the block
+        cache_before = indicator_cache.stats()
+
+        profiler = cProfile.Profile() if self.cprofile else None
+        started_tracing = self.memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.memory:
+            tracemalloc.reset_peak()
+        if profiler:
+            profiler.enable()
+
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+                stream = io.StringIO()
+                pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(self.top)
+                self.profile_text = stream.getvalue()
+            if self.memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                self.memory_peak = max(self.memory_peak or 0, peak)
+                if started_tracing:
+                    tracemalloc.stop()
+
+            cache_after = indicator_cache.stats()
+            self.count('cache_hits', cache_after['hits'] - cache_before['hits'])
+            self.count('cache_misses', cache_after['misses'] - cache_before['misses'])
+
+    def report(self) -> Dict:
+        """
+        Snapshot of everything collected
+
+        Returns:
+            Dictionary with:
+            - timings: Seconds per stage
+            - counters: Bars, trades, cache hits/misses, ...
+            - bottleneck: Stage with the most time
+            - profile: cProfile summary text (if enabled)
+            - memory_peak: Peak traced bytes (if enabled)
+            - runs: Number of reports merged (1 here)
+            - processes: Process ids the data came from
+        """
+        return {
+            'timings': dict(self.timings),
+            'counters': dict(self.counters),
+            'bottleneck': max(self.timings, key=self.timings.get) if self.timings else None,
+            'profile': self.profile_text,
+            'memory_peak': self.memory_peak,
+            'runs': 1,
+            'processes': [os.getpid()],
+        }
+
+    @staticmethod
+    def merge(reports: Iterable[Optional[Dict]]) -> Dict:
+        """
+        Combine reports from several runs or worker processes
+
+        Timings and counters are summed (total CPU-side time across workers),
+        peak memory is the largest single peak, and cProfile texts are kept
+        as a list.
+
+        Args:
+            reports: Reports from Profiler.report() (None entries are skipped)
+
+        Returns:
+            Report in the same format, with the total 'runs' and every
+            distinct worker process in 'processes'
+        """
+        timings, counters, profiles = {}, {}, []
+        memory_peak = None
+        runs = 0
+        processes = set()
+
+        for report in reports:
+            if report is None:
+                continue
+            runs += report.get('runs', 1)
+            processes.update(report.get('processes', []))
+            for name, seconds in report['timings'].items():
+                timings[name] = timings.get(name, 0.0) + seconds
+            for name, value in report['counters'].items():
+                counters[name] = counters.get(name, 0) + value
+            if report.get('memory_peak') is not None:
+                memory_peak = max(memory_peak or 0, report['memory_peak'])
+            if isinstance(report.get('profile'), list):
+                profiles.extend(report['profile'])
+            elif report.get('profile'):
+                profiles.append(report['profile'])
+
+        return {
+            'timings': timings,
+            'counters': counters,
+            'bottleneck': max(timings, key=timings.get) if timings else None,
+            'profile': profiles or None,
+            'memory_peak': memory_peak,
+            'runs': runs,
+            'processes': sorted(processes),
+        }
+
+
+def stage(profiler: Optional[Profiler], name: str):
+    """profiler.stage(name), or a no-op context when profiling is off"""
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+
+def as_profiler(profile) -> Optional[Profiler]:
+    """Normalize a profile argument (False/None, True or a Profiler) to a Profiler or None"""
+    if isinstance(profile, Profiler):
+        return profile
+    return Profiler() if profile else None
+
+
+def format_report(report: Dict) -> str:
+    """Human-readable table of a profiling report"""
+    total = sum(report['timings'].values()) or 1.0
+    lines = [f"{'stage':<16} {'seconds':>10} {'share':>7}"]
+    for name, seconds in sorted(report['timings'].items(), key=lambda item: -item[1]):
+        lines.append(f"{name:<16} {seconds:10.4f} {seconds / total:7.1%}")
+    for name, value in report['counters'].items():
+        lines.append(f"{name:<16} {value:>10,}")
+    if report.get('memory_peak') is not None:
+        lines.append(f"{'memory_peak':<16} {report['memory_peak'] / 1e6:9.1f}M")
+    return '\n'.join(lines)
@@ -0,0 +1,426 @@
+"""Persistent, content-addressed store of backtest results
+
+Each run_backtest result is filed under a key hashed from the strategy class
+and parameters, the Backtester's capital/cost/stop settings and a fingerprint
+of the input DataFrame. Metrics live in a small SQLite index, trades and the
+equity curve in one compressed .npz file per result (np.load reads them):
+
+    <root>/index.sqlite
+    <root>/<key[:2]>/<key>.npz
+
+Identical runs (same strategy, same settings, same prices) then come back from
+disk instead of being simulated again, across scripts and processes. The key
+also covers a hash of the source of the strategy's modules and of the engine
+and indicator modules (see code_version), so editing the data, settings or
+that code changes the key. Code the strategy reaches outside those modules is
+not tracked: call invalidate() after changing it. The least recently used
+entries are evicted once the files exceed max_bytes.
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+import marshal
+import os
+import re
+import sqlite3
+import sys
+import time
+import zipfile
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Bump when the stored format changes (orphans old keys)
+STORE_VERSION = 1
+
+# Modules whose source is part of every key (the simulation and the indicators)
+ENGINE_MODULES = [
+    'backtesting.engine', 'backtesting.kernels', 'backtesting.metrics', 'backtesting.results',
+    'backtesting.vectorized', 'utils.indicators', 'utils.indicator_cache', 'utils.rolling',
+]
+
+# zlib level for the array files: level 6 (np.savez_compressed) takes about
+# twice as long on price-like floats for a few percent smaller files
+COMPRESS_LEVEL = 1
+
+# Default object reprs ("<... at 0x7f...>") are not stable across runs
+_ADDRESS = re.compile(r' at 0x[0-9a-fA-F]+')
+
+# Backtester attributes that change results
+BACKTESTER_SETTINGS = ['initial_capital', 'commission', 'slippage', 'stop_loss', 'take_profit', 'trailing_stop']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    strategy TEXT NOT NULL,
+    strategy_name TEXT,
+    params TEXT NOT NULL,
+    settings TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    metrics TEXT NOT NULL,
+    has_equity INTEGER NOT NULL,
+    n_bytes INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_access ON results (last_access);
+CREATE INDEX IF NOT EXISTS idx_results_fingerprint ON results (fingerprint);
+"""
+
+
+def _plain(value):
+    """NumPy scalars as Python numbers (for JSON)"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _param_value(name, value):
+    """JSON-serializable stand-in for a strategy parameter that identifies its value"""
+    value = _plain(value)
+    if isinstance(value, (bool, int, float, str, type(None))):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_param_value(name, item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _param_value(name, item) for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return f"{type(value).__name__}:{data_fingerprint(value.to_frame() if isinstance(value, pd.Series) else value)}"
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind not in 'biufcmM':
+            return _param_value(name, value.tolist())
+        digest = hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()[:32]
+        return f"ndarray:{value.dtype}:{value.shape}:{digest}"
+
+    # Anything else must describe itself: a repr naming a memory address
+    # (functions, objects without __repr__) differs between processes
+    text = repr(value)
+    if _ADDRESS.search(text):
+        raise TypeError(f"Cannot key strategy parameter {name!r}: {type(value).__name__} has no value repr")
+    return text
+
+
+def strategy_params(strategy) -> Dict:
+    """
+    Public attributes of a strategy (its constructor parameters)
+
+    Scalars are kept as they are; lists, dicts, arrays and DataFrames are
+    hashed from their contents so different values give different keys.
+
+    Raises:
+        TypeError: An attribute has no content-based representation
+    """
+    return {
+        name: _param_value(name, value) for name, value in sorted(vars(strategy).items())
+        if not name.startswith('_') and name != 'name'
+    }
+
+
+def _module_source(name) -> bytes:
+    """Source of a module, or its compiled code when the source is not on disk"""
+    module = sys.modules.get(name) or importlib.import_module(name)
+    try:
+        return inspect.getsource(module).encode()
+    except (OSError, TypeError):
+        # Interactive sessions: hash the bytecode of the module's functions and classes
+        parts = []
+        for value in vars(module).values():
+            if getattr(value, '__module__', None) != name:
+                continue
+            functions = vars(value).values() if isinstance(value, type) else [value]
+            parts.extend(marshal.dumps(f.__code__) for f in functions if hasattr(f, '__code__'))
+        return b''.join(sorted(parts))
+
+
+@lru_cache(maxsize=None)
+def code_version(strategy_cls) -> str:
+    """
+    Hash of the code a strategy's results depend on
+
+    Covers the modules defining strategy_cls and its base classes plus
+    ENGINE_MODULES. Computed once per class and process.
+    """
+    modules = {cls.__module__ for cls in strategy_cls.__mro__ if cls.__module__ not in ('builtins', 'abc')}
+    digest = hashlib.sha256()
+    for name in sorted(modules | set(ENGINE_MODULES)):
+        digest.update(f"{name}:".encode())
+        digest.update(_module_source(name))
+    return digest.hexdigest()[:32]
+
+
+def data_fingerprint(df: pd.DataFrame) -> str:
+    """Hash a DataFrame's column names, dtypes, values and index"""
+
+    # SHA-256 is hardware accelerated on most CPUs (about 3x blake2b on long histories)
+    digest = hashlib.sha256()
+    for name in df.columns:
+        column = df[name]
+        digest.update(f"{name}:{column.dtype}".encode())
+        values = column.to_numpy()
+        if values.dtype.kind in 'biufcmM':
+            digest.update(np.ascontiguousarray(values).tobytes())
+        else:
+            # Object/string columns: hash the contents, not the pointers
+            digest.update(pd.util.hash_pandas_object(column, index=False).to_numpy().tobytes())
+
+    index = df.index
+    digest.update(f"index:{index.dtype}".encode())
+    if isinstance(index, pd.RangeIndex):
+        digest.update(f"range:{index.start}:{index.stop}:{index.step}".encode())
+    elif isinstance(index, pd.DatetimeIndex):
+        digest.update(index.asi8.tobytes())
+    else:
+        digest.update(pd.util.hash_pandas_object(index).to_numpy().tobytes())
+
+    return digest.hexdigest()[:32]
+
+
+class ResultStore:
+    """
+    On-disk cache of backtest results (SQLite index plus compressed arrays)
+
+    Pass one to Backtester(result_store=...) to memoize run_backtest. The
+    store only holds a directory path, so it can be pickled into worker
+    processes; every operation opens its own SQLite connection.
+    """
+
+    def __init__(self, root='result_store', max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Initialize store
+
+        Args:
+            root: Directory holding the index and result files (created if missing)
+            max_bytes: Upper bound on the size of the stored result files
+        """
+        self.root = str(root)
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.root, 'index.sqlite')
+
+        # Counters for monitoring (per process)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(self.root, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Connection to the index for one transaction (committed, then closed)"""
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _path(self, key) -> str:
+        """Location of a result's array file"""
+        return os.path.join(self.root, key[:2], f"{key}.npz")
+
+    @staticmethod
+    def describe(strategy, backtester, df: pd.DataFrame) -> Dict:
+        """Everything the key is hashed from, as a JSON-serializable dictionary"""
+        strategy_cls = type(strategy)
+        return {
+            'version': STORE_VERSION,
+            'strategy': f"{strategy_cls.__module__}.{strategy_cls.__qualname__}",
+            'code': code_version(strategy_cls),
+            'params': strategy_params(strategy),
+            'settings': {name: _plain(getattr(backtester, name)) for name in BACKTESTER_SETTINGS},
+            'fingerprint': data_fingerprint(df),
+        }
+
+    @staticmethod
+    def make_key(description: Dict) -> str:
+        """Content address of a description (see describe)"""
+        payload = json.dumps(description, sort_keys=True, default=repr)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def key(self, strategy, backtester, df: pd.DataFrame) -> str:
+        """Key of running strategy with backtester's settings on df"""
+        return self.make_key(self.describe(strategy, backtester, df))
+
+    def load(self, key, need_equity: bool = True) -> Optional[Dict]:
+        """
+        Stored parts of a result
+
+        Args:
+            key: Result key (see key)
+            need_equity: Treat entries stored without an equity curve as missing
+
+        Returns:
+            Dictionary with strategy_name, metrics, records, exit_reason and
+            equity_values (arrays, None where not stored), or None on a miss
+        """
+
+        with self._connect() as conn:
+            row = conn.execute('SELECT strategy_name, metrics, has_equity FROM results WHERE key = ?',
+                               (key,)).fetchone()
+            if row is None or (need_equity and not row[2]):
+                self.misses += 1
+                return None
+            conn.execute('UPDATE results SET last_access = ? WHERE key = ?', (time.time(), key))
+
+        try:
+            with np.load(self._path(key)) as arrays:
+                parts = {name: arrays[name] for name in arrays.files}
+        except (OSError, ValueError):
+            # File lost or damaged: drop the entry and recompute
+            self.invalidate(key=key)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return {
+            'strategy_name': row[0],
+            'metrics': json.loads(row[1]),
+            'records': parts['records'],
+            'exit_reason': parts.get('exit_reason'),
+            'equity_values': parts.get('equity_values'),
+        }
+
+    def save(self, key, description: Dict, result) -> int:
+        """
+        Store a run_backtest result
+
+        Args:
+            key: Result key (see key)
+            description: Inputs the key was hashed from (see describe)
+            result: Dictionary returned by Backtester.run_backtest
+
+        Returns:
+            Size in bytes of the stored array file
+        """
+
+        trades = result['trades']
+        arrays = {'records': trades.records}
+        if trades.exit_reason is not None:
+            arrays['exit_reason'] = trades.exit_reason
+        equity_values = getattr(result, 'equity_values', None)
+        if equity_values is not None:
+            arrays['equity_values'] = equity_values
+
+        # Write to a temporary name first so readers never see a partial file
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=COMPRESS_LEVEL) as archive:
+            for name, array in arrays.items():
+                with archive.open(f"{name}.npy", 'w', force_zip64=True) as f:
+                    np.lib.format.write_array(f, np.asarray(array), allow_pickle=False)
+        os.replace(tmp_path, path)
+        n_bytes = os.path.getsize(path)
+
+        metrics = {name: _plain(value) for name, value in result['metrics'].items()}
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, description['strategy'], result.get('strategy_name'),
+                 json.dumps(description['params'], sort_keys=True), json.dumps(description['settings'], sort_keys=True),
+                 description['fingerprint'], json.dumps(metrics), int(equity_values is not None),
+                 n_bytes, now, now)
+            )
+
+        self.evict()
+        return n_bytes
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Delete least recently used results until the files fit in max_bytes
+
+        Args:
+            max_bytes: Size bound (defaults to the store's max_bytes)
+
+        Returns:
+            Number of results deleted
+        """
+
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self._connect() as conn:
+            total = conn.execute('SELECT COALESCE(SUM(n_bytes), 0) FROM results').fetchone()[0]
+            if total <= limit:
+                return 0
+
+            evicted = []
+            for key, n_bytes in conn.execute('SELECT key, n_bytes FROM results ORDER BY last_access'):
+                if total <= limit:
+                    break
+                evicted.append(key)
+                total -= n_bytes
+            conn.executemany('DELETE FROM results WHERE key = ?', [(key,) for key in evicted])
+
+        self._remove_files(evicted)
+        self.evictions += len(evicted)
+        return len(evicted)
+
+    def invalidate(self, key: Optional[str] = None, strategy=None, fingerprint: Optional[str] = None) -> int:
+        """
+        Delete stored results matching all given filters (everything if none)
+
+        Args:
+            key: One result key
+            strategy: Strategy class (or its dotted name) whose results to drop
+            fingerprint: Data fingerprint (see data_fingerprint) whose results to drop
+
+        Returns:
+            Number of results deleted
+        """
+
+        clauses, values = [], []
+        if key is not None:
+            clauses.append('key = ?')
+            values.append(key)
+        if strategy is not None:
+            if isinstance(strategy, type):
+                strategy = f"{strategy.__module__}.{strategy.__qualname__}"
+            clauses.append('strategy = ?')
+            values.append(strategy)
+        if fingerprint is not None:
+            clauses.append('fingerprint = ?')
+            values.append(fingerprint)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        with self._connect() as conn:
+            keys = [row[0] for row in conn.execute(f'SELECT key FROM results{where}', values)]
+            conn.executemany('DELETE FROM results WHERE key = ?', [(k,) for k in keys])
+
+        self._remove_files(keys)
+        return len(keys)
+
+    def clear(self):
+        """Delete all stored results and reset counters"""
+        self.invalidate()
+        self.hits = self.misses = self.evictions = 0
+
+    def _remove_files(self, keys):
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def entries(self) -> pd.DataFrame:
+        """Index of stored results (strategy, params, settings, metrics, size)"""
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                'SELECT key, strategy, strategy_name, params, settings, fingerprint, metrics, n_bytes, '
+                'created, last_access FROM results ORDER BY last_access DESC', conn)
+
+    def stats(self) -> Dict:
+        """Return store counters and disk usage"""
+        with self._connect() as conn:
+            entries, n_bytes = conn.execute('SELECT COUNT(*), COALESCE(SUM(n_bytes), 0) FROM results').fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': n_bytes,
+        }
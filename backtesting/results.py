@@ -0,0 +1,196 @@
+"""Compact, array-backed backtest results (trade log and lazily built equity curve)"""
+
+from collections.abc import Sequence
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .kernels import EXIT_REASONS
+
+# Per-trade fields stored in the structured array
+TRADE_DTYPE = np.dtype([
+    ('entry_idx', np.int64),
+    ('exit_idx', np.int64),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('shares', np.float64),
+    ('return_pct', np.float64),
+    ('pnl', np.float64),
+])
+
+
+class TradeLog(Sequence):
+    """
+    Closed trades stored as one NumPy structured array
+
+    Behaves like the list of trade dictionaries the engine used to return:
+    len(), indexing, iteration and == all work on dictionaries with
+    entry_time, exit_time, entry_price, exit_price, shares, return_pct and
+    pnl (plus exit_reason for runs with stops). Timestamps are looked up from
+    the bar index only when a trade is accessed, so a log costs 56 bytes per
+    trade instead of a dictionary and two Timestamp objects.
+    """
+
+    def __init__(self, timestamps, records: np.ndarray, exit_reason: Optional[np.ndarray] = None):
+        """
+        Args:
+            timestamps: Bar index the entry/exit positions refer to
+            records: Structured array with TRADE_DTYPE
+            exit_reason: Optional array of exit reason codes (see kernels.EXIT_REASONS)
+        """
+        self.timestamps = timestamps
+        self.records = records
+        self.exit_reason = exit_reason
+        self._df = None
+
+    @classmethod
+    def from_arrays(cls, timestamps, entry_idx, exit_idx, entry_price, exit_price, shares,
+                    exit_commission, exit_reason=None) -> 'TradeLog':
+        """
+        Build a log from aligned per-trade arrays (completed round trips only)
+
+        Return and P&L use the same formulas as the bar-by-bar loop.
+        """
+        records = np.empty(len(exit_idx), dtype=TRADE_DTYPE)
+        records['entry_idx'] = entry_idx
+        records['exit_idx'] = exit_idx
+        records['entry_price'] = entry_price
+        records['exit_price'] = exit_price
+        records['shares'] = shares
+        records['return_pct'] = ((records['exit_price'] - records['entry_price']) / records['entry_price']) * 100
+        records['pnl'] = (records['exit_price'] - records['entry_price']) * records['shares'] \
+            - (np.asarray(exit_commission, dtype=float) * 2)
+        return cls(timestamps, records, exit_reason)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        record = self.records[index]
+        trade = {
+            'entry_time': self.timestamps[record['entry_idx']],
+            'exit_time': self.timestamps[record['exit_idx']],
+            'entry_price': record['entry_price'],
+            'exit_price': record['exit_price'],
+            'shares': record['shares'],
+            'return_pct': record['return_pct'],
+            'pnl': record['pnl'],
+        }
+        if self.exit_reason is not None:
+            trade['exit_reason'] = EXIT_REASONS[int(self.exit_reason[index])]
+        return trade
+
+    def __eq__(self, other):
+        if isinstance(other, (TradeLog, list)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TradeLog({len(self)} trades)"
+
+    def column(self, name) -> np.ndarray:
+        """One numeric field for all trades (no copy)"""
+        return self.records[name]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """All trades as a DataFrame (built once, then cached)"""
+        if self._df is None:
+            self._df = pd.DataFrame({
+                'entry_time': self.timestamps[self.records['entry_idx']],
+                'exit_time': self.timestamps[self.records['exit_idx']],
+                **{name: self.records[name] for name in ['entry_price', 'exit_price', 'shares', 'return_pct', 'pnl']},
+            })
+            if self.exit_reason is not None:
+                self._df['exit_reason'] = [EXIT_REASONS[int(code)] for code in self.exit_reason]
+        return self._df
+
+
+class BacktestResult(dict):
+    """
+    Backtest result dictionary whose expensive values are built on first access
+
+    Lazy keys are present (so `in`, keys() and iteration behave as before) and
+    are materialized by every read of a value: indexing, get(), values(),
+    items(), copy(), pop(), ==, dict(result) and {**result}.
+    """
+
+    def __init__(self, *args, lazy: Optional[Dict[str, Callable]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lazy = dict(lazy or {})
+        for key in self._lazy:
+            super().__setitem__(key, None)
+
+    def __getitem__(self, key):
+        factory = self._lazy.pop(key, None)
+        if factory is not None:
+            super().__setitem__(key, factory())
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        self._lazy.pop(key, None)
+        super().__setitem__(key, value)
+
+    def __reduce__(self):
+        # Plain dict items plus the pending factories (which must be picklable)
+        return self.__class__, (dict(super().items()),), self.__dict__
+
+    def _materialize(self):
+        """Build every pending value"""
+        for key in list(self._lazy):
+            self[key]
+
+    def __iter__(self):
+        # Overriding __iter__ also turns off dict's C fast path in dict(result)
+        # and {**result}, which would copy the unbuilt placeholders
+        return super().__iter__()
+
+    def __eq__(self, other):
+        self._materialize()
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        self._materialize()
+        return super().__ne__(other)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def copy(self):
+        self._materialize()
+        result = self.__class__(super().items())
+        # Keep attributes such as equity_values
+        result.__dict__.update({name: value for name, value in self.__dict__.items() if name != '_lazy'})
+        return result
+
+    def pop(self, key, *default):
+        if key in self:
+            self[key]
+        self._lazy.pop(key, None)
+        return super().pop(key, *default)
+
+    def popitem(self):
+        self._materialize()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        return super().setdefault(key, default)
+
+
+def equity_curve_frame(timestamps, portfolio_value) -> pd.DataFrame:
+    """Equity curve DataFrame in the engine's long-standing format"""
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'portfolio_value': portfolio_value
+    })
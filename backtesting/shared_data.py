@@ -0,0 +1,263 @@
+"""Price arrays shared with worker processes without copying
+
+SharedArrays writes a set of NumPy arrays once, either into one
+multiprocessing.shared_memory block or into memory-mapped .npy files. Its
+spec is a small picklable description; workers call attach_arrays(spec) or
+attach_frame(spec) and get read-only views of the same physical pages, so
+RAM use no longer grows with the number of worker processes.
+
+Usage:
+    with share_frame(df) as shared:
+        with ProcessPoolExecutor(initializer=init, initargs=(shared.spec,)) as executor:
+            ...
+
+    # in the worker
+    df = attach_frame(spec)   # ordinary DataFrame over shared memory
+    backtester.run_backtest(strategy, df)
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import uuid
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+BACKENDS = ('shm', 'memmap')
+
+# Byte alignment of each array inside a shared memory block
+ALIGNMENT = 64
+
+# Reserved key for a DataFrame's index
+INDEX_KEY = '__index__'
+
+
+@dataclass(frozen=True)
+class SharedSpec:
+    """Picklable description of shared arrays (what workers need to attach)"""
+
+    backend: str  # 'shm' or 'memmap'
+    location: str  # Shared memory block name or .npy directory
+    arrays: Tuple  # (key, dtype, shape, offset) per array
+    index_name: Optional[str] = None  # Set when an index is shared alongside
+    index_tz: Optional[str] = None
+
+
+# Blocks attached in this process, kept open for as long as views may exist
+_attached = {}
+
+
+def _open_block(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without handing it to the resource tracker"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    # Before 3.13 every attach registers the block, and the tracker unlinks it
+    # (or warns about a leak) when the worker exits; only the owner may unlink
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedArrays:
+    """
+    Owner of a set of arrays written into shared memory or .npy memmaps
+
+    The creating process owns the data: close() (or leaving the with block)
+    releases it, so keep the owner alive until every worker is done.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], backend: str = 'shm',
+                 directory: Optional[str] = None, index: Optional[pd.Index] = None):
+        """
+        Write arrays to shared storage
+
+        Args:
+            arrays: Mapping of key to array (any non-object dtype and shape)
+            backend: 'shm' (one shared memory block) or 'memmap' (one .npy
+                file per array, also works across unrelated processes)
+            directory: Directory for the .npy files (a temporary directory
+                removed on close() when omitted)
+            index: Optional index (e.g. bar timestamps) shared alongside,
+                read back with attach_index
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend} (expected one of {BACKENDS})")
+
+        arrays = {key: np.ascontiguousarray(values) for key, values in arrays.items()}
+        index_name = index_tz = None
+        if index is not None:
+            index_name = index.name
+            if getattr(index, 'tz', None) is not None:
+                index_tz = str(index.tz)
+                index = index.tz_localize(None)
+            arrays[INDEX_KEY] = np.ascontiguousarray(index.to_numpy())
+
+        for key, values in arrays.items():
+            if values.dtype == object:
+                raise TypeError(f"Can't share object column {key!r}, only numeric and datetime arrays")
+
+        self.backend = backend
+        self._block = None
+        self._owned_directory = None
+
+        if backend == 'shm':
+            # One block, each array at an aligned offset
+            layout, size = [], 0
+            for key, values in arrays.items():
+                layout.append((key, values.dtype.str, values.shape, size))
+                size += -(-values.nbytes // ALIGNMENT) * ALIGNMENT
+
+            self._block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            for (key, dtype, shape, offset) in layout:
+                target = np.ndarray(shape, dtype=dtype, buffer=self._block.buf, offset=offset)
+                target[...] = arrays[key]
+                del target  # Views would keep the block from closing
+            location = self._block.name
+        else:
+            if directory is None:
+                directory = self._owned_directory = tempfile.mkdtemp(prefix='shared_prices_')
+            else:
+                directory = os.path.join(directory, uuid.uuid4().hex)
+                os.makedirs(directory)
+                self._owned_directory = directory
+
+            layout = []
+            for number, (key, values) in enumerate(arrays.items()):
+                target = np.lib.format.open_memmap(os.path.join(directory, f'{number}.npy'), mode='w+',
+                                                   dtype=values.dtype, shape=values.shape)
+                target[...] = values
+                target.flush()
+                del target
+                layout.append((key, values.dtype.str, values.shape, number))
+            location = directory
+
+        self.spec = SharedSpec(backend, location, tuple(layout), index_name, index_tz)
+        self.nbytes = sum(values.nbytes for values in arrays.values())
+
+    def close(self):
+        """Release the shared storage (attached views in other processes stay valid until they exit)"""
+        if self._block is not None:
+            try:
+                self._block.close()
+            except BufferError:
+                pass  # Views attached in this process still exist; unlink anyway
+            self._block.unlink()
+            self._block = None
+        if self._owned_directory is not None:
+            shutil.rmtree(self._owned_directory, ignore_errors=True)
+            self._owned_directory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _fixed_width(dtype) -> bool:
+    return (pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)
+            or pd.api.types.is_datetime64_any_dtype(dtype))
+
+
+def shareable_index(index: pd.Index) -> bool:
+    """True if the index is numeric, boolean or datetime (object/string/multi-level ones can't be shared)"""
+    return not isinstance(index, pd.MultiIndex) and _fixed_width(index.dtype)
+
+
+def shareable(df: pd.DataFrame) -> bool:
+    """True if every column and the index are numeric, boolean or datetime (object/string ones can't be shared)"""
+    return shareable_index(df.index) and all(_fixed_width(dtype) for dtype in df.dtypes)
+
+
+def share_frame(df: pd.DataFrame, columns=None, backend: str = 'shm',
+                directory: Optional[str] = None) -> SharedArrays:
+    """
+    Write a DataFrame's columns and index to shared storage
+
+    Args:
+        df: DataFrame to share (e.g. OHLCV bars)
+        columns: Columns to include (defaults to all)
+        backend: 'shm' or 'memmap' (see SharedArrays)
+        directory: Directory for memmap files
+
+    Returns:
+        SharedArrays owner; pass its .spec to attach_frame
+    """
+    columns = list(df.columns if columns is None else columns)
+    arrays = {column: df[column].to_numpy() for column in columns}
+    return SharedArrays(arrays, backend, directory, index=df.index)
+
+
+def _attach(spec: SharedSpec) -> Dict[str, np.ndarray]:
+    """Read-only views of every array in a spec, index included"""
+    arrays = {}
+
+    if spec.backend == 'shm':
+        block = _attached.get(spec.location)
+        if block is None:
+            block = _attached[spec.location] = _open_block(spec.location)
+        for key, dtype, shape, offset in spec.arrays:
+            arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)
+    else:
+        for key, dtype, shape, number in spec.arrays:
+            values = np.load(os.path.join(spec.location, f'{number}.npy'), mmap_mode='r')
+            arrays[key] = values.view(np.ndarray)
+
+    for values in arrays.values():
+        values.flags.writeable = False
+
+    return arrays
+
+
+def attach_arrays(spec: SharedSpec) -> Dict[str, np.ndarray]:
+    """
+    Read-only views of shared arrays (no data is copied)
+
+    Args:
+        spec: SharedArrays.spec from the owning process
+
+    Returns:
+        Mapping of key to array view (the index, if any, is left out)
+    """
+    arrays = _attach(spec)
+    arrays.pop(INDEX_KEY, None)
+    return arrays
+
+
+def attach_index(spec: SharedSpec) -> Optional[pd.Index]:
+    """Index shared alongside the arrays (None if there is none)"""
+    values = _attach(spec).get(INDEX_KEY)
+    if values is None:
+        return None
+    index = pd.Index(values, name=spec.index_name, copy=False)
+    return index.tz_localize(spec.index_tz) if spec.index_tz else index
+
+
+def attach_frame(spec: SharedSpec) -> pd.DataFrame:
+    """
+    DataFrame whose columns are read-only views of shared memory
+
+    Strategies and Backtester take it like any other DataFrame; anything
+    they add (indicators, signals) lives in new, process-local columns.
+
+    Args:
+        spec: Spec of a share_frame() owner
+
+    Returns:
+        DataFrame with the shared columns and index
+    """
+    return pd.DataFrame(attach_arrays(spec), index=attach_index(spec), copy=False)
+
+
+def resolve_frame(data) -> pd.DataFrame:
+    """attach_frame(data) for a spec, data itself for a DataFrame (worker initializers take either)"""
+    return attach_frame(data) if isinstance(data, SharedSpec) else data
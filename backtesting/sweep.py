@@ -0,0 +1,247 @@
+"""Parallel parameter sweeps (grid, random and Latin-hypercube search) over a strategy"""
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .engine import Backtester
+from .profiling import Profiler, stage
+from .shared_data import resolve_frame, share_frame, shareable
+
+
+def parameter_grid(grid: Dict[str, List]) -> List[Dict]:
+    """
+    Expand a parameter grid into every combination
+
+    Args:
+        grid: Mapping of parameter name to list of values,
+            e.g. {'period': [10, 20], 'std_dev': [2, 3]}
+
+    Returns:
+        List of parameter dictionaries (one per combination)
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def _scale_samples(space: Dict, unit: np.ndarray) -> List[Dict]:
+    """Map samples in [0, 1) onto each parameter's list or (low, high) range"""
+
+    samples = [{} for _ in range(len(unit))]
+    for col, (name, values) in enumerate(space.items()):
+        u = unit[:, col]
+
+        if isinstance(values, tuple):
+            # Continuous range, integers stay integers (inclusive of high)
+            low, high = values
+            if isinstance(low, int) and isinstance(high, int):
+                scaled = [int(v) for v in np.floor(low + u * (high - low + 1))]
+            else:
+                scaled = [float(v) for v in low + u * (high - low)]
+        else:
+            # Discrete choices
+            values = list(values)
+            scaled = [values[i] for i in np.floor(u * len(values)).astype(int)]
+
+        for sample, value in zip(samples, scaled):
+            sample[name] = value
+
+    return samples
+
+
+def random_samples(space: Dict, n_samples: int, seed: Optional[int] = None) -> List[Dict]:
+    """
+    Draw random parameter combinations
+
+    Args:
+        space: Mapping of parameter name to a list of choices or a (low, high) range
+        n_samples: Number of combinations to draw
+        seed: Random seed for reproducibility
+
+    Returns:
+        List of parameter dictionaries
+    """
+    rng = np.random.default_rng(seed)
+    return _scale_samples(space, rng.random((n_samples, len(space))))
+
+
+def latin_hypercube(space: Dict, n_samples: int, seed: Optional[int] = None) -> List[Dict]:
+    """
+    Draw a Latin-hypercube sample (each parameter's range split into n_samples
+    equal strata, each stratum used exactly once)
+
+    Args:
+        space: Mapping of parameter name to a list of choices or a (low, high) range
+        n_samples: Number of combinations to draw
+        seed: Random seed for reproducibility
+
+    Returns:
+        List of parameter dictionaries
+    """
+    rng = np.random.default_rng(seed)
+
+    # One random point inside each stratum, strata shuffled per parameter
+    unit = (np.arange(n_samples)[:, None] + rng.random((n_samples, len(space)))) / n_samples
+    for col in range(len(space)):
+        unit[:, col] = rng.permutation(unit[:, col])
+
+    return _scale_samples(space, unit)
+
+
+# Bars x combinations per batch of a batched sweep (bounds the signal and equity matrices)
+BATCH_ELEMENTS = 1 << 24
+
+
+# Worker state, set once per process so the price data isn't re-sent with every task
+_worker_df = None
+_worker_backtester = None
+_worker_profile = False
+
+
+def _init_worker(df, backtester: Backtester, profile: bool = False):
+    """Store the price data (DataFrame or SharedSpec to attach) and backtester in the worker process"""
+    global _worker_df, _worker_backtester, _worker_profile
+    _worker_df = resolve_frame(df)
+    _worker_backtester = backtester
+    _worker_profile = profile
+
+
+def _run_config(strategy_cls, params: Dict) -> Tuple[Dict, Optional[Dict]]:
+    """Backtest one parameter combination inside a worker (returns the result row and profile report)"""
+
+    strategy = strategy_cls(**params)
+    result = _worker_backtester.run_backtest(strategy, _worker_df, vectorized=True, keep_equity_curve=False,
+                                             profile=_worker_profile)
+
+    return {**params, 'strategy': strategy.name, **result['metrics']}, result.get('profile')
+
+
+def _run_batch(strategy_cls, params: List[Dict]) -> Tuple[List[Dict], Optional[Dict]]:
+    """Backtest a batch of parameter combinations from one signal matrix inside a worker"""
+
+    profiler = Profiler() if _worker_profile else None
+    with profiler.capture() if profiler else nullcontext():
+        with stage(profiler, 'signals'):
+            signals = strategy_cls.batch_signals(_worker_df, params)
+        metrics = _worker_backtester.batch_metrics(_worker_df, signals, profiler)
+
+    rows = [{**p, 'strategy': strategy_cls(**p).name, **m} for p, m in zip(params, metrics)]
+    if not profiler:
+        return rows, None
+    profiler.count('bars', len(_worker_df) * len(params))
+    profiler.count('trades', sum(m['total_trades'] for m in metrics))
+    return rows, profiler.report()
+
+
+class ParameterSweep:
+    """
+    Runs one strategy class over many parameter combinations in parallel
+
+    The price DataFrame is written once to shared memory; worker processes
+    attach read-only views of it at pool start-up instead of each receiving a
+    pickled copy, and tasks only carry the parameter dictionaries.
+
+    With batched=True combinations are run in batches: the strategy's
+    batch_signals() builds one (bars x combinations) signal matrix from a
+    shared family of indicator windows, and the whole matrix is simulated in
+    one array pass, so hundreds of configurations cost about one indicator
+    pass per batch instead of one per configuration. The window families round
+    differently from the single-window kernels, so batch_signals() settles
+    indicator ties exactly (see utils.indicators) and gives the same signals
+    as generate_signals().
+
+    With profile=True every run is instrumented and the reports of all workers
+    are merged into self.profile after run() (see backtesting.profiling).
+    """
+
+    def __init__(self, strategy_cls, backtester: Optional[Backtester] = None,
+                 max_workers: Optional[int] = None, rank_by: str = 'sharpe_ratio',
+                 profile: bool = False, share_data: Optional[str] = 'shm', batched: bool = False):
+        """
+        Initialize sweep
+
+        Args:
+            strategy_cls: Strategy class, called as strategy_cls(**params)
+            backtester: Backtester with cost settings (defaults to Backtester())
+            max_workers: Worker processes (None = all cores, 1 = run in-process)
+            rank_by: Metric used to rank configurations (higher is better)
+            profile: Collect stage timings and counters from every run
+            share_data: How workers get the prices: 'shm' (shared memory),
+                'memmap' (.npy files) or None (pickled copy per worker)
+            batched: Run combinations in batches through the strategy's
+                batch_signals() (same signals and trades as running each
+                combination on its own)
+        """
+        self.strategy_cls = strategy_cls
+        self.backtester = backtester or Backtester()
+        self.max_workers = max_workers or os.cpu_count()
+        self.rank_by = rank_by
+        self.profile_enabled = profile
+        self.profile = None  # Merged profiling report of the last run
+        self.share_data = share_data
+        self.batched = batched
+
+    def run(self, df: pd.DataFrame, params: List[Dict]) -> pd.DataFrame:
+        """
+        Backtest every parameter combination and rank the results
+
+        Args:
+            df: DataFrame with OHLCV data
+            params: List of parameter dictionaries (see parameter_grid,
+                random_samples and latin_hypercube)
+
+        Returns:
+            DataFrame with one row per configuration (parameters, strategy name
+            and metrics), sorted best first with a 'rank' column
+        """
+
+        start = time.perf_counter()
+
+        if self.batched:
+            # Batches bounded in size, and at least one per worker
+            size = max(1, min(BATCH_ELEMENTS // max(len(df), 1), -(-len(params) // self.max_workers)))
+            tasks = [params[i:i + size] for i in range(0, len(params), size)]
+            run_task = _run_batch
+        else:
+            tasks = params
+            run_task = _run_config
+        strategy_classes = [self.strategy_cls] * len(tasks)
+
+        if self.max_workers == 1 or len(tasks) <= 1:
+            # Small job, skip process start-up
+            _init_worker(df, self.backtester, self.profile_enabled)
+            outputs = list(map(run_task, strategy_classes, tasks))
+        else:
+            # Hand out work in chunks to amortize inter-process overhead
+            chunksize = max(1, len(tasks) // (self.max_workers * 4))
+            with share_frame(df, backend=self.share_data) if self.share_data and shareable(df) \
+                    else nullcontext() as shared:
+                data = shared.spec if shared else df
+                with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                         initargs=(data, self.backtester, self.profile_enabled)) as executor:
+                    outputs = list(executor.map(run_task, strategy_classes, tasks, chunksize=chunksize))
+
+        if self.batched:
+            results = [row for rows, _ in outputs for row in rows]
+        else:
+            results = [row for row, _ in outputs]
+        if self.profile_enabled:
+            self.profile = Profiler.merge(report for _, report in outputs)
+            self.profile['wall_time'] = time.perf_counter() - start
+
+        elapsed = time.perf_counter() - start
+        print(f"✓ Ran {len(params)} configurations of {self.strategy_cls.__name__} in {elapsed:.1f}s")
+
+        # Rank best first
+        ranked = pd.DataFrame(results)
+        if len(ranked):
+            ranked = ranked.sort_values(self.rank_by, ascending=False, kind='stable').reset_index(drop=True)
+        ranked.insert(0, 'rank', np.arange(1, len(ranked) + 1))
+
+        return ranked
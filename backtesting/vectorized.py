@@ -0,0 +1,193 @@
+"""Vectorized (NumPy array) trade simulation used by the backtesting engine"""
+
+import numpy as np
+from typing import Dict, List
+
+
+def position_state(signal) -> np.ndarray:
+    """
+    Convert a signal array into a long (1) / flat (0) state for every bar
+
+    Follows the same rules as the bar-by-bar loop in Backtester.run_backtest:
+    a signal of 1 opens a position, -1 or 0 closes it, and anything else
+    (NaN or unknown values) leaves the current state unchanged.
+
+    Args:
+        signal: Array of signals (1=BUY, -1=SELL, 0=HOLD, NaN=no signal),
+            either 1-D or 2-D with time along the first axis
+
+    Returns:
+        Array of 0/1 states, same shape as signal
+    """
+    signal = np.asarray(signal, dtype=float)
+
+    # Action taken on each bar: 1 = be long, 0 = be flat, NaN = keep state
+    action = np.full(signal.shape, np.nan)
+    action[signal == 1] = 1.0
+    action[(signal == -1) | (signal == 0)] = 0.0
+
+    # Forward-fill the last action (index of most recent non-NaN action)
+    positions = np.arange(len(action)).reshape((-1,) + (1,) * (action.ndim - 1))
+    last_action = np.where(np.isnan(action), -1, positions)
+    np.maximum.accumulate(last_action, axis=0, out=last_action)
+
+    # Bars before the first action are flat
+    filled = np.take_along_axis(action, np.maximum(last_action, 0), axis=0)
+    state = np.where(last_action >= 0, filled, 0.0)
+    return state.astype(np.int8)
+
+
+def simulate_long_only(close, signal, initial_capital, commission, slippage) -> Dict:
+    """
+    Simulate an all-in/all-out long strategy on arrays
+
+    Entry and exit bars are found from the signal with array operations. Cash
+    is then compounded once per trade (not per bar) using the exact same
+    arithmetic as the loop, so results match it bit for bit.
+
+    Args:
+        close: 1-D array of closing prices
+        signal: 1-D array of signals aligned with close
+        initial_capital: Starting portfolio value in dollars
+        commission: Commission per trade as percentage (0.001 = 0.1%)
+        slippage: Price slippage as percentage (0.0005 = 0.05%)
+
+    Returns:
+        Dictionary of arrays:
+        - entry_idx / exit_idx: Bar positions of entries and exits
+        - entry_price / exit_price: Fill prices including slippage
+        - shares: Position size of each trade
+        - exit_commission: Commission paid on each exit
+        - portfolio_value: Portfolio value at every bar
+    """
+    close = np.asarray(close, dtype=float)
+    n_bars = len(close)
+
+    # Find bars where the state flips flat->long (entry) or long->flat (exit)
+    state = position_state(signal).astype(bool)
+    prev_state = np.concatenate(([False], state[:-1]))
+    entry_idx = np.flatnonzero(state & ~prev_state)
+    exit_idx = np.flatnonzero(~state & prev_state)
+
+    # Fill prices with slippage applied
+    entry_price = close[entry_idx] * (1 + slippage)
+    exit_price = close[exit_idx] * (1 - slippage)
+
+    # Compound cash trade by trade (a position may still be open at the end)
+    shares = np.empty(len(entry_idx))
+    exit_commission = np.empty(len(exit_idx))
+    cash_after_exit = np.empty(len(exit_idx))
+    cash = initial_capital
+    for k in range(len(entry_idx)):
+        commission_cost = cash * commission
+        shares[k] = (cash - commission_cost) / entry_price[k]
+        if k < len(exit_idx):
+            sale_proceeds = shares[k] * exit_price[k]
+            exit_commission[k] = sale_proceeds * commission
+            cash = sale_proceeds - exit_commission[k]
+            cash_after_exit[k] = cash
+
+    # No trades means the portfolio never leaves its starting value
+    if len(entry_idx) == 0:
+        portfolio_value = np.full(n_bars, initial_capital)
+    else:
+        # Which trade is open / which exit happened last on each bar
+        trade_num = np.cumsum(state & ~prev_state) - 1
+        exits_done = np.cumsum(~state & prev_state)
+
+        held_value = shares[np.maximum(trade_num, 0)] * close
+        cash_value = np.concatenate(([initial_capital], cash_after_exit))[exits_done]
+        portfolio_value = np.where(state, held_value, cash_value)
+
+    return {
+        'entry_idx': entry_idx,
+        'exit_idx': exit_idx,
+        'entry_price': entry_price,
+        'exit_price': exit_price,
+        'shares': shares,
+        'exit_commission': exit_commission,
+        'portfolio_value': portfolio_value,
+    }
+
+
+def simulate_long_only_batch(close, signals, initial_capital, commission, slippage) -> List[Dict]:
+    """
+    Simulate many signal columns on the same prices in one pass
+
+    Entries and exits for every column are found with 2-D array operations.
+    Cash is compounded over the k-th trade of all columns at once, so the
+    Python loop runs once per trade number (not per trade per column) while
+    every column still gets the exact arithmetic of simulate_long_only.
+
+    Args:
+        close: 1-D array of closing prices
+        signals: 2-D array of signals, one column per strategy
+        initial_capital: Starting portfolio value in dollars
+        commission: Commission per trade as percentage
+        slippage: Price slippage as percentage
+
+    Returns:
+        List with one simulate_long_only dictionary per column
+    """
+    close = np.asarray(close, dtype=float)
+    n_bars, n_cols = signals.shape
+
+    # Entry/exit flags for every column
+    state = position_state(signals).astype(bool)
+    prev_state = np.vstack((np.zeros((1, n_cols), dtype=bool), state[:-1]))
+    entries = state & ~prev_state
+    exits = ~state & prev_state
+
+    # Flat (column-major) trade lists; each column's trades are contiguous
+    entry_col, entry_idx = np.nonzero(entries.T)
+    exit_col, exit_idx = np.nonzero(exits.T)
+    n_entries = np.bincount(entry_col, minlength=n_cols)
+    n_exits = np.bincount(exit_col, minlength=n_cols)
+    entry_start = np.concatenate(([0], np.cumsum(n_entries)[:-1]))
+    exit_start = np.concatenate(([0], np.cumsum(n_exits)[:-1]))
+
+    entry_price = close[entry_idx] * (1 + slippage)
+    exit_price = close[exit_idx] * (1 - slippage)
+
+    # Compound the k-th trade of every column together
+    shares = np.empty(len(entry_idx))
+    exit_commission = np.empty(len(exit_idx))
+    cash_after_exit = np.empty(len(exit_idx))
+    cash = np.full(n_cols, float(initial_capital))
+    for k in range(int(n_entries.max(initial=0))):
+        cols = np.flatnonzero(n_entries > k)
+        commission_cost = cash[cols] * commission
+        shares[entry_start[cols] + k] = (cash[cols] - commission_cost) / entry_price[entry_start[cols] + k]
+
+        cols = np.flatnonzero(n_exits > k)
+        sale_proceeds = shares[entry_start[cols] + k] * exit_price[exit_start[cols] + k]
+        exit_commission[exit_start[cols] + k] = sale_proceeds * commission
+        cash[cols] = sale_proceeds - exit_commission[exit_start[cols] + k]
+        cash_after_exit[exit_start[cols] + k] = cash[cols]
+
+    # Portfolio value of every column on every bar
+    trade_num = np.cumsum(entries, axis=0) - 1
+    exits_done = np.cumsum(exits, axis=0)
+    held_index = np.minimum(entry_start + np.maximum(trade_num, 0), max(len(shares) - 1, 0))
+    held_value = shares[held_index] * close[:, None] if len(shares) else np.zeros(state.shape)
+    cash_values = np.concatenate(([initial_capital], cash_after_exit))
+    cash_index = np.where(exits_done > 0, exit_start + exits_done, 0)
+    portfolio_value = np.where(state, held_value, cash_values[cash_index])
+
+    results = []
+    for col in range(n_cols):
+        entries_slice = slice(entry_start[col], entry_start[col] + n_entries[col])
+        exits_slice = slice(exit_start[col], exit_start[col] + n_exits[col])
+        results.append({
+            'entry_idx': entry_idx[entries_slice],
+            'exit_idx': exit_idx[exits_slice],
+            'entry_price': entry_price[entries_slice],
+            'exit_price': exit_price[exits_slice],
+            'shares': shares[entries_slice],
+            'exit_commission': exit_commission[exits_slice],
+            # No trades means the portfolio never leaves its starting value
+            'portfolio_value': (portfolio_value[:, col] if n_entries[col]
+                                else np.full(n_bars, initial_capital)),
+        })
+
+    return results
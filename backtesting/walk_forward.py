@@ -0,0 +1,259 @@
+"""Walk-forward optimization: tune on a train window, evaluate on the next test window"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .engine import Backtester
+from .profiling import Profiler, stage
+from .shared_data import SharedSpec, SharedArrays, attach_arrays, attach_index, shareable_index
+
+
+def walk_forward_windows(n_bars: int, train_size: int, test_size: int,
+                         step: Optional[int] = None, anchored: bool = False) -> List[Dict]:
+    """
+    Split a history into consecutive train/test windows
+
+    Args:
+        n_bars: Number of bars in the history
+        train_size: Bars in each training window (the first one when anchored)
+        test_size: Bars in each test window
+        step: Bars to move forward between windows (defaults to test_size;
+            smaller steps would make test windows overlap)
+        anchored: Keep every training window starting at bar 0 (expanding)
+            instead of rolling a fixed-size window
+
+    Returns:
+        List of dicts with 'train' and 'test' (start, end) bar ranges
+    """
+    step = step or test_size
+    if step < test_size:
+        raise ValueError("step must be at least test_size so test windows don't overlap")
+
+    windows = []
+
+    train_start, train_end = 0, train_size
+    while train_end + test_size <= n_bars:
+        windows.append({
+            'train': (0 if anchored else train_start, train_end),
+            'test': (train_end, train_end + test_size),
+        })
+        train_start += step
+        train_end += step
+
+    return windows
+
+
+# Worker state, set once per process
+_worker_state = {}
+
+
+def _init_worker(data, names, backtester, rank_by, profile=False):
+    """
+    Store the price and signal arrays in the worker process
+
+    data is either (timestamps, close, signals) or the SharedSpec of those
+    arrays, which are then attached as read-only shared memory views.
+    """
+    if isinstance(data, SharedSpec):
+        arrays = attach_arrays(data)
+        data = (attach_index(data), arrays['close'], arrays['signals'])
+    timestamps, close, signals = data
+    _worker_state.update(timestamps=timestamps, close=close, signals=signals,
+                         names=names, backtester=backtester, rank_by=rank_by, profile=profile)
+
+
+def _run_window(window: Dict) -> Dict:
+    """Pick the best configuration on the train range and evaluate it on the test range"""
+
+    state = _worker_state
+    backtester = state['backtester']
+    timestamps, close, signals = state['timestamps'], state['close'], state['signals']
+    profiler = Profiler() if state['profile'] else None
+
+    # Score every configuration on the training window
+    start, end = window['train']
+    scores = np.empty(signals.shape[1])
+    for k in range(signals.shape[1]):
+        result = backtester._simulate_arrays(state['names'][k], timestamps[start:end],
+                                             close[start:end], signals[start:end, k],
+                                             keep_equity_curve=False, profiler=profiler)
+        scores[k] = result['metrics'][state['rank_by']]
+
+    # NaN scores (e.g. no variance) never win
+    best = int(np.argmax(np.where(np.isnan(scores), -np.inf, scores)))
+
+    # Out-of-sample run of the winner, closing any open position at the last
+    # bar (a HOLD there sells at the close with the normal exit costs)
+    start, end = window['test']
+    test_signal = signals[start:end, best].copy()
+    test_signal[-1] = 0
+    test = backtester._simulate_arrays(state['names'][best], timestamps[start:end],
+                                       close[start:end], test_signal, profiler=profiler)
+
+    report = None
+    if profiler:
+        train_bars = window['train'][1] - window['train'][0]
+        profiler.count('bars', train_bars * signals.shape[1] + end - start)
+        profiler.count('trades', len(test['trades']))
+        report = profiler.report()
+
+    return {'best': best, 'train_score': scores[best], 'test': test, 'profile': report}
+
+
+class WalkForward:
+    """
+    Walk-forward optimizer and out-of-sample validator for one strategy class
+
+    Signals for every parameter set are generated once on the full history
+    (indicators only look back, so each window's slice equals what the
+    strategy would compute there given its earlier data). Windows then only
+    slice those arrays instead of recomputing indicators, and run in parallel
+    across processes. Prices and the signal matrix are written once to shared
+    memory, so workers attach to them instead of each holding a copy.
+
+    Each test window ends flat: a position still open on its last bar is
+    sold at that close, paying slippage and commission, and recorded as a
+    trade, so the next window starts from cash.
+    """
+
+    def __init__(self, strategy_cls, params: List[Dict], backtester: Optional[Backtester] = None,
+                 train_size: int = 252, test_size: int = 63, step: Optional[int] = None,
+                 anchored: bool = False, rank_by: str = 'sharpe_ratio',
+                 max_workers: Optional[int] = None, profile: bool = False,
+                 share_data: Optional[str] = 'shm'):
+        """
+        Initialize walk-forward runner
+
+        Args:
+            strategy_cls: Strategy class, called as strategy_cls(**params)
+            params: Parameter dictionaries to choose from in each train window
+            backtester: Backtester with cost settings (defaults to Backtester())
+            train_size: Bars per training window
+            test_size: Bars per test window
+            step: Bars between windows (defaults to test_size)
+            anchored: Expanding train windows from the start of the data
+            rank_by: Training metric to maximize
+            max_workers: Worker processes (None = all cores, 1 = run in-process)
+            profile: Time each stage in every worker and add the merged
+                report to the result as 'profile'
+            share_data: How workers get the arrays: 'shm' (shared memory),
+                'memmap' (.npy files) or None (pickled copy per worker)
+        """
+        self.strategy_cls = strategy_cls
+        self.params = params
+        self.backtester = backtester or Backtester()
+        self.train_size = train_size
+        self.test_size = test_size
+        self.step = step
+        self.anchored = anchored
+        self.rank_by = rank_by
+        self.max_workers = max_workers or os.cpu_count()
+        self.profile = profile
+        self.share_data = share_data
+
+    def run(self, df: pd.DataFrame) -> Dict:
+        """
+        Run every window and stitch the out-of-sample results together
+
+        Args:
+            df: DataFrame with OHLCV data
+
+        Returns:
+            Dictionary with:
+            - windows: DataFrame with one row per window (ranges, chosen
+              parameters, train score and test metrics)
+            - trades: All out-of-sample trades
+            - equity_curve: Combined out-of-sample equity curve
+            - metrics: Metrics of the combined out-of-sample run
+            - profile: Stage timings merged across workers (profile=True only)
+        """
+
+        started = time.perf_counter()
+        profiler = Profiler() if self.profile else None
+        windows = walk_forward_windows(len(df), self.train_size, self.test_size, self.step, self.anchored)
+        if not windows:
+            raise ValueError(f"Need at least {self.train_size + self.test_size} bars, got {len(df)}")
+
+        # Signals for every configuration, computed once on the full history
+        with profiler.capture() if profiler else nullcontext(), stage(profiler, 'signals'):
+            strategies = [self.strategy_cls(**params) for params in self.params]
+            signals = np.column_stack([
+                strategy.generate_signals(df)['signal'].to_numpy(dtype=float) for strategy in strategies
+            ])
+        names = [strategy.name for strategy in strategies]
+        data = (df.index, df['close'].to_numpy(dtype=float), signals)
+        settings = (names, self.backtester, self.rank_by, self.profile)
+
+        if self.max_workers == 1 or len(windows) == 1:
+            _init_worker(data, *settings)
+            results = list(map(_run_window, windows))
+        else:
+            with SharedArrays({'close': data[1], 'signals': signals}, self.share_data, index=df.index) \
+                    if self.share_data and shareable_index(df.index) else nullcontext() as shared:
+                with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                         initargs=(shared.spec if shared else data, *settings)) as executor:
+                    results = list(executor.map(_run_window, windows))
+
+        with stage(profiler, 'stitch'):
+            combined = self._stitch(df.index, windows, results)
+
+        if profiler:
+            combined['profile'] = Profiler.merge([profiler.report()] + [result['profile'] for result in results])
+            combined['profile']['wall_time'] = time.perf_counter() - started
+
+        elapsed = time.perf_counter() - started
+        print(f"✓ Walk-forward over {len(windows)} windows x {len(self.params)} configurations in {elapsed:.1f}s")
+
+        return combined
+
+    def _stitch(self, timestamps, windows, results) -> Dict:
+        """Chain test windows into one out-of-sample run"""
+
+        rows = []
+        trades = []
+        equity_parts = []
+
+        # Every test window was simulated from initial_capital; since the
+        # simulation scales linearly with capital, rescale each window to start
+        # where the previous one ended
+        capital = self.backtester.initial_capital
+        for number, (window, result) in enumerate(zip(windows, results)):
+            test = result['test']
+            scale = capital / self.backtester.initial_capital
+
+            equity = test['equity_curve'].copy()
+            equity['portfolio_value'] = equity['portfolio_value'] * scale
+            equity_parts.append(equity)
+
+            for trade in test['trades']:
+                trades.append({**trade, 'shares': trade['shares'] * scale, 'pnl': trade['pnl'] * scale})
+
+            rows.append({
+                'window': number,
+                'train_start': timestamps[window['train'][0]],
+                'train_end': timestamps[window['train'][1] - 1],
+                'test_start': timestamps[window['test'][0]],
+                'test_end': timestamps[window['test'][1] - 1],
+                **self.params[result['best']],
+                'strategy': test['strategy_name'],
+                f"train_{self.rank_by}": result['train_score'],
+                **{f"test_{key}": value for key, value in test['metrics'].items()},
+            })
+
+            # Windows end flat, so this is the cash carried into the next one
+            capital = equity['portfolio_value'].iloc[-1]
+
+        equity_curve = pd.concat(equity_parts, ignore_index=True)
+
+        return {
+            'windows': pd.DataFrame(rows),
+            'trades': trades,
+            'equity_curve': equity_curve,
+            'metrics': self.backtester._calculate_metrics(trades, equity_curve),
+        }
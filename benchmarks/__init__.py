@@ -0,0 +1 @@
+"""Performance benchmarks (run as scripts, e.g. python -m benchmarks.bench_engine)"""
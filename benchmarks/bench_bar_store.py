@@ -0,0 +1,55 @@
+"""Benchmark range reads from the columnar bar store against DatabaseManager"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from database.bar_store import ColumnarBarStore
+from database.models import DatabaseManager
+from .data import gbm_bars
+
+
+def best_of(func, repeat=3):
+    """Fastest of several runs (reads after the first hit the OS page cache)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bars', type=int, default=1_000_000, help='Number of 1-minute bars to store')
+    args = parser.parse_args()
+
+    bars = gbm_bars(args.bars)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        db.bulk_save_bars('BENCH', bars)
+
+        stores = {fmt: ColumnarBarStore(os.path.join(tmp, fmt), file_format=fmt) for fmt in ('ipc', 'parquet')}
+        for store in stores.values():
+            store.import_from_database(db)
+
+        # Read the middle half of the history
+        start, end = bars.index[len(bars) // 4], bars.index[3 * len(bars) // 4]
+        readers = {
+            'get_bars (ORM)': lambda: db.get_bars('BENCH', start, end),
+            'get_bars_df': lambda: db.get_bars_df('BENCH', start, end),
+            'store.read (ipc)': lambda: stores['ipc'].read('BENCH', start, end),
+            'store.read_table (ipc)': lambda: stores['ipc'].read_table('BENCH', start, end),
+            'store.read (parquet)': lambda: stores['parquet'].read('BENCH', start, end),
+        }
+
+        print(f"Range read of ~{args.bars // 2:,} bars")
+        for label, reader in readers.items():
+            elapsed, result = best_of(reader, repeat=1 if 'ORM' in label else 3)
+            print(f"  {label:<24} {elapsed:8.4f}s  ({len(result) / elapsed:14,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
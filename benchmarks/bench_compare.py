@@ -0,0 +1,42 @@
+"""Benchmark sequential vs batched Backtester.compare_strategies"""
+
+import argparse
+import time
+
+from backtesting.engine import Backtester
+from strategies.bollinger_bands import BollingerBands
+from .data import gbm_bars
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bars', type=int, default=100_000, help='Number of bars per strategy')
+    parser.add_argument('--strategies', type=int, default=100, help='Number of strategies to compare')
+    parser.add_argument('--skip-sequential', action='store_true', help='Only time the batched path')
+    args = parser.parse_args()
+
+    df = gbm_bars(args.bars)
+    strategies = [BollingerBands(period=10 + k % 40, std_dev=1 + (k // 40) * 0.5)
+                  for k in range(args.strategies)]
+    backtester = Backtester(initial_capital=10000, commission=0.001, slippage=0.0005)
+
+    print(f"Comparing {len(strategies)} strategies on {args.bars:,} bars")
+
+    start = time.perf_counter()
+    batched = backtester.compare_strategies(strategies, df, batched=True)
+    batched_time = time.perf_counter() - start
+    print(f"  batched:    {batched_time:8.3f}s")
+
+    if args.skip_sequential:
+        return
+
+    start = time.perf_counter()
+    sequential = backtester.compare_strategies(strategies, df)
+    sequential_time = time.perf_counter() - start
+    print(f"  sequential: {sequential_time:8.3f}s")
+    print(f"  speedup:    {sequential_time / batched_time:8.1f}x  "
+          f"(results identical: {sequential.equals(batched)})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Benchmark DatabaseManager write and read paths (ORM vs bulk/columnar)"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from database.models import DatabaseManager
+from utils.analysis import DataAnalyzer
+from .data import gbm_bars
+
+
+def timed(label, n_rows, func):
+    """Run func once and print throughput"""
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:8.3f}s  ({n_rows / elapsed:12,.0f} rows/s)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bars', type=int, default=500_000, help='Number of bars to store')
+    args = parser.parse_args()
+
+    bars = gbm_bars(args.bars)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        analyzer = DataAnalyzer(db)
+
+        print(f"Writing {args.bars:,} bars")
+        timed('bulk_save_bars', args.bars, lambda: db.bulk_save_bars('BENCH', bars))
+
+        print(f"Reading {args.bars:,} bars")
+        timed('get_bars + bars_to_dataframe', args.bars,
+              lambda: analyzer.bars_to_dataframe(db.get_bars('BENCH')))
+        timed('get_bars_df', args.bars, lambda: db.get_bars_df('BENCH'))
+        timed('get_bars_df (100k chunks)', args.bars,
+              lambda: sum(len(chunk) for chunk in db.get_bars_df('BENCH', chunksize=100_000)))
+
+
+if __name__ == '__main__':
+    main()
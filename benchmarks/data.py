@@ -0,0 +1,86 @@
+"""Synthetic OHLCV generators for reproducible benchmarks"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _bars_from_close(close, rng, freq, start, spread=0.0002) -> pd.DataFrame:
+    """Wrap a close path into consistent OHLCV bars (open = previous close)"""
+    n_bars = len(close)
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    wick = np.abs(rng.normal(0, spread, n_bars)) * close
+    index = pd.date_range(start, periods=n_bars, freq=freq, name='timestamp')
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + wick,
+        'low': np.minimum(open_, close) - wick,
+        'close': close,
+        'volume': rng.integers(100, 10_000, n_bars),
+    }, index=index)
+
+
+def gbm_bars(n_bars: int, seed: int = 42, mu: float = 0.0, sigma: float = 0.0005,
+             start_price: float = 100.0, freq: str = 'min', start: str = '2020-01-01') -> pd.DataFrame:
+    """
+    Geometric Brownian motion bars
+
+    Args:
+        n_bars: Number of bars
+        seed: Random seed (same seed, same bars)
+        mu: Drift per bar
+        sigma: Volatility per bar
+        start_price: First close
+        freq: Bar frequency ('min', 'D', ...)
+        start: First timestamp
+
+    Returns:
+        DataFrame with OHLCV columns indexed by timestamp
+    """
+    rng = np.random.default_rng(seed)
+    log_returns = rng.normal(mu - sigma ** 2 / 2, sigma, n_bars)
+    close = start_price * np.exp(np.cumsum(log_returns))
+    return _bars_from_close(close, rng, freq, start)
+
+
+# (drift, volatility) per bar for calm-bull, choppy and crash regimes
+DEFAULT_REGIMES = [(0.00002, 0.0003), (0.0, 0.0008), (-0.00008, 0.002)]
+
+
+def regime_switching_bars(n_bars: int, seed: int = 42, regimes: Optional[List[Tuple[float, float]]] = None,
+                          stay_probability: float = 0.999, start_price: float = 100.0,
+                          freq: str = 'min', start: str = '2020-01-01') -> pd.DataFrame:
+    """
+    Bars from a Markov regime-switching GBM (trends, chop and crashes)
+
+    Each bar stays in the current regime with stay_probability, otherwise
+    jumps to a uniformly chosen other regime. Strategies see realistic
+    volatility clustering instead of one stationary random walk.
+
+    Args:
+        n_bars: Number of bars
+        seed: Random seed
+        regimes: List of (drift, volatility) per bar (defaults to DEFAULT_REGIMES)
+        stay_probability: Chance of staying in a regime on each bar
+        start_price: First close
+        freq: Bar frequency
+        start: First timestamp
+
+    Returns:
+        DataFrame with OHLCV columns indexed by timestamp (plus a 'regime' column)
+    """
+    regimes = np.asarray(regimes or DEFAULT_REGIMES, dtype=float)
+    rng = np.random.default_rng(seed)
+
+    # Regime path: runs of geometric length between switches
+    switches = rng.random(n_bars) > stay_probability
+    jumps = rng.integers(1, len(regimes), n_bars)
+    regime = np.cumsum(np.where(switches, jumps, 0)) % len(regimes)
+
+    drift, vol = regimes[regime, 0], regimes[regime, 1]
+    close = start_price * np.exp(np.cumsum(rng.normal(drift - vol ** 2 / 2, vol)))
+
+    df = _bars_from_close(close, rng, freq, start)
+    df['regime'] = regime
+    return df
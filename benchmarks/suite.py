@@ -0,0 +1,464 @@
+"""Benchmark suite with a JSON history and regression checks
+
+Run everything and compare with earlier runs on this machine:
+
+    python -m benchmarks.suite
+    python -m benchmarks.suite --quick --filter engine --save
+
+Every case builds its inputs from the synthetic generators in
+benchmarks.data (fixed seeds), times the best of several repeats and
+reports seconds and rows per second. With --save the run is appended to the
+history file; each case is compared with the median of the last saved runs
+from the same host and scale, and slowdowns beyond the case's threshold are
+reported as regressions (exit code 1).
+"""
+
+import argparse
+import atexit
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from backtesting.engine import Backtester
+from strategies.bollinger_bands import BollingerBands
+from strategies.moving_average import MovingAverageCrossover
+from strategies.rsi_strategy import RSIMeanReversion
+from utils.indicator_cache import indicator_cache
+from .data import gbm_bars, regime_switching_bars
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(__file__), 'history.json')
+DEFAULT_THRESHOLD = 0.25  # 25% slower than the baseline is a regression
+
+BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# name -> (setup, rows, group, threshold)
+CASES = {}
+
+
+def case(name: str, rows: int, group: str, threshold: float = DEFAULT_THRESHOLD):
+    """
+    Register a benchmark case
+
+    The decorated setup(rows) function builds its inputs and returns the
+    zero-argument callable that gets timed (setup itself is not timed).
+
+    Args:
+        name: Unique case name
+        rows: Bars processed at full scale (--quick divides by 10)
+        group: Case group (engine, strategies, indicators, storage, providers, live),
+            also the name prefix so --filter can select it
+        threshold: Allowed slowdown before flagging a regression (0.25 = 25%)
+    """
+    def register(setup):
+        CASES[name] = (setup, rows, group, threshold)
+        return setup
+    return register
+
+
+def _quiet(func):
+    """Wrap func so its status prints don't clutter the benchmark output"""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return run
+
+
+STRATEGIES = [MovingAverageCrossover(20, 50), RSIMeanReversion(14, 30, 70), BollingerBands(20, 2)]
+
+
+class _PrecomputedSignals:
+    """Strategy stand-in returning already generated signals (isolates the simulation)"""
+
+    def __init__(self, strategy, df):
+        self.name = strategy.name
+        self.df = strategy.generate_signals(df)
+
+    def generate_signals(self, df):
+        return self.df
+
+
+# --- Engine ---------------------------------------------------------------
+
+@case('engine.run_backtest.loop', 100_000, 'engine')
+def _run_backtest_loop(rows):
+    signals = _PrecomputedSignals(BollingerBands(20, 2), regime_switching_bars(rows))
+    return lambda: Backtester().run_backtest(signals, signals.df)
+
+
+@case('engine.run_backtest.vectorized', 2_000_000, 'engine')
+def _run_backtest_vectorized(rows):
+    signals = _PrecomputedSignals(BollingerBands(20, 2), regime_switching_bars(rows))
+    return lambda: Backtester().run_backtest(signals, signals.df, vectorized=True)
+
+
+@case('engine.run_backtest.stops', 2_000_000, 'engine')
+def _run_backtest_stops(rows):
+    signals = _PrecomputedSignals(BollingerBands(20, 2), regime_switching_bars(rows))
+    backtester = Backtester(stop_loss=0.01, take_profit=0.02, trailing_stop=0.01)
+    backtester.run_backtest(signals, signals.df.iloc[:1000])  # compile the kernel first
+    return lambda: backtester.run_backtest(signals, signals.df)
+
+
+@case('engine.run_backtest.result_store', 2_000_000, 'engine', threshold=0.5)
+def _run_backtest_result_store(rows):
+    """Stored run loaded back (data fingerprint, index lookup and array read)"""
+    from backtesting.result_store import ResultStore
+
+    tmp = tempfile.mkdtemp(prefix='bench_results_')
+    atexit.register(shutil.rmtree, tmp, True)
+    df = regime_switching_bars(rows)
+    backtester = Backtester(result_store=ResultStore(tmp))
+    backtester.run_backtest(BollingerBands(20, 2), df, vectorized=True)
+    return lambda: backtester.run_backtest(BollingerBands(20, 2), df)
+
+
+@case('engine.compare_strategies.sequential', 20_000, 'engine')
+def _compare_sequential(rows):
+    df = regime_switching_bars(rows)
+    return _quiet(lambda: Backtester().compare_strategies(STRATEGIES, df))
+
+
+@case('engine.compare_strategies.batched', 500_000, 'engine')
+def _compare_batched(rows):
+    df = regime_switching_bars(rows)
+    return _quiet(lambda: Backtester().compare_strategies(STRATEGIES, df, batched=True))
+
+
+def _sweep_case(batched: bool):
+    """BollingerBands over periods 5..100 and two std_devs (192 configurations), in-process"""
+    def setup(rows):
+        from backtesting.sweep import ParameterSweep, parameter_grid
+
+        df = regime_switching_bars(rows)
+        params = parameter_grid({'period': list(range(5, 101)), 'std_dev': [2, 3]})
+        sweep = ParameterSweep(BollingerBands, max_workers=1, batched=batched)
+
+        def run():
+            indicator_cache.clear()
+            return sweep.run(df, params)
+        return _quiet(run)
+    return setup
+
+
+case('engine.sweep.bollinger_192', 20_000, 'engine')(_sweep_case(batched=False))
+case('engine.sweep.bollinger_192.batched', 20_000, 'engine')(_sweep_case(batched=True))
+
+
+# --- Strategies (cold indicator cache) --------------------------------------
+
+def _signals_case(strategy):
+    def setup(rows):
+        df = regime_switching_bars(rows)
+
+        def run():
+            indicator_cache.clear()
+            return strategy.generate_signals(df)
+        return run
+    return setup
+
+
+for _strategy in STRATEGIES:
+    case(f'strategies.{type(_strategy).__name__}.generate_signals', 1_000_000, 'strategies')(
+        _signals_case(_strategy))
+
+
+# --- DataAnalyzer indicators (cold indicator cache) -------------------------
+
+def _analyzer_case(method, *args):
+    def setup(rows):
+        from utils.analysis import DataAnalyzer
+
+        analyzer = DataAnalyzer(db=object())  # indicators never touch the database
+        df = gbm_bars(rows)
+
+        def run():
+            indicator_cache.clear()
+            return getattr(analyzer, method)(df.copy(), *args)
+        return run
+    return setup
+
+
+for _method, _args in [('add_returns', ()), ('add_sma', (20,)), ('add_ema', (20,)),
+                       ('add_rsi', (14,)), ('add_bollinger_bands', (20, 2))]:
+    case(f'indicators.DataAnalyzer.{_method}', 1_000_000, 'indicators')(_analyzer_case(_method, *_args))
+
+
+# --- Indicator kernels vs pandas (same inputs, same outputs) ----------------
+
+def _kernel_cases():
+    """name -> (NumPy kernel call, pandas equivalent), each taking OHLC arrays and their DataFrame"""
+    from utils import indicators as kernels
+
+    def pandas_rsi(close):
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0).rolling(14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+        return 100 - 100 / (1 + gain / loss)
+
+    def pandas_atr(df):
+        prev_close = df['close'].shift()
+        tr = np.maximum(df['high'] - df['low'],
+                        np.maximum((df['high'] - prev_close).abs(), (df['low'] - prev_close).abs()))
+        return tr.rolling(14).mean()
+
+    return {
+        'sma': (lambda a: kernels.sma(a['close'], 20), lambda df: df['close'].rolling(20).mean()),
+        'bollinger_bands': (lambda a: kernels.bollinger_bands(a['close'], 20, 2),
+                            lambda df: (df['close'].rolling(20).mean(), df['close'].rolling(20).std())),
+        'ema': (lambda a: kernels.ema(a['close'], 20), lambda df: df['close'].ewm(span=20, adjust=False).mean()),
+        'rsi': (lambda a: kernels.rsi(a['close'], 14), lambda df: pandas_rsi(df['close'])),
+        'atr': (lambda a: kernels.atr(a['high'], a['low'], a['close'], 14, method='simple'), pandas_atr),
+        'donchian': (lambda a: kernels.donchian(a['high'], a['low'], 20),
+                     lambda df: (df['high'].rolling(20).max(), df['low'].rolling(20).min())),
+    }
+
+
+def _kernel_case(name: str, use_pandas: bool, n_symbols: int):
+    def setup(rows):
+        kernel, reference = _kernel_cases()[name]
+        frames = [gbm_bars(rows // n_symbols, seed=i) for i in range(n_symbols)]
+        if n_symbols == 1:
+            df = frames[0]
+        else:
+            # Time x symbols matrices (pandas runs column by column)
+            df = {col: pd.DataFrame({i: frame[col].to_numpy() for i, frame in enumerate(frames)})
+                  for col in ['high', 'low', 'close']}
+        if use_pandas:
+            return lambda: reference(df)
+        arrays = {col: np.asfortranarray(df[col]) for col in ['high', 'low', 'close']}
+        kernel(arrays)  # compile outside the timing
+        return lambda: kernel(arrays)
+    return setup
+
+
+for _name in ['sma', 'bollinger_bands', 'ema', 'rsi', 'atr', 'donchian']:
+    for _backend in ['numpy', 'pandas']:
+        case(f'indicators.{_backend}.{_name}', 1_000_000, 'indicators')(
+            _kernel_case(_name, _backend == 'pandas', 1))
+for _name in ['bollinger_bands', 'ema', 'rsi']:
+    for _backend in ['numpy', 'pandas']:
+        case(f'indicators.{_backend}.{_name}.100_symbols', 5_000_000, 'indicators')(
+            _kernel_case(_name, _backend == 'pandas', 100))
+
+
+# --- Storage ----------------------------------------------------------------
+
+def _storage_case(write: bool, bulk: bool):
+    def setup(rows):
+        from database.models import DatabaseManager
+
+        bars = gbm_bars(rows)[BAR_COLUMNS]
+        tmp = tempfile.mkdtemp(prefix='bench_db_')
+        atexit.register(shutil.rmtree, tmp, True)
+        counter = iter(range(1_000_000))
+
+        def fresh_db():
+            return DatabaseManager(f"sqlite:///{os.path.join(tmp, f'bench_{next(counter)}.db')}")
+
+        if write:
+            # New database per repeat so every write inserts every row
+            if bulk:
+                return _quiet(lambda: fresh_db().bulk_save_bars('BENCH', bars))
+            return _quiet(lambda: fresh_db().save_bars('BENCH', bars))
+
+        db = fresh_db()
+        _quiet(lambda: db.bulk_save_bars('BENCH', bars))()
+        if bulk:
+            return lambda: db.get_bars_df('BENCH')
+        return lambda: db.get_bars('BENCH')
+    return setup
+
+
+case('storage.save_bars', 5_000, 'storage', threshold=0.5)(_storage_case(write=True, bulk=False))
+case('storage.bulk_save_bars', 500_000, 'storage', threshold=0.5)(_storage_case(write=True, bulk=True))
+case('storage.get_bars', 200_000, 'storage', threshold=0.5)(_storage_case(write=False, bulk=False))
+case('storage.get_bars_df', 1_000_000, 'storage', threshold=0.5)(_storage_case(write=False, bulk=True))
+
+
+@case('storage.resample_bars', 2_000_000, 'storage')
+def _resample_bars(rows):
+    from database.resample import resample_bars
+
+    bars = gbm_bars(rows)[BAR_COLUMNS]
+    return lambda: [resample_bars(bars, interval) for interval in ('5m', '1h', '1d')]
+
+
+# --- Providers --------------------------------------------------------------
+
+@case('providers.yahoo.parse', 1_000_000, 'providers')
+def _yahoo_parse(rows):
+    """YahooProvider.get_bars post-processing on a canned yfinance response (no network)"""
+    from data.providers.yahoo import YahooProvider
+
+    raw = gbm_bars(rows)[BAR_COLUMNS]
+    raw.index = raw.index.tz_localize('America/New_York')
+    raw.columns = [col.capitalize() for col in raw.columns]
+    raw['Dividends'] = 0.0
+    raw['Stock Splits'] = 0.0
+
+    ticker = mock.Mock()
+    ticker.history.side_effect = lambda **kwargs: raw.copy()
+    provider = YahooProvider()
+
+    def run():
+        with mock.patch('data.providers.yahoo.yf.Ticker', return_value=ticker):
+            return provider.get_bars('BENCH', raw.index[0], raw.index[-1])
+    return _quiet(run)
+
+
+# --- Live -------------------------------------------------------------------
+
+@case('live.replay.merge', 500_000, 'live')
+def _replay_merge(rows):
+    """k-way merge of 100 symbols into one stream, driving a streaming strategy per symbol"""
+    from live import ReplayFeed
+    from strategies.streaming import StreamingBollingerBands
+
+    n_symbols = 100
+    frames = {f'S{i}': gbm_bars(rows // n_symbols, seed=i)[BAR_COLUMNS] for i in range(n_symbols)}
+    feed = ReplayFeed(None, list(frames), frames=frames)
+
+    def run():
+        strategies = {symbol: StreamingBollingerBands(20, 2) for symbol in frames}
+        return feed.run(lambda bar: strategies[bar.symbol].on_bar(bar))
+    return run
+
+
+# --- Runner -----------------------------------------------------------------
+
+def time_case(setup: Callable, rows: int, repeat: int) -> Dict:
+    """Set up one case and time the best of `repeat` runs"""
+    func = setup(rows)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {'seconds': best, 'rows': rows, 'rows_per_second': rows / best if best else None}
+
+
+def load_history(path: str) -> List[Dict]:
+    """Saved runs, oldest first (empty if the file doesn't exist)"""
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_history(path: str, history: List[Dict]):
+    """Write the run history atomically"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def baseline(history: List[Dict], name: str, host: str, scale: float, window: int = 5) -> Optional[float]:
+    """Median seconds of a case over the last `window` comparable runs (None if never run)"""
+    times = [run['results'][name]['seconds'] for run in history
+             if run['host'] == host and run['scale'] == scale and name in run['results']]
+    return float(np.median(times[-window:])) if times else None
+
+
+def find_regressions(results: Dict, history: List[Dict], host: str, scale: float,
+                     thresholds: Dict[str, float], window: int = 5) -> Dict[str, float]:
+    """
+    Cases slower than their baseline by more than their threshold
+
+    Returns:
+        Mapping of case name to slowdown ratio (1.4 = 40% slower)
+    """
+    regressions = {}
+    for name, result in results.items():
+        reference = baseline(history, name, host, scale, window)
+        if reference:
+            ratio = result['seconds'] / reference
+            if ratio > 1 + thresholds.get(name, DEFAULT_THRESHOLD):
+                regressions[name] = ratio
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    """Current commit hash, if running from a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Run the benchmark suite and check for regressions')
+    parser.add_argument('--filter', default='', help='Only run cases whose name contains this text')
+    parser.add_argument('--quick', action='store_true', help='Use a tenth of the rows per case')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case (best is kept)')
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help='JSON history file')
+    parser.add_argument('--save', action='store_true', help='Append this run to the history')
+    parser.add_argument('--window', type=int, default=5, help='Past runs in the baseline median')
+    parser.add_argument('--list', action='store_true', help='List cases and exit')
+    args = parser.parse_args(argv)
+
+    selected = {name: spec for name, spec in CASES.items() if args.filter in name}
+    if args.list:
+        for name, (_, rows, group, threshold) in selected.items():
+            print(f"{name:<55} {rows:>10,} rows  (+{threshold:.0%})")
+        return 0
+
+    scale = 0.1 if args.quick else 1.0
+    host = platform.node()
+    history = load_history(args.history)
+
+    results = {}
+    for name, (setup, rows, group, threshold) in selected.items():
+        rows = max(1000, int(rows * scale))
+        try:
+            results[name] = time_case(setup, rows, args.repeat)
+        except ImportError as exc:
+            # Optional dependency (e.g. yfinance) missing
+            print(f"  {name:<55} skipped ({exc})")
+            continue
+
+        result = results[name]
+        reference = baseline(history, name, host, scale, args.window)
+        change = f"{result['seconds'] / reference - 1:+7.1%}" if reference else '    new'
+        print(f"  {name:<55} {result['seconds']:8.3f}s  {result['rows_per_second']:14,.0f} rows/s  {change}")
+
+    thresholds = {name: spec[3] for name, spec in CASES.items()}
+    regressions = find_regressions(results, history, host, scale, thresholds, args.window)
+
+    if args.save:
+        history.append({
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'host': host,
+            'python': platform.python_version(),
+            'scale': scale,
+            'results': results,
+        })
+        save_history(args.history, history)
+        print(f"✓ Saved run to {args.history}")
+
+    if regressions:
+        for name, ratio in regressions.items():
+            print(f"✗ Regression: {name} is {ratio - 1:.0%} slower than its baseline")
+        return 1
+
+    print(f"✓ {len(results)} benchmarks, no regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -3,12 +3,37 @@
 from abc import ABC, abstractmethod # for creating the abstract class
 import pandas as pd
 from datetime import datetime
+from typing import Dict, Iterable
+
+from .batch import BatchFetcher, output_quiet
 
 
 class DataProvider(ABC):
     """Interface that all data providers must implement"""
     
+    # Requests per second allowed when fetching many symbols (None = unlimited)
+    rate_limit = None
+    
+    # Print per-request status lines (BatchFetcher turns them off unless verbose=True)
+    verbose = True
+    
+    def log(self, message: str):
+        """Print a status line unless turned off for this provider or fetch"""
+        if self.verbose and not output_quiet():
+            print(message)
+    
     @abstractmethod
     def get_bars(self, symbol: str, start: datetime, end: datetime, interval: str) -> pd.DataFrame:
         """Fetch OHLCV bars for a symbol between start and end dates"""
-        pass
\ No newline at end of file
+        pass
+    
+    def get_bars_batch(self, symbols: Iterable[str], start: datetime, end: datetime,
+                       interval: str = '1m', **fetch_options) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch many symbols concurrently (see BatchFetcher for fetch_options)
+        
+        Returns:
+            Dictionary of symbol -> DataFrame for every symbol that succeeded
+        """
+        results = BatchFetcher(self, **fetch_options).fetch_all(symbols, start, end, interval)
+        return {symbol: result.bars for symbol, result in results.items() if result.ok}
@@ -0,0 +1,207 @@
+"""Concurrent multi-symbol fetching with rate limiting and retries"""
+
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional
+
+import pandas as pd
+
+
+class RateLimiter:
+    """Thread-safe token bucket: at most `rate` requests per second, bursts up to `burst`"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Requests allowed per second
+            burst: Requests that may go out back-to-back before throttling
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+
+# Per-thread output switch: BatchFetcher workers turn off per-symbol status lines
+_thread_state = threading.local()
+
+
+def output_quiet() -> bool:
+    """True while the current thread is fetching for a non-verbose BatchFetcher"""
+    return getattr(_thread_state, 'quiet', False)
+
+
+# One limiter per provider instance, shared by every fetcher using it
+_limiters = weakref.WeakKeyDictionary()
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(provider, rate: Optional[float] = None) -> Optional[RateLimiter]:
+    """
+    Get the rate limiter shared by all batch fetches through a provider
+
+    Args:
+        provider: DataProvider instance
+        rate: Requests per second (defaults to the provider's rate_limit attribute)
+
+    Returns:
+        RateLimiter, or None if the provider is not rate limited
+    """
+    rate = rate or getattr(provider, 'rate_limit', None)
+    if not rate:
+        return None
+
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None or limiter.rate != rate:
+            limiter = RateLimiter(rate)
+            _limiters[provider] = limiter
+        return limiter
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching one symbol"""
+    symbol: str
+    bars: Optional[pd.DataFrame]  # None if every attempt failed
+    error: Optional[Exception] = None
+    attempts: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchFetcher:
+    """
+    Downloads many symbols concurrently from one provider
+
+    Requests run on a bounded thread pool, pass through the provider's shared
+    rate limiter and are retried with exponential backoff. Results are yielded
+    as each symbol finishes, so they can be stored while others download.
+    """
+
+    def __init__(self, provider, max_workers: int = 8, rate_limit: Optional[float] = None,
+                 max_retries: int = 3, backoff: float = 1.0, backoff_factor: float = 2.0,
+                 verbose: bool = False):
+        """
+        Initialize fetcher
+
+        Args:
+            provider: DataProvider to download from
+            max_workers: Maximum concurrent requests
+            rate_limit: Requests per second for this provider (defaults to provider.rate_limit)
+            max_retries: Retries after the first failed attempt
+            backoff: Seconds to wait before the first retry
+            backoff_factor: Multiplier applied to the wait after each retry
+            verbose: Let the provider print its per-symbol status lines
+        """
+        self.provider = provider
+        self.max_workers = max_workers
+        self.limiter = limiter_for(provider, rate_limit)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_factor = backoff_factor
+        self.verbose = verbose
+
+    def _fetch_one(self, symbol, start, end, interval) -> FetchResult:
+        """Fetch one symbol, retrying failures with backoff"""
+
+        started = time.perf_counter()
+        delay = self.backoff
+        error = None
+        _thread_state.quiet = not self.verbose
+
+        for attempt in range(1, self.max_retries + 2):
+            if self.limiter:
+                self.limiter.acquire()
+            try:
+                bars = self.provider.get_bars(symbol, start, end, interval)
+                return FetchResult(symbol, bars, attempts=attempt, elapsed=time.perf_counter() - started)
+            except Exception as exc:
+                error = exc
+                if attempt <= self.max_retries:
+                    time.sleep(delay)
+                    delay *= self.backoff_factor
+
+        return FetchResult(symbol, None, error, attempts=self.max_retries + 1,
+                           elapsed=time.perf_counter() - started)
+
+    def fetch(self, symbols: Iterable[str], start: datetime, end: datetime,
+              interval: str = '1m') -> Iterator[FetchResult]:
+        """
+        Yield a FetchResult for each symbol as soon as it completes
+
+        If the caller stops iterating early (break or an exception), downloads
+        that haven't started are cancelled instead of run to completion.
+        """
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = [executor.submit(self._fetch_one, symbol, start, end, interval) for symbol in symbols]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Requests already running finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def fetch_all(self, symbols: Iterable[str], start: datetime, end: datetime,
+                  interval: str = '1m') -> Dict[str, FetchResult]:
+        """Fetch every symbol and return results keyed by symbol"""
+        return {result.symbol: result for result in self.fetch(symbols, start, end, interval)}
+
+    def fetch_to_database(self, db, symbols: Iterable[str], start: datetime, end: datetime,
+                          interval: str = '1m') -> Dict:
+        """
+        Fetch symbols and bulk-save each one as soon as it arrives
+
+        Saving happens on the calling thread (SQLite allows one writer), while
+        the remaining downloads continue in the background.
+
+        Args:
+            db: DatabaseManager to store bars in
+            symbols: Tickers to download
+            start: Range start
+            end: Range end
+            interval: Bar interval
+
+        Returns:
+            Dictionary with 'inserted' and 'skipped' row totals and a
+            'failed' mapping of symbol to error
+        """
+
+        summary = {'inserted': 0, 'skipped': 0, 'failed': {}}
+
+        for result in self.fetch(symbols, start, end, interval):
+            if not result.ok:
+                summary['failed'][result.symbol] = result.error
+                print(f"✗ {result.symbol} failed after {result.attempts} attempts: {result.error}")
+                continue
+
+            if len(result.bars):
+                counts = db.bulk_save_bars(result.symbol, result.bars, interval)
+                summary['inserted'] += counts['inserted']
+                summary['skipped'] += counts['skipped']
+
+        return summary
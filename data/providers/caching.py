@@ -0,0 +1,153 @@
+"""Read-through caching provider that only downloads missing date ranges"""
+
+import re
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+import pandas as pd
+
+from database.models import DatabaseManager
+from .base import DataProvider
+
+
+def _naive(value) -> datetime:
+    """Convert to a naive datetime (wall-clock time, as stored in the database)"""
+    value = pd.Timestamp(value)
+    if value.tzinfo is not None:
+        value = value.tz_localize(None)
+    return value.to_pydatetime()
+
+
+# Bar width per interval unit (months are rounded up so a bar is never
+# taken as complete too early)
+_UNIT_WIDTHS = {
+    'm': pd.Timedelta(minutes=1),
+    'h': pd.Timedelta(hours=1),
+    'd': pd.Timedelta(days=1),
+    'wk': pd.Timedelta(weeks=1),
+    'mo': pd.Timedelta(days=31),
+}
+
+
+def interval_width(interval: str) -> pd.Timedelta:
+    """Length of one bar of an interval string such as 1m, 15m, 1h, 1d or 1wk"""
+    match = re.fullmatch(r'(\d+)(m|h|d|wk|mo)', interval)
+    if match is None:
+        raise ValueError(f"Unknown interval: {interval}")
+    return int(match.group(1)) * _UNIT_WIDTHS[match.group(2)]
+
+
+def missing_ranges(start: datetime, end: datetime, covered: List[Tuple[datetime, datetime]]) -> List[Tuple[datetime, datetime]]:
+    """
+    Work out which parts of [start, end) are not covered yet
+
+    Args:
+        start: Requested range start (inclusive)
+        end: Requested range end (exclusive)
+        covered: Already fetched [start, end) ranges, sorted by start
+
+    Returns:
+        List of (start, end) gaps in ascending order
+    """
+    gaps = []
+    cursor = start
+
+    for covered_start, covered_end in covered:
+        if covered_end <= cursor:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start))
+        cursor = max(cursor, covered_end)
+
+    if cursor < end:
+        gaps.append((cursor, end))
+
+    return gaps
+
+
+class CachingProvider(DataProvider):
+    """
+    Wraps another provider with local storage
+
+    Requests are served from the DatabaseManager; only the timestamp ranges
+    that were never downloaded before are fetched from the wrapped provider,
+    saved, and merged into the result. Downloaded ranges are remembered
+    separately from the bars, so weekends, holidays and other periods without
+    bars aren't requested again.
+
+    With a Resampler, newly downloaded minute bars also refresh the
+    materialized higher timeframes, and requests for those timeframes are
+    served from them (fetching only minute bars) instead of downloading the
+    same history again at another interval.
+
+    Ranges are only remembered up to the last completed bar. The bar still
+    forming (the current minute, today's daily bar) is overwritten on every
+    fetch until it completes, so its partial OHLCV never sticks.
+    """
+
+    def __init__(self, provider: DataProvider, db=None, resampler=None,
+                 timezone: str = 'America/New_York', clock: Optional[Callable[[], datetime]] = None):
+        """
+        Initialize caching provider
+
+        Args:
+            provider: Provider used for ranges missing locally (e.g. YahooProvider)
+            db: DatabaseManager for local storage (defaults to the local SQLite database)
+            resampler: Optional database.resample.Resampler on the same database
+            timezone: Zone of the provider's bar timestamps, which are stored
+                as naive wall-clock times (exchange time for Yahoo)
+            clock: Returns the current time (defaults to the system clock);
+                naive values are taken as UTC
+        """
+        self.provider = provider
+        self.db = db or DatabaseManager()
+        self.resampler = resampler
+        self.timezone = timezone
+        self.clock = clock or (lambda: pd.Timestamp.now(tz='UTC'))
+
+    def _now(self) -> pd.Timestamp:
+        """Current time as a naive wall-clock time in the bars' timezone"""
+        now = pd.Timestamp(self.clock())
+        if now.tzinfo is None:
+            now = now.tz_localize('UTC')
+        return now.tz_convert(self.timezone).tz_localize(None)
+
+    def get_bars(self, symbol: str, start: datetime, end: datetime, interval: str = '1m') -> pd.DataFrame:
+        """Return bars in [start, end), fetching only the gaps from the wrapped provider"""
+
+        start, end = _naive(start), _naive(end)
+
+        # Materialized timeframes come from minute bars
+        if self.resampler is not None and interval in self.resampler.intervals:
+            self.get_bars(symbol, start, end, self.resampler.source_interval)
+            df = self.db.get_bars_df(symbol, start, end, interval)
+            return df[df.index < end]
+
+        # Bars starting before this have completed (later ones are still forming or don't exist yet)
+        complete_before = (self._now() - interval_width(interval)).to_pydatetime()
+
+        # Find what isn't stored yet
+        covered = self.db.get_fetched_ranges(symbol, interval)
+        new_bars_from = None
+        for gap_start, gap_end in missing_ranges(start, end, covered):
+            bars = self.provider.get_bars(symbol, gap_start, gap_end, interval)
+            if len(bars):
+                # Bars already stored in a gap were saved while still forming: overwrite them
+                self.db.bulk_save_bars(symbol, bars, interval, on_conflict='update')
+                new_bars_from = new_bars_from or gap_start
+
+            # Only completed bars count as fetched; the rest is requested again next time
+            fetched_end = min(gap_end, complete_before)
+            if fetched_end > gap_start:
+                self.db.add_fetched_range(symbol, gap_start, fetched_end, interval)
+
+        # Refresh the aggregates from the earliest new minute bar on
+        if new_bars_from is not None and self.resampler is not None \
+                and interval == self.resampler.source_interval:
+            self.resampler.update(symbol, start=new_bars_from)
+
+        # Serve the whole request from local storage
+        df = self.db.get_bars_df(symbol, start, end, interval)
+        return df[df.index < end]
@@ -9,10 +9,20 @@ from .base import DataProvider
 class YahooProvider(DataProvider):
     """Fetches market data from Yahoo Finance"""
     
+    # Stay well under Yahoo's unofficial throttling when batch fetching
+    rate_limit = 2
+    
+    def __init__(self, verbose: bool = True):
+        """
+        Args:
+            verbose: Print a status line before and after each download
+        """
+        self.verbose = verbose
+    
     def get_bars(self, symbol: str, start: datetime, end: datetime, interval: str = '1m') -> pd.DataFrame:
         """Download historical bars from Yahoo Finance API"""
         
-        print(f"Fetching {symbol} from Yahoo Finance: {start} to {end}, interval={interval}")
+        self.log(f"Fetching {symbol} from Yahoo Finance: {start} to {end}, interval={interval}")
         
         # Create ticker object for the symbol
         ticker = yf.Ticker(symbol)
@@ -26,5 +36,5 @@ class YahooProvider(DataProvider):
         # Keep only OHLCV columns
         df = df[['open', 'high', 'low', 'close', 'volume']]
         
-        print(f"✓ Fetched {len(df)} bars")
+        self.log(f"✓ Fetched {len(df)} bars")
         return df
\ No newline at end of file
@@ -0,0 +1,261 @@
+"""Columnar (Arrow IPC / Parquet) market data store, an alternative to SQLite rows
+
+Bars are stored one file per append, partitioned by symbol, interval and month:
+
+    <root>/symbol=SPY/interval=1m/month=2024-01/part-00000.arrow
+
+Symbol and interval live in the directory names instead of on every row.
+Reads skip whole months outside the requested range, then slice each file on
+its (sorted) timestamp column. Arrow IPC files are memory-mapped, so reads
+are zero-copy until converted to pandas.
+
+Requires pyarrow (pip install pyarrow).
+"""
+
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class ColumnarBarStore:
+    """Append-only, month-partitioned columnar store for OHLCV bars"""
+
+    def __init__(self, root='bar_store', file_format='ipc'):
+        """
+        Initialize store
+
+        Args:
+            root: Directory holding the partitions (created if missing)
+            file_format: 'ipc' (Arrow IPC, memory-mapped reads) or 'parquet'
+        """
+        if pa is None:
+            raise ImportError("ColumnarBarStore requires pyarrow (pip install pyarrow)")
+        if file_format not in ('ipc', 'parquet'):
+            raise ValueError(f"Unknown file format: {file_format}")
+
+        self.root = root
+        self.file_format = file_format
+        self.extension = '.arrow' if file_format == 'ipc' else '.parquet'
+        self.schema = pa.schema([
+            ('timestamp', pa.timestamp('us')),
+            ('open', pa.float64()),
+            ('high', pa.float64()),
+            ('low', pa.float64()),
+            ('close', pa.float64()),
+            ('volume', pa.int64()),
+        ])
+        os.makedirs(root, exist_ok=True)
+
+    def _series_dir(self, symbol, interval):
+        """Directory holding all months of one symbol/interval"""
+        return os.path.join(self.root, f"symbol={symbol}", f"interval={interval}")
+
+    def _month_dirs(self, symbol, interval) -> List[str]:
+        """Month partition names (YYYY-MM) in ascending order"""
+        series_dir = self._series_dir(symbol, interval)
+        if not os.path.isdir(series_dir):
+            return []
+        return sorted(name[len('month='):] for name in os.listdir(series_dir) if name.startswith('month='))
+
+    def _part_files(self, symbol, interval, month) -> List[str]:
+        """Data files of one month partition in write order"""
+        month_dir = os.path.join(self._series_dir(symbol, interval), f"month={month}")
+        files = sorted(name for name in os.listdir(month_dir) if name.endswith(self.extension))
+        return [os.path.join(month_dir, name) for name in files]
+
+    def _read_file(self, path, columns=None, filters=None):
+        """Read one data file as an Arrow table (memory-mapped for IPC, row-group
+        filtered for Parquet)"""
+        if self.file_format == 'ipc':
+            with pa.memory_map(path, 'r') as source:
+                table = ipc.open_file(source).read_all()
+            return table.select(columns) if columns else table
+        return pq.read_table(path, columns=columns, filters=filters, memory_map=True)
+
+    def list_series(self) -> List[tuple]:
+        """List stored (symbol, interval) pairs"""
+        series = []
+        for symbol_dir in sorted(os.listdir(self.root)):
+            if not symbol_dir.startswith('symbol='):
+                continue
+            for interval_dir in sorted(os.listdir(os.path.join(self.root, symbol_dir))):
+                series.append((symbol_dir[len('symbol='):], interval_dir[len('interval='):]))
+        return series
+
+    def last_timestamp(self, symbol, interval='1m') -> Optional[pd.Timestamp]:
+        """Latest stored timestamp for a symbol/interval (None if empty)"""
+        months = self._month_dirs(symbol, interval)
+        if not months:
+            return None
+
+        latest = None
+        for path in self._part_files(symbol, interval, months[-1]):
+            timestamps = self._read_file(path, ['timestamp']).column('timestamp')
+            if len(timestamps):
+                value = timestamps[-1].as_py()
+                latest = value if latest is None else max(latest, value)
+        return pd.Timestamp(latest) if latest is not None else None
+
+    def append(self, symbol, bars_df: pd.DataFrame, interval='1m') -> int:
+        """
+        Append bars, writing one new file per month touched
+
+        Files are never rewritten. Bars at or before the latest stored
+        timestamp are skipped, and of bars repeated within bars_df only the
+        last is kept, so the store stays sorted and duplicate-free.
+
+        Args:
+            symbol: Stock ticker
+            bars_df: DataFrame with OHLCV columns indexed by timestamp
+            interval: Bar interval (1m, 5m, 1h, etc)
+
+        Returns:
+            Number of bars written
+        """
+
+        # Stable sort, then keep the last row given for a repeated timestamp
+        df = bars_df[BAR_COLUMNS].sort_index(kind='mergesort')
+        df = df[~df.index.duplicated(keep='last')]
+
+        # Store naive wall-clock timestamps, same as the SQLite table
+        index = df.index
+        if getattr(index, 'tz', None) is not None:
+            index = index.tz_localize(None)
+        timestamps = index.values.astype('datetime64[us]')
+
+        # Keep append-only ordering
+        latest = self.last_timestamp(symbol, interval)
+        if latest is not None:
+            keep = timestamps > np.datetime64(latest, 'us')
+            df, timestamps = df[keep], timestamps[keep]
+        if len(df) == 0:
+            return 0
+
+        # Split rows by calendar month
+        months = timestamps.astype('datetime64[M]')
+        boundaries = np.flatnonzero(months[1:] != months[:-1]) + 1
+        for start, stop in zip(np.r_[0, boundaries], np.r_[boundaries, len(df)]):
+            month = str(months[start])
+            table = pa.table({
+                'timestamp': pa.array(timestamps[start:stop], type=pa.timestamp('us')),
+                **{col: df[col].to_numpy()[start:stop] for col in ['open', 'high', 'low', 'close']},
+                'volume': df['volume'].to_numpy(dtype=np.int64)[start:stop],
+            }, schema=self.schema)
+            self._write_part(symbol, interval, month, table)
+
+        return len(df)
+
+    def _write_part(self, symbol, interval, month, table):
+        """Write a table as the next part file of a month partition"""
+
+        month_dir = os.path.join(self._series_dir(symbol, interval), f"month={month}")
+        os.makedirs(month_dir, exist_ok=True)
+
+        numbers = [int(m.group(1)) for m in (re.match(r'part-(\d+)', name) for name in os.listdir(month_dir)) if m]
+        path = os.path.join(month_dir, f"part-{max(numbers, default=-1) + 1:05d}{self.extension}")
+
+        # Write to a temp name first so readers never see half-written files
+        tmp_path = path + '.tmp'
+        if self.file_format == 'ipc':
+            with pa.OSFile(tmp_path, 'wb') as sink, ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        else:
+            pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+
+    def read_table(self, symbol, start=None, end=None, interval='1m', columns=None):
+        """
+        Read bars in [start, end] as an Arrow table (zero-copy slices of mapped files)
+
+        Args:
+            symbol: Stock ticker
+            start: Earliest timestamp to include (optional)
+            end: Latest timestamp to include (optional)
+            interval: Bar interval
+            columns: Bar columns to load (timestamp is always included)
+
+        Returns:
+            pyarrow.Table sorted by timestamp
+        """
+
+        columns = ['timestamp'] + [col for col in (columns or BAR_COLUMNS) if col != 'timestamp']
+        start = np.datetime64(pd.Timestamp(start).tz_localize(None), 'us') if start is not None else None
+        end = np.datetime64(pd.Timestamp(end).tz_localize(None), 'us') if end is not None else None
+
+        # Row-group filters for Parquet (IPC files are sliced below instead)
+        filters = []
+        if start is not None:
+            filters.append(('timestamp', '>=', pd.Timestamp(start)))
+        if end is not None:
+            filters.append(('timestamp', '<=', pd.Timestamp(end)))
+        filters = filters or None
+
+        # Partition pruning: skip months entirely outside the range
+        first_month = start.astype('datetime64[M]') if start is not None else None
+        last_month = end.astype('datetime64[M]') if end is not None else None
+
+        tables = []
+        for month in self._month_dirs(symbol, interval):
+            month_value = np.datetime64(month, 'M')
+            if (first_month is not None and month_value < first_month) or \
+                    (last_month is not None and month_value > last_month):
+                continue
+
+            for path in self._part_files(symbol, interval, month):
+                table = self._read_file(path, columns, filters)
+
+                # Files are sorted, so the range is a contiguous slice
+                timestamps = table.column('timestamp').to_numpy()
+                lo = np.searchsorted(timestamps, start, 'left') if start is not None else 0
+                hi = np.searchsorted(timestamps, end, 'right') if end is not None else len(timestamps)
+                if hi > lo:
+                    tables.append(table.slice(lo, hi - lo))
+
+        if not tables:
+            return self.schema.empty_table().select(columns)
+        return pa.concat_tables(tables)
+
+    def read(self, symbol, start=None, end=None, interval='1m', columns=None) -> pd.DataFrame:
+        """Read bars in [start, end] as a DataFrame indexed by timestamp"""
+
+        table = self.read_table(symbol, start, end, interval, columns)
+        df = table.to_pandas()
+        return df.set_index('timestamp')
+
+    def import_from_database(self, db, series: Optional[Iterable] = None, chunksize=500000) -> Dict:
+        """
+        Copy bars from a DatabaseManager (SQLite) into the store
+
+        Args:
+            db: DatabaseManager to read from
+            series: Iterable of (symbol, interval) pairs (default: everything stored)
+            chunksize: Rows streamed from the database at a time
+
+        Returns:
+            Dictionary mapping 'SYMBOL/interval' to bars written
+        """
+
+        if series is None:
+            series = db.list_series()
+
+        written = {}
+        for symbol, interval in series:
+            count = 0
+            for chunk in db.get_bars_df(symbol, interval=interval, chunksize=chunksize):
+                count += self.append(symbol, chunk, interval)
+            written[f"{symbol}/{interval}"] = count
+            print(f"✓ Migrated {count} {interval} bars for {symbol}")
+
+        return written
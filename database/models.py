@@ -1,9 +1,12 @@
 """Database models and manager for storing market data"""
 
-from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, Index
+from sqlalchemy import create_engine, func, select, type_coerce, Column, Integer, Float, String, DateTime, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+import numpy as np
+import pandas as pd
+import time
 
 Base = declarative_base()
 
@@ -26,15 +29,96 @@ class MarketBar(Base):
     volume = Column(Integer, nullable=False)  # Trading volume
     interval = Column(String(5), nullable=False)  # Bar interval (1m, 5m, 1h, etc)
     
-    # Index for fast queries by symbol and timestamp
+    # Index for fast queries by symbol and timestamp, plus a unique key
+    # so bulk inserts can skip duplicates with ON CONFLICT DO NOTHING
     __table_args__ = (
         Index('idx_symbol_timestamp', 'symbol', 'timestamp'),
+        Index('uq_symbol_interval_timestamp', 'symbol', 'interval', 'timestamp', unique=True),
     )
     
     def __repr__(self):
         return f"<Bar {self.symbol} {self.timestamp} close={self.close}>"
 
 
+def _bar_upsert_statement(dialect_name):
+    """INSERT ... ON CONFLICT DO UPDATE for market bars (None if the dialect has no upsert)"""
+    
+    if dialect_name != 'postgresql':
+        return None
+    from sqlalchemy.dialects.postgresql import insert
+    
+    statement = insert(MarketBar.__table__)
+    return statement.on_conflict_do_update(
+        index_elements=['symbol', 'interval', 'timestamp'],
+        set_={column: statement.excluded[column] for column in ['open', 'high', 'low', 'close', 'volume']}
+    )
+
+
+class FetchedRange(Base):
+    """Time range already downloaded from a provider for a symbol/interval"""
+    
+    __tablename__ = 'fetched_ranges'
+    
+    id = Column(Integer, primary_key=True)
+    symbol = Column(String(10), nullable=False)
+    interval = Column(String(5), nullable=False)
+    start = Column(DateTime, nullable=False)  # Inclusive
+    end = Column(DateTime, nullable=False)  # Exclusive
+    
+    __table_args__ = (
+        Index('idx_fetched_symbol_interval', 'symbol', 'interval'),
+    )
+    
+    def __repr__(self):
+        return f"<FetchedRange {self.symbol} {self.interval} {self.start} -> {self.end}>"
+
+
+class PaperFill(Base):
+    """Simulated fill from a paper-trading account"""
+    
+    __tablename__ = 'paper_fills'
+    
+    id = Column(Integer, primary_key=True)
+    account = Column(String(32), nullable=False)  # Paper account / run name
+    symbol = Column(String(10), nullable=False)
+    timestamp = Column(DateTime, nullable=False)  # Bar that triggered the fill
+    side = Column(String(4), nullable=False)  # buy or sell
+    price = Column(Float, nullable=False)  # Fill price after slippage
+    shares = Column(Float, nullable=False)
+    commission = Column(Float, nullable=False)
+    reason = Column(String(16), nullable=False)  # signal, stop_loss, take_profit, trailing_stop
+    pnl = Column(Float)  # Round-trip P&L (sells only)
+    
+    __table_args__ = (
+        Index('idx_paper_fills_account', 'account', 'timestamp'),
+    )
+    
+    def __repr__(self):
+        return f"<PaperFill {self.account} {self.symbol} {self.side} {self.shares:.4f} @ {self.price:.2f}>"
+
+
+class PaperPosition(Base):
+    """Latest state of one symbol in a paper-trading account"""
+    
+    __tablename__ = 'paper_positions'
+    
+    id = Column(Integer, primary_key=True)
+    account = Column(String(32), nullable=False)
+    symbol = Column(String(10), nullable=False)
+    shares = Column(Float, nullable=False)  # 0 when flat
+    entry_price = Column(Float)  # Fill price of the open position
+    entry_time = Column(DateTime)
+    cash = Column(Float, nullable=False)  # Cash allocated to this symbol
+    updated = Column(DateTime, nullable=False)  # Last bar seen
+    
+    __table_args__ = (
+        Index('uq_paper_position', 'account', 'symbol', unique=True),
+    )
+    
+    def __repr__(self):
+        return f"<PaperPosition {self.account} {self.symbol} shares={self.shares:.4f}>"
+
+
 class DatabaseManager:
     """Manages database operations (save, retrieve, query)"""
     
@@ -47,6 +131,10 @@ class DatabaseManager:
         # Create tables if they don't exist
         Base.metadata.create_all(self.engine)
         
+        # Add indexes missing from databases created by older versions
+        for index in MarketBar.__table__.indexes:
+            index.create(self.engine, checkfirst=True)
+        
         # Create session factory
         self.Session = sessionmaker(bind=self.engine)
     
@@ -93,6 +181,244 @@ class DatabaseManager:
         print(f"✓ Saved {bars_added} new bars to database")
         return bars_added
     
+    def bulk_save_bars(self, symbol, bars_df, interval='1m', batch_size=50000, on_conflict='ignore'):
+        """
+        Save a whole DataFrame of bars in batched INSERT ... ON CONFLICT DO NOTHING
+        statements, relying on the unique (symbol, interval, timestamp) index
+        to skip duplicates instead of querying for each row
+        
+        Args:
+            symbol: Stock ticker
+            bars_df: DataFrame with OHLCV columns indexed by timestamp
+            interval: Bar interval (1m, 5m, 1h, etc)
+            batch_size: Rows per INSERT batch
+            on_conflict: 'ignore' keeps the stored bar, 'update' overwrites its
+                OHLCV values (for bars that are still forming, e.g. resampled
+                aggregates whose last bucket was only partly filled)
+        
+        Returns:
+            Dictionary with counts of 'inserted' and 'skipped' rows
+            ('inserted' also counts overwritten rows with on_conflict='update')
+        """
+        
+        if on_conflict not in ('ignore', 'update'):
+            raise ValueError(f"Unknown on_conflict mode: {on_conflict}")
+        
+        # Other databases take the row-by-row path (or a dialect upsert for updates)
+        if self.engine.dialect.name != 'sqlite':
+            if on_conflict == 'update':
+                return self._upsert_bars(symbol, bars_df, interval, batch_size)
+            inserted = self.save_bars(symbol, bars_df, interval)
+            return {'inserted': inserted, 'skipped': len(bars_df) - inserted}
+        
+        start_time = time.perf_counter()
+        
+        # Format timestamps exactly as SQLAlchemy stores DateTime in SQLite,
+        # so bulk rows collide with rows written through the ORM
+        index = bars_df.index
+        if getattr(index, 'tz', None) is not None:
+            index = index.tz_localize(None)
+        timestamps = np.char.replace(
+            np.datetime_as_string(index.values.astype('datetime64[us]'), unit='us'), 'T', ' '
+        ).tolist()
+        
+        # Build row tuples column-wise (much faster than iterrows)
+        columns = [
+            [symbol] * len(bars_df),
+            [interval] * len(bars_df),
+            timestamps,
+            bars_df['open'].astype(float).tolist(),
+            bars_df['high'].astype(float).tolist(),
+            bars_df['low'].astype(float).tolist(),
+            bars_df['close'].astype(float).tolist(),
+            bars_df['volume'].astype('int64').tolist(),
+        ]
+        rows = list(zip(*columns))
+        
+        sql = (
+            f"INSERT INTO {MarketBar.__tablename__} "
+            "(symbol, interval, timestamp, open, high, low, close, volume) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+        )
+        if on_conflict == 'update':
+            sql += (
+                "ON CONFLICT (symbol, interval, timestamp) DO UPDATE SET "
+                "open = excluded.open, high = excluded.high, low = excluded.low, "
+                "close = excluded.close, volume = excluded.volume"
+            )
+        else:
+            sql += "ON CONFLICT DO NOTHING"
+        
+        # Insert in batches, one transaction per batch
+        inserted = 0
+        for batch_start in range(0, len(rows), batch_size):
+            with self.engine.begin() as conn:
+                result = conn.exec_driver_sql(sql, rows[batch_start:batch_start + batch_size])
+                inserted += result.rowcount
+        
+        skipped = len(rows) - inserted
+        elapsed = time.perf_counter() - start_time
+        rate = len(rows) / elapsed if elapsed > 0 else 0
+        if on_conflict == 'update':
+            print(f"✓ Saved {inserted} {interval} bars to database (new or updated, {rate:,.0f} rows/s)")
+        else:
+            print(f"✓ Saved {inserted} new bars to database ({skipped} duplicates skipped, {rate:,.0f} rows/s)")
+        
+        return {'inserted': inserted, 'skipped': skipped}
+    
+    def _upsert_bars(self, symbol, bars_df, interval, batch_size):
+        """
+        Insert-or-overwrite bars on databases other than SQLite
+        
+        PostgreSQL uses INSERT ... ON CONFLICT DO UPDATE; other databases
+        delete the batch's existing bars and insert them again in one
+        transaction per batch.
+        
+        Returns:
+            Same dictionary as bulk_save_bars (every row counts as inserted)
+        """
+        
+        table = MarketBar.__table__
+        index = bars_df.index
+        if getattr(index, 'tz', None) is not None:
+            index = index.tz_localize(None)
+        rows = [
+            {'symbol': symbol, 'interval': interval, 'timestamp': timestamp,
+             'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}
+            for timestamp, open_, high, low, close, volume in zip(
+                index.to_pydatetime(),
+                bars_df['open'].astype(float).tolist(),
+                bars_df['high'].astype(float).tolist(),
+                bars_df['low'].astype(float).tolist(),
+                bars_df['close'].astype(float).tolist(),
+                bars_df['volume'].astype('int64').tolist(),
+            )
+        ]
+        
+        statement = _bar_upsert_statement(self.engine.dialect.name)
+        if statement is None:
+            # Keep the IN (...) list of the delete within parameter limits
+            batch_size = min(batch_size, 1000)
+        
+        for batch_start in range(0, len(rows), batch_size):
+            batch = rows[batch_start:batch_start + batch_size]
+            with self.engine.begin() as conn:
+                if statement is not None:
+                    conn.execute(statement, batch)
+                else:
+                    conn.execute(table.delete().where(
+                        table.c.symbol == symbol,
+                        table.c.interval == interval,
+                        table.c.timestamp.in_([row['timestamp'] for row in batch])
+                    ))
+                    conn.execute(table.insert(), batch)
+        
+        print(f"✓ Saved {len(rows)} {interval} bars to database (new or updated)")
+        return {'inserted': len(rows), 'skipped': 0}
+    
+    def last_timestamp(self, symbol, interval='1m'):
+        """Timestamp of the latest stored bar for a symbol/interval (None if there are none)"""
+        
+        table = MarketBar.__table__
+        query = select(func.max(table.c.timestamp)).where(table.c.symbol == symbol, table.c.interval == interval)
+        
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar()
+    
+    def list_series(self):
+        """List distinct (symbol, interval) pairs stored in the database"""
+        
+        table = MarketBar.__table__
+        query = select(table.c.symbol, table.c.interval).distinct().order_by(table.c.symbol, table.c.interval)
+        
+        with self.engine.connect() as conn:
+            return [tuple(row) for row in conn.execute(query)]
+    
+    def get_fetched_ranges(self, symbol, interval='1m'):
+        """Return downloaded [start, end) ranges for a symbol/interval, sorted by start"""
+        
+        session = self.get_session()
+        ranges = session.query(FetchedRange).filter_by(
+            symbol=symbol, interval=interval
+        ).order_by(FetchedRange.start).all()
+        session.close()
+        
+        return [(r.start, r.end) for r in ranges]
+    
+    def add_fetched_range(self, symbol, start, end, interval='1m'):
+        """Record a downloaded [start, end) range, merging overlapping or touching ranges"""
+        
+        session = self.get_session()
+        existing = session.query(FetchedRange).filter_by(symbol=symbol, interval=interval).all()
+        
+        # Merge the new range with every range it overlaps or touches
+        for r in existing:
+            if r.start <= end and start <= r.end:
+                start = min(start, r.start)
+                end = max(end, r.end)
+                session.delete(r)
+        
+        session.add(FetchedRange(symbol=symbol, interval=interval, start=start, end=end))
+        session.commit()
+        session.close()
+    
+    def save_paper_fills(self, fills):
+        """
+        Append paper-trading fills
+        
+        Args:
+            fills: List of dicts with PaperFill columns (account, symbol,
+                timestamp, side, price, shares, commission, reason, pnl)
+        
+        Returns:
+            Number of fills written
+        """
+        
+        if not fills:
+            return 0
+        
+        with self.engine.begin() as conn:
+            conn.execute(PaperFill.__table__.insert(), fills)
+        return len(fills)
+    
+    def save_paper_positions(self, positions):
+        """
+        Replace the stored state of the given account/symbol positions
+        
+        Args:
+            positions: List of dicts with PaperPosition columns
+        
+        Returns:
+            Number of positions written
+        """
+        
+        if not positions:
+            return 0
+        
+        table = PaperPosition.__table__
+        with self.engine.begin() as conn:
+            for account in {position['account'] for position in positions}:
+                symbols = [position['symbol'] for position in positions if position['account'] == account]
+                conn.execute(table.delete().where(table.c.account == account, table.c.symbol.in_(symbols)))
+            conn.execute(table.insert(), positions)
+        return len(positions)
+    
+    def get_paper_fills(self, account):
+        """All fills of a paper account as a DataFrame, oldest first"""
+        
+        table = PaperFill.__table__
+        query = select(table).where(table.c.account == account).order_by(table.c.timestamp, table.c.id)
+        with self.engine.connect() as conn:
+            return pd.read_sql(query, conn).drop(columns='id')
+    
+    def get_paper_positions(self, account):
+        """Stored positions of a paper account as a DataFrame indexed by symbol"""
+        
+        table = PaperPosition.__table__
+        query = select(table).where(table.c.account == account).order_by(table.c.symbol)
+        with self.engine.connect() as conn:
+            return pd.read_sql(query, conn).drop(columns='id').set_index('symbol')
+    
     def get_bars(self, symbol, start=None, end=None, interval='1m'):
         """Retrieve bars from database for given symbol and time range"""
         
@@ -114,4 +440,77 @@ class DatabaseManager:
         bars = query.all()
         session.close()
         
-        return bars
\ No newline at end of file
+        return bars
+    
+    def get_bars_df(self, symbol, start=None, end=None, interval='1m',
+                    columns=('open', 'high', 'low', 'close', 'volume'), chunksize=None, limit=None):
+        """
+        Retrieve bars straight into a DataFrame without building ORM objects
+        
+        Runs a Core SELECT of only the requested columns and converts the raw
+        rows into NumPy-backed columns in one step.
+        
+        Args:
+            symbol: Stock ticker
+            start: Earliest timestamp to include (optional)
+            end: Latest timestamp to include (optional)
+            interval: Bar interval (1m, 5m, 1h, etc)
+            columns: Bar columns to load
+            chunksize: If set, return an iterator of DataFrames with at most
+                this many rows each instead of one DataFrame
+            limit: Return at most this many (earliest) bars
+        
+        Returns:
+            DataFrame indexed by timestamp (or iterator of DataFrames)
+        """
+        
+        table = MarketBar.__table__
+        columns = list(columns)
+        
+        # SQLite stores DateTime as text; read it raw and parse the whole
+        # column at once instead of converting row by row
+        timestamp_col = table.c.timestamp
+        if self.engine.dialect.name == 'sqlite':
+            timestamp_col = type_coerce(timestamp_col, String)
+        
+        # Build query for symbol and interval
+        query = select(timestamp_col.label('timestamp'), *[table.c[col] for col in columns])
+        query = query.where(table.c.symbol == symbol, table.c.interval == interval)
+        
+        # Add time filters if provided
+        if start:
+            query = query.where(table.c.timestamp >= start)
+        if end:
+            query = query.where(table.c.timestamp <= end)
+        
+        query = query.order_by(table.c.timestamp)
+        if limit:
+            query = query.limit(limit)
+        
+        if chunksize:
+            return self._iter_bars_df(query, columns, chunksize)
+        
+        with self.engine.connect() as conn:
+            rows = conn.execute(query).fetchall()
+        
+        return self._rows_to_dataframe(rows, columns)
+    
+    def _iter_bars_df(self, query, columns, chunksize):
+        """Stream query results as DataFrames of at most chunksize rows"""
+        
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=chunksize).execute(query)
+            for rows in result.partitions(chunksize):
+                yield self._rows_to_dataframe(rows, columns)
+    
+    @staticmethod
+    def _rows_to_dataframe(rows, columns):
+        """Convert raw (timestamp, *columns) rows to a DataFrame indexed by timestamp"""
+        
+        df = pd.DataFrame.from_records(rows, columns=['timestamp'] + columns)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
+        
+        if 'volume' in df.columns:
+            df['volume'] = df['volume'].astype('int64')
+        
+        return df.set_index('timestamp')
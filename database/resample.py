@@ -0,0 +1,269 @@
+"""Materialized higher-timeframe bars (5m, 15m, 1h, 1d) built from stored 1m bars
+
+Minute bars are streamed from the database in chunks and folded into
+fixed-width buckets; only the bucket still open at the end of a chunk is
+carried over, so memory stays bounded by the chunk size. Aggregates are
+written back as ordinary bars under their own interval, which means
+get_bars_df(symbol, interval='1h') and every backtest on top of it work
+without a separate download.
+
+Updates are incremental: each interval restarts from its last stored bucket
+(which may have been only partly filled when it was written) and upserts
+everything from there on.
+"""
+
+import time
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from .models import DatabaseManager
+
+BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Interval name -> bucket width
+INTERVAL_WIDTHS = {
+    '5m': pd.Timedelta(minutes=5),
+    '15m': pd.Timedelta(minutes=15),
+    '30m': pd.Timedelta(minutes=30),
+    '1h': pd.Timedelta(hours=1),
+    '1d': pd.Timedelta(days=1),
+}
+
+DEFAULT_INTERVALS = ('5m', '15m', '1h', '1d')
+
+
+def _width(interval: str) -> pd.Timedelta:
+    """Bucket width of an interval name"""
+    if interval not in INTERVAL_WIDTHS:
+        raise ValueError(f"Unknown interval: {interval} (expected one of {list(INTERVAL_WIDTHS)})")
+    return INTERVAL_WIDTHS[interval]
+
+
+def bucket_start(timestamp, interval: str, offset=None) -> pd.Timestamp:
+    """
+    Start of the bucket a timestamp falls into
+
+    Buckets are aligned to midnight (plus offset), so 1h buckets start on the
+    hour and 1d buckets at 00:00 wall-clock time.
+
+    Args:
+        timestamp: Any timestamp
+        interval: Target interval ('5m', '15m', '30m', '1h', '1d')
+        offset: Shift of the bucket grid (e.g. '30min' for hourly bars
+            starting at 9:30 like the exchange session)
+    """
+    offset = pd.Timedelta(offset or 0)
+    return (pd.Timestamp(timestamp) - offset).floor(_width(interval)) + offset
+
+
+class BarAggregator:
+    """
+    Streaming OHLCV aggregation for one target interval
+
+    Feed it consecutive, time-ordered chunks of bars with push(); it returns
+    the buckets that are complete and keeps the last (still open) one as a
+    running partial bar until the next chunk or flush().
+    """
+
+    def __init__(self, interval: str, offset=None):
+        """
+        Initialize aggregator
+
+        Args:
+            interval: Target interval ('5m', '15m', '30m', '1h', '1d')
+            offset: Shift of the bucket grid (see bucket_start)
+        """
+        self.interval = interval
+        self.width = _width(interval).value
+        self.offset = pd.Timedelta(offset or 0).value
+        self.partial = None  # (bucket, open, high, low, close, volume) of the open bucket
+        self.unit = 'ns'  # Output index resolution, follows the input
+
+    def push(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add a chunk of bars
+
+        Args:
+            chunk: DataFrame with OHLCV columns indexed by timestamp, later
+                than everything pushed before
+
+        Returns:
+            DataFrame of finished buckets (may be empty)
+        """
+        if len(chunk) == 0:
+            return self._to_frame(*self._empty())
+        self.unit = getattr(chunk.index, 'unit', 'ns')
+
+        timestamps = chunk.index.values.astype('datetime64[ns]').astype(np.int64)
+        buckets = (timestamps - self.offset) // self.width * self.width + self.offset
+
+        # One group per run of equal buckets (input is sorted by time)
+        starts = np.flatnonzero(np.diff(buckets)) + 1
+        starts = np.concatenate(([0], starts))
+        ends = np.concatenate((starts[1:], [len(buckets)]))
+
+        bucket = buckets[starts]
+        open_ = chunk['open'].to_numpy(dtype=float)[starts]
+        high = np.maximum.reduceat(chunk['high'].to_numpy(dtype=float), starts)
+        low = np.minimum.reduceat(chunk['low'].to_numpy(dtype=float), starts)
+        close = chunk['close'].to_numpy(dtype=float)[ends - 1]
+        volume = np.add.reduceat(chunk['volume'].to_numpy(dtype=np.int64), starts)
+
+        # Fold the bucket carried over from the previous chunk in front
+        if self.partial is not None:
+            p_bucket, p_open, p_high, p_low, p_close, p_volume = self.partial
+            if p_bucket == bucket[0]:
+                open_[0] = p_open
+                high[0] = max(high[0], p_high)
+                low[0] = min(low[0], p_low)
+                volume[0] += p_volume
+            else:
+                bucket = np.concatenate(([p_bucket], bucket))
+                open_ = np.concatenate(([p_open], open_))
+                high = np.concatenate(([p_high], high))
+                low = np.concatenate(([p_low], low))
+                close = np.concatenate(([p_close], close))
+                volume = np.concatenate(([p_volume], volume))
+
+        # The last bucket may continue in the next chunk
+        self.partial = (bucket[-1], open_[-1], high[-1], low[-1], close[-1], volume[-1])
+        return self._to_frame(bucket[:-1], open_[:-1], high[:-1], low[:-1], close[:-1], volume[:-1])
+
+    def flush(self) -> pd.DataFrame:
+        """Return the open bucket as a (possibly partial) bar and reset"""
+        if self.partial is None:
+            return self._to_frame(*self._empty())
+        columns = [np.array([value]) for value in self.partial]
+        self.partial = None
+        return self._to_frame(*columns)
+
+    @staticmethod
+    def _empty():
+        return (np.empty(0, dtype=np.int64),) + (np.empty(0),) * 4 + (np.empty(0, dtype=np.int64),)
+
+    def _to_frame(self, bucket, open_, high, low, close, volume) -> pd.DataFrame:
+        index = pd.DatetimeIndex(np.asarray(bucket, dtype=np.int64).view('datetime64[ns]'), name='timestamp')
+        index = index.as_unit(self.unit)
+        return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close,
+                             'volume': np.asarray(volume, dtype=np.int64)}, index=index)
+
+
+def resample_bars(df: pd.DataFrame, interval: str, offset=None) -> pd.DataFrame:
+    """
+    Aggregate a DataFrame of bars in memory
+
+    Open is the first open, high the max, low the min, close the last close
+    and volume the sum of each bucket. Buckets are labeled by their start and
+    buckets without any bars are left out.
+
+    Args:
+        df: DataFrame with OHLCV columns indexed by timestamp (sorted)
+        interval: Target interval ('5m', '15m', '30m', '1h', '1d')
+        offset: Shift of the bucket grid (see bucket_start)
+
+    Returns:
+        DataFrame with OHLCV columns indexed by bucket start
+    """
+    aggregator = BarAggregator(interval, offset)
+    return pd.concat([aggregator.push(df), aggregator.flush()])
+
+
+class Resampler:
+    """
+    Keeps materialized higher-timeframe bars in sync with stored minute bars
+
+    Usage:
+        resampler = Resampler(db)
+        resampler.update('SPY')        # after new 1m bars were saved
+        db.get_bars_df('SPY', interval='1h')
+    """
+
+    def __init__(self, db=None, intervals: Iterable[str] = DEFAULT_INTERVALS, source_interval: str = '1m',
+                 chunksize: int = 100_000, offset=None):
+        """
+        Initialize resampler
+
+        Args:
+            db: DatabaseManager holding the bars (defaults to the local SQLite database)
+            intervals: Target intervals to materialize
+            source_interval: Interval the aggregates are built from
+            chunksize: Source bars read per chunk (also the write batch size)
+            offset: Shift of the bucket grid (see bucket_start)
+        """
+        self.db = db or DatabaseManager()
+        self.intervals = list(intervals)
+        for interval in self.intervals:
+            _width(interval)
+        self.source_interval = source_interval
+        self.chunksize = chunksize
+        self.offset = offset
+
+    def update(self, symbol: str, start=None) -> Dict[str, int]:
+        """
+        Bring the aggregates of a symbol up to date
+
+        Each interval restarts at its last stored bucket, since that bucket
+        may have been written before all of its minute bars had arrived.
+        Pass start when older minute bars were added (e.g. a backfill) so
+        buckets from there on are rebuilt too.
+
+        Args:
+            symbol: Stock ticker
+            start: Rebuild at least from the bucket containing this timestamp
+
+        Returns:
+            Mapping of interval to number of bars written (new or updated)
+        """
+        start_time = time.perf_counter()
+
+        # Where each interval has to restart (None = from the first minute bar)
+        restart = {}
+        for interval in self.intervals:
+            last = self.db.last_timestamp(symbol, interval)
+            begin = pd.Timestamp(last) if last is not None else None
+            if begin is not None and start is not None:
+                begin = min(begin, bucket_start(start, interval, self.offset))
+            restart[interval] = begin
+
+        read_from = None if any(begin is None for begin in restart.values()) else min(restart.values())
+
+        aggregators = {interval: BarAggregator(interval, self.offset) for interval in self.intervals}
+        pending = {interval: [] for interval in self.intervals}
+        written = {interval: 0 for interval in self.intervals}
+
+        def write(interval, force=False):
+            frames = pending[interval]
+            if frames and (force or sum(len(frame) for frame in frames) >= self.chunksize):
+                bars = pd.concat(frames)
+                if len(bars):
+                    written[interval] += self.db.bulk_save_bars(
+                        symbol, bars, interval, batch_size=self.chunksize, on_conflict='update')['inserted']
+                pending[interval] = []
+
+        chunks = self.db.get_bars_df(symbol, start=read_from and read_from.to_pydatetime(),
+                                     interval=self.source_interval, columns=BAR_COLUMNS, chunksize=self.chunksize)
+        source_bars = 0
+        for chunk in chunks:
+            source_bars += len(chunk)
+            for interval, aggregator in aggregators.items():
+                begin = restart[interval]
+                part = chunk if begin is None or read_from == begin else chunk[chunk.index >= begin]
+                pending[interval].append(aggregator.push(part))
+                write(interval)
+
+        for interval, aggregator in aggregators.items():
+            pending[interval].append(aggregator.flush())
+            write(interval, force=True)
+
+        elapsed = time.perf_counter() - start_time
+        summary = ', '.join(f"{count} {interval}" for interval, count in written.items())
+        print(f"✓ Resampled {source_bars} {self.source_interval} bars of {symbol} into {summary} bars in {elapsed:.2f}s")
+
+        return written
+
+    def update_all(self) -> Dict[str, Dict[str, int]]:
+        """Update every symbol that has source-interval bars stored"""
+        symbols = [symbol for symbol, interval in self.db.list_series() if interval == self.source_interval]
+        return {symbol: self.update(symbol) for symbol in symbols}
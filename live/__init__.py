@@ -0,0 +1,9 @@
+"""Event-driven paper trading on arriving bars"""
+
+from .feed import Bar, BarFeed
+from .latency import LatencyHistogram
+from .replay import ReplayFeed
+from .broker import PaperBroker
+from .runtime import PaperTrader
+
+__all__ = ['Bar', 'BarFeed', 'LatencyHistogram', 'ReplayFeed', 'PaperBroker', 'PaperTrader']
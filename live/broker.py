@@ -0,0 +1,199 @@
+"""Simulated order execution with the Backtester cost model"""
+
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from backtesting.engine import Backtester
+
+
+class _Account:
+    """Cash and position of one symbol"""
+
+    __slots__ = ('cash', 'shares', 'entry_price', 'entry_time', 'peak', 'close', 'updated', 'reentry_blocked')
+
+    def __init__(self, cash):
+        self.cash = cash
+        self.shares = 0.0
+        self.entry_price = None
+        self.entry_time = None
+        self.peak = 0.0
+        self.close = None
+        self.updated = None
+        self.reentry_blocked = False  # Set by a protective exit until the signal leaves 1
+
+
+class PaperBroker:
+    """
+    Fills signals the way Backtester does, one bar at a time
+
+    Every symbol trades its own sub-account of backtester.initial_capital,
+    all-in on a BUY signal and all-out on SELL/HOLD, at the bar's close with
+    the backtester's slippage and commission. Stop-loss, take-profit and
+    trailing stops are checked against each later bar's low/high with the
+    same rules as the compiled kernel (including waiting for a fresh BUY
+    after a protective exit), so a paper run over stored bars produces the
+    trades run_backtest would.
+
+    Fills and changed positions are queued until drain() so persistence can
+    happen off the hot path.
+    """
+
+    def __init__(self, backtester: Optional[Backtester] = None, account: str = 'paper'):
+        """
+        Initialize broker
+
+        Args:
+            backtester: Backtester whose capital, costs and stops are used
+            account: Account name stored with every fill and position
+        """
+        self.backtester = backtester or Backtester()
+        self.account = account
+        self.accounts: Dict[str, _Account] = {}
+        self.trades: List[Dict] = []  # Completed round trips, same keys as run_backtest trades
+        self._fills: List[Dict] = []  # Fills not yet persisted
+        self._dirty = set()  # Symbols whose position changed since the last drain
+
+    def on_bar(self, bar, signal) -> Optional[str]:
+        """
+        Process one bar and the strategy's signal for it
+
+        Args:
+            bar: Bar with symbol, timestamp and OHLC prices
+            signal: 1 (BUY), -1 (SELL), 0 (HOLD) or NaN (no decision)
+
+        Returns:
+            'buy' or 'sell' if an order was filled on this bar, else None
+        """
+        bt = self.backtester
+        account = self.accounts.get(bar.symbol)
+        if account is None:
+            account = self.accounts[bar.symbol] = _Account(bt.initial_capital)
+        account.close = bar.close
+        account.updated = bar.timestamp
+        action = None
+
+        # Intrabar exits for a position opened on an earlier bar
+        if account.shares > 0 and account.entry_time < bar.timestamp and bt.uses_stops:
+            stop_price, reason = -1.0, 'stop_loss'
+            if bt.stop_loss:
+                stop_price = account.entry_price * (1 - bt.stop_loss)
+            if bt.trailing_stop:
+                trail_price = account.peak * (1 - bt.trailing_stop)
+                if trail_price > stop_price:
+                    stop_price, reason = trail_price, 'trailing_stop'
+
+            raw_exit = None
+            if stop_price > 0 and bar.low <= stop_price:
+                raw_exit = min(bar.open, stop_price)
+            elif bt.take_profit and bar.high >= account.entry_price * (1 + bt.take_profit):
+                raw_exit = max(bar.open, account.entry_price * (1 + bt.take_profit))
+                reason = 'take_profit'
+
+            if raw_exit is not None:
+                self._sell(bar, account, raw_exit, reason)
+                account.reentry_blocked = True
+                action = 'sell'
+            elif bar.high > account.peak:
+                account.peak = bar.high
+
+        # Signal-driven entries and exits at the close
+        if signal != 1:
+            account.reentry_blocked = False
+        if signal == signal:
+            if signal == 1 and account.shares == 0 and not account.reentry_blocked:
+                self._buy(bar, account)
+                action = 'buy'
+            elif (signal == -1 or signal == 0) and account.shares > 0:
+                self._sell(bar, account, bar.close, 'signal')
+                action = 'sell'
+
+        return action
+
+    def _buy(self, bar, account):
+        bt = self.backtester
+        price = bar.close * (1 + bt.slippage)
+        commission = account.cash * bt.commission
+        shares = (account.cash - commission) / price
+
+        account.shares = shares
+        account.cash = 0.0
+        account.entry_price = price
+        account.entry_time = bar.timestamp
+        account.peak = bar.close
+        self._record(bar, 'buy', price, shares, commission, 'signal', None)
+
+    def _sell(self, bar, account, raw_price, reason):
+        bt = self.backtester
+        price = raw_price * (1 - bt.slippage)
+        shares = account.shares
+        proceeds = shares * price
+        commission = proceeds * bt.commission
+        pnl = (price - account.entry_price) * shares - commission * 2
+
+        self.trades.append({
+            'symbol': bar.symbol,
+            'entry_time': account.entry_time,
+            'exit_time': bar.timestamp,
+            'entry_price': account.entry_price,
+            'exit_price': price,
+            'shares': shares,
+            'return_pct': (price - account.entry_price) / account.entry_price * 100,
+            'pnl': pnl,
+            'exit_reason': reason,
+        })
+
+        account.cash = proceeds - commission
+        account.shares = 0.0
+        account.entry_price = None
+        account.entry_time = None
+        self._record(bar, 'sell', price, shares, commission, reason, pnl)
+
+    def _record(self, bar, side, price, shares, commission, reason, pnl):
+        self._fills.append({
+            'account': self.account, 'symbol': bar.symbol, 'timestamp': _to_datetime(bar.timestamp),
+            'side': side, 'price': price, 'shares': shares, 'commission': commission,
+            'reason': reason, 'pnl': pnl,
+        })
+        self._dirty.add(bar.symbol)
+
+    def portfolio_value(self, symbol: Optional[str] = None) -> float:
+        """Marked-to-market value of one symbol's account, or of all of them"""
+        accounts = [self.accounts[symbol]] if symbol else self.accounts.values()
+        return sum(account.cash + account.shares * account.close for account in accounts)
+
+    def positions(self, symbols=None) -> List[Dict]:
+        """Position rows (PaperPosition columns) for the given symbols (default all)"""
+        symbols = self.accounts if symbols is None else symbols
+        return [{
+            'account': self.account,
+            'symbol': symbol,
+            'shares': self.accounts[symbol].shares,
+            'entry_price': self.accounts[symbol].entry_price,
+            'entry_time': _to_datetime(self.accounts[symbol].entry_time),
+            'cash': self.accounts[symbol].cash,
+            'updated': _to_datetime(self.accounts[symbol].updated),
+        } for symbol in symbols]
+
+    def drain(self):
+        """
+        Hand over everything that changed since the last call
+
+        Returns:
+            (fills, positions) lists ready for DatabaseManager.save_paper_fills
+            and save_paper_positions
+        """
+        fills, self._fills = self._fills, []
+        positions = self.positions(sorted(self._dirty))
+        self._dirty = set()
+        return fills, positions
+
+
+def _to_datetime(timestamp):
+    """Naive datetime for storage (None stays None)"""
+    if timestamp is None:
+        return None
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_localize(None)
+    return timestamp.to_pydatetime()
@@ -0,0 +1,39 @@
+"""Bar feeds for the paper-trading runtime"""
+
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+
+
+class Bar:
+    """One OHLCV bar event (attribute or bar['close'] access)"""
+
+    __slots__ = ('symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, symbol, timestamp, open, high, low, close, volume):
+        self.symbol = symbol
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __repr__(self):
+        return f"<Bar {self.symbol} {self.timestamp} close={self.close}>"
+
+
+class BarFeed(ABC):
+    """
+    Source of bar events for the runtime
+
+    A live provider implements the same interface: an async iterator that
+    yields Bar objects in time order as they arrive.
+    """
+
+    @abstractmethod
+    def __aiter__(self) -> AsyncIterator[Bar]:
+        """Yield bars as they become available"""
+        pass
@@ -0,0 +1,242 @@
+"""Historical replay of stored bars for many symbols, with timing and latency measurement
+
+Each symbol's bars are read from the database in pages (so memory stays
+bounded by symbols x page size) and merged into one time-ordered stream
+with a heap-based k-way merge. The stream is emitted as fast as the
+consumer takes it, or paced to wall-clock time at a chosen speed. Every
+event's processing time in the attached consumer is recorded in latency
+histograms, overall and per symbol, along with how late paced events were
+emitted relative to their schedule.
+"""
+
+import asyncio
+import heapq
+import time
+from itertools import repeat
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, Optional
+
+import pandas as pd
+
+from database.models import DatabaseManager
+from .feed import Bar, BarFeed
+from .latency import LatencyHistogram
+
+BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Final stretch of a paced wait spent spinning instead of sleeping (sleep overshoots)
+SPIN_SECONDS = 0.0005
+
+
+class _Cursor:
+    """Position in one symbol's paged bars"""
+
+    __slots__ = ('symbol', 'pages', 'keys', 'bars', 'pos')
+
+    def __init__(self, symbol, pages):
+        self.symbol = symbol
+        self.pages = pages
+        self.keys = []
+        self.bars = []
+        self.pos = 0
+
+    def load(self) -> bool:
+        """Move to the next non-empty page (False when the symbol is exhausted)"""
+        for page in self.pages:
+            if len(page):
+                # Merge keys as integers, Bar events built for the whole page at once
+                self.keys = page.index.as_unit('ns').asi8.tolist()
+                prices = [page[col].to_numpy(dtype=float).tolist() for col in BAR_COLUMNS[:4]]
+                volume = page['volume'].to_numpy(dtype='int64').tolist()
+                self.bars = list(map(Bar, repeat(self.symbol), page.index.tolist(), *prices, volume))
+                self.pos = 0
+                return True
+        return False
+
+
+class ReplayFeed(BarFeed):
+    """
+    Replays stored bars of several symbols as if they were arriving live
+
+    Symbols with the same timestamp arrive together, in the order given.
+    With a speed the stream is paced to wall-clock time (speed=60 plays an
+    hour of bars in a minute); without one, bars are emitted as fast as the
+    consumer takes them.
+
+    Use it as an async feed (async for bar in feed, e.g. under PaperTrader)
+    or drive a plain callable with run(). Either way, after a replay:
+    - latency: histogram of consumer processing time per event
+    - symbol_latency: the same per symbol
+    - lag: how late paced events were emitted vs their schedule
+    """
+
+    def __init__(self, db: Optional[DatabaseManager], symbols: Iterable[str], start=None, end=None,
+                 interval: str = '1m', speed: Optional[float] = None, frames=None,
+                 page_size: int = 10_000):
+        """
+        Initialize replay feed
+
+        Args:
+            db: DatabaseManager to read bars from
+            symbols: Tickers to replay
+            start: First timestamp (optional)
+            end: Last timestamp (optional)
+            interval: Bar interval (1m, 5m, 1h, etc)
+            speed: Replay speed multiple of real time (None = as fast as possible)
+            frames: Optional {symbol: DataFrame} to replay instead of reading db
+            page_size: Bars read per symbol at a time
+        """
+        self.db = db
+        self.symbols = list(symbols)
+        self.start = start
+        self.end = end
+        self.interval = interval
+        self.speed = speed
+        self.frames = frames
+        self.page_size = page_size
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.symbol_latency: Dict[str, LatencyHistogram] = {symbol: LatencyHistogram() for symbol in self.symbols}
+        self.lag = LatencyHistogram()
+        self.events = 0
+
+    @property
+    def latency(self) -> LatencyHistogram:
+        """Consumer processing time over all symbols"""
+        combined = LatencyHistogram()
+        for histogram in self.symbol_latency.values():
+            combined.merge(histogram)
+        return combined
+
+    def _pages(self, symbol) -> Iterator[pd.DataFrame]:
+        """One symbol's bars, a page at a time"""
+
+        if self.frames is not None:
+            df = self.frames[symbol]
+            if self.start is not None:
+                df = df[df.index >= self.start]
+            if self.end is not None:
+                df = df[df.index <= self.end]
+            for offset in range(0, len(df), self.page_size):
+                yield df.iloc[offset:offset + self.page_size]
+            return
+
+        cursor = self.start
+        while True:
+            page = self.db.get_bars_df(symbol, cursor, self.end, self.interval, limit=self.page_size)
+            yield page
+            if len(page) < self.page_size:
+                return
+            # Stored timestamps have microsecond resolution
+            cursor = (page.index[-1] + pd.Timedelta(microseconds=1)).to_pydatetime()
+
+    def merged(self) -> Iterator[Bar]:
+        """All bars of all symbols in time order (k-way heap merge of the per-symbol pages)"""
+
+        cursors = [_Cursor(symbol, self._pages(symbol)) for symbol in self.symbols]
+        heap = [(cursor.keys[0], k) for k, cursor in enumerate(cursors) if cursor.load()]
+        heapq.heapify(heap)
+
+        while heap:
+            _, k = heap[0]
+            cursor = cursors[k]
+            yield cursor.bars[cursor.pos]
+
+            cursor.pos += 1
+            if cursor.pos < len(cursor.keys) or cursor.load():
+                heapq.heapreplace(heap, (cursor.keys[cursor.pos], k))
+            else:
+                heapq.heappop(heap)
+
+    def _schedule(self, bar, first) -> float:
+        """Seconds after the replay start at which a bar is due"""
+        return (bar.timestamp - first).total_seconds() / self.speed
+
+    def run(self, consumer: Callable[[Bar], object], max_events: Optional[int] = None) -> Dict:
+        """
+        Replay synchronously into a callable and time it
+
+        Paced waits sleep and then spin for the last fraction of a
+        millisecond, so events are emitted within microseconds of schedule.
+
+        Args:
+            consumer: Called with every bar (e.g. a strategy handler)
+            max_events: Stop after this many events
+
+        Returns:
+            Same dictionary as stats()
+        """
+        self._reset_stats()
+        clock = time.perf_counter
+        started = clock()
+        first = None
+
+        for bar in self.merged():
+            if self.speed:
+                first = first if first is not None else bar.timestamp
+                due = started + self._schedule(bar, first)
+                wait = due - clock()
+                if wait > SPIN_SECONDS:
+                    time.sleep(wait - SPIN_SECONDS)
+                while clock() < due:
+                    pass
+                self.lag.record(int((clock() - due) * 1e9))
+
+            begin = time.perf_counter_ns()
+            consumer(bar)
+            self._record(bar.symbol, time.perf_counter_ns() - begin)
+
+            if max_events and self.events >= max_events:
+                break
+
+        return self.stats(clock() - started)
+
+    async def __aiter__(self) -> AsyncIterator[Bar]:
+        self._reset_stats()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        first = None
+
+        for bar in self.merged():
+            if self.speed:
+                first = first if first is not None else bar.timestamp
+                due = started + self._schedule(bar, first)
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self.lag.record(int((loop.time() - due) * 1e9))
+            elif self.events % 1000 == 0:
+                # Let other tasks (e.g. persistence) run now and then
+                await asyncio.sleep(0)
+
+            # The consumer's loop body runs between yield and resume
+            begin = time.perf_counter_ns()
+            yield bar
+            self._record(bar.symbol, time.perf_counter_ns() - begin)
+
+    def _record(self, symbol, elapsed):
+        self.symbol_latency[symbol].record(elapsed)
+        self.events += 1
+
+    def stats(self, elapsed: Optional[float] = None) -> Dict:
+        """
+        Timing of the last replay
+
+        Returns:
+            Dictionary with:
+            - events: Bars delivered
+            - elapsed: Wall time in seconds (when known)
+            - events_per_second: Throughput (when elapsed is known)
+            - latency: Consumer processing time summary (count, mean, p50, p99, max in us)
+            - lag: Emission delay vs schedule summary (paced replays)
+            - symbols: DataFrame of per-symbol latency summaries
+        """
+        return {
+            'events': self.events,
+            'elapsed': elapsed,
+            'events_per_second': self.events / elapsed if elapsed else None,
+            'latency': self.latency.summary(),
+            'lag': self.lag.summary(),
+            'symbols': pd.DataFrame({symbol: histogram.summary()
+                                     for symbol, histogram in self.symbol_latency.items()}).T,
+        }
@@ -0,0 +1,145 @@
+"""Asyncio paper-trading runtime: bar feed -> streaming strategy -> simulated fills"""
+
+import asyncio
+import time
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+from backtesting.engine import Backtester
+from database.models import DatabaseManager
+from strategies.streaming import StreamingStrategy
+from .broker import PaperBroker
+from .feed import BarFeed
+from .latency import LatencyHistogram
+
+
+class PaperTrader:
+    """
+    Runs streaming strategies against a bar feed and paper-trades their signals
+
+    Each bar is handled synchronously as soon as it arrives: the symbol's
+    strategy does its O(1) on_bar() update and the broker fills any order, so
+    one event loop keeps up with hundreds of symbols without per-symbol tasks
+    or queues. Persistence runs in a background task that periodically hands
+    new fills and positions to a thread, keeping database writes out of the
+    bar-to-decision path.
+
+    Usage:
+        feed = ReplayFeed(db, ['SPY', 'QQQ'], speed=60)
+        trader = PaperTrader(feed, lambda symbol: StreamingBollingerBands(20, 2), db=db)
+        asyncio.run(trader.run())
+        trader.summary()
+    """
+
+    def __init__(self, feed: BarFeed, strategy_factory: Callable[[str], StreamingStrategy],
+                 backtester: Optional[Backtester] = None, db: Optional[DatabaseManager] = None,
+                 account: str = 'paper', flush_interval: float = 1.0):
+        """
+        Initialize paper trader
+
+        Args:
+            feed: Source of bars (ReplayFeed or a live feed)
+            strategy_factory: Called once per symbol to create its strategy
+            backtester: Cost model, capital per symbol and stops (defaults to Backtester())
+            db: DatabaseManager for fills and positions (None = don't persist)
+            account: Account name stored with fills and positions
+            flush_interval: Seconds between writes to the database
+        """
+        self.feed = feed
+        self.strategy_factory = strategy_factory
+        self.broker = PaperBroker(backtester, account)
+        self.db = db
+        self.account = account
+        self.flush_interval = flush_interval
+
+        self.strategies: Dict[str, StreamingStrategy] = {}
+        self.bars = 0
+        self.latency: Dict[str, LatencyHistogram] = {}  # Bar-to-decision time per symbol
+
+    def on_bar(self, bar) -> int:
+        """
+        Handle one bar: update the symbol's strategy and fill its signal
+
+        Returns:
+            The strategy's signal for the bar
+        """
+        # Creating a symbol's strategy on its first bar is set-up, not decision time
+        strategy = self.strategies.get(bar.symbol)
+        if strategy is None:
+            strategy = self.strategies[bar.symbol] = self.strategy_factory(bar.symbol)
+
+        started = time.perf_counter_ns()
+        signal = strategy.on_bar(bar)
+        self.broker.on_bar(bar, signal)
+
+        elapsed = time.perf_counter_ns() - started
+        histogram = self.latency.get(bar.symbol)
+        if histogram is None:
+            histogram = self.latency[bar.symbol] = LatencyHistogram()
+        histogram.record(elapsed)
+
+        self.bars += 1
+        return signal
+
+    async def run(self):
+        """Consume the feed until it ends (or the task is cancelled), then save the final state"""
+
+        started = time.perf_counter()
+        flusher = asyncio.create_task(self._flush_periodically()) if self.db else None
+
+        try:
+            async for bar in self.feed:
+                self.on_bar(bar)
+        finally:
+            if flusher:
+                flusher.cancel()
+                try:
+                    await flusher
+                except asyncio.CancelledError:
+                    pass
+                # Final write includes every position, marked at its last bar
+                fills, _ = self.broker.drain()
+                await self._write(fills, self.broker.positions())
+
+        elapsed = time.perf_counter() - started
+        print(f"✓ Paper-traded {self.bars} bars of {len(self.strategies)} symbols "
+              f"({len(self.broker.trades)} trades) in {elapsed:.1f}s")
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._write(*self.broker.drain())
+
+    async def _write(self, fills, positions):
+        """Save fills and positions in a worker thread"""
+        if fills or positions:
+            await asyncio.to_thread(self._save, fills, positions)
+
+    def _save(self, fills, positions):
+        self.db.save_paper_fills(fills)
+        self.db.save_paper_positions(positions)
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Per-symbol results
+
+        Returns:
+            DataFrame indexed by symbol with bars, trades, portfolio value,
+            total return and mean/p50/p99/max bar-to-decision latency in
+            microseconds
+        """
+        initial = self.broker.backtester.initial_capital
+        rows = []
+        for symbol, histogram in self.latency.items():
+            value = self.broker.portfolio_value(symbol)
+            latency = histogram.summary()
+            rows.append({
+                'symbol': symbol,
+                'bars': latency['count'],
+                'trades': sum(1 for trade in self.broker.trades if trade['symbol'] == symbol),
+                'portfolio_value': value,
+                'total_return': (value - initial) / initial * 100,
+                **{f"latency_{key}": value for key, value in latency.items() if key != 'count'},
+            })
+        return pd.DataFrame(rows).set_index('symbol') if rows else pd.DataFrame()
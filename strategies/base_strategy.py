@@ -1,6 +1,8 @@
 """Abstract base class for all trading strategies"""
 
 from abc import ABC, abstractmethod
+from typing import Dict, List
+import numpy as np
 import pandas as pd
 
 
@@ -13,8 +15,32 @@ class BaseStrategy(ABC):
     
     @abstractmethod
     def generate_signals(self, df):
-        """Generate trading signals (1=BUY, -1=SELL, 0=HOLD) from market data"""
+        """
+        Generate trading signals (1=BUY, -1=SELL, 0=HOLD) from market data
+        
+        Implementations add their columns to df.copy(deep=False), which
+        leaves the caller's frame alone without duplicating the price
+        columns (possibly shared-memory views).
+        """
         pass
     
+    @classmethod
+    def batch_signals(cls, df, params: List[Dict]) -> np.ndarray:
+        """
+        Signals of many parameter combinations on the same data
+        
+        The default runs generate_signals once per combination; strategies
+        override it to share indicator work across combinations.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            params: Parameter dictionaries, each passed as cls(**params)
+        
+        Returns:
+            (bars x combinations) array of signals, column k for params[k]
+        """
+        columns = [cls(**p).generate_signals(df)['signal'].to_numpy(dtype=float) for p in params]
+        return np.column_stack(columns) if columns else np.empty((len(df), 0))
+    
     def __repr__(self):
         return f"<Strategy: {self.name}>"
\ No newline at end of file
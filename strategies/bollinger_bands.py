@@ -1,6 +1,9 @@
 """Bollinger Bands Breakout trading strategy"""
 
 from .base_strategy import BaseStrategy
+from utils.indicator_cache import indicator_cache, sma, rolling_std
+from utils.indicators import bollinger_windows, percent_b_signals
+import numpy as np
 import pandas as pd
 
 
@@ -22,20 +25,22 @@ class BollingerBands(BaseStrategy):
     def generate_signals(self, df):
         """Generate BUY/SELL signals based on Bollinger Band position"""
         
-        # Make copy to avoid modifying original
-        df = df.copy()
+        df = df.copy(deep=False)
         
         # Calculate Bollinger Bands if not present
         if f'bb_middle_{self.period}' not in df.columns:
+            # Mean and std are cached, so variants sharing a period reuse them
+            fingerprint = indicator_cache.fingerprint(df['close'])
+            
             # Middle band (SMA)
-            df[f'bb_middle_{self.period}'] = df['close'].rolling(window=self.period).mean()
+            df[f'bb_middle_{self.period}'] = sma(df['close'], self.period, fingerprint=fingerprint)
             
             # Standard deviation
-            rolling_std = df['close'].rolling(window=self.period).std()
+            std = rolling_std(df['close'], self.period, fingerprint=fingerprint)
             
             # Upper and lower bands
-            df[f'bb_upper_{self.period}'] = df[f'bb_middle_{self.period}'] + (rolling_std * self.std_dev)
-            df[f'bb_lower_{self.period}'] = df[f'bb_middle_{self.period}'] - (rolling_std * self.std_dev)
+            df[f'bb_upper_{self.period}'] = df[f'bb_middle_{self.period}'] + (std * self.std_dev)
+            df[f'bb_lower_{self.period}'] = df[f'bb_middle_{self.period}'] - (std * self.std_dev)
         
         # Calculate %B indicator (where price is relative to bands)
         # %B = (close - lower) / (upper - lower)
@@ -45,19 +50,42 @@ class BollingerBands(BaseStrategy):
         band_width = df[f'bb_upper_{self.period}'] - df[f'bb_lower_{self.period}']
         df['percent_b'] = (df['close'] - df[f'bb_lower_{self.period}']) / band_width
         
-        # Initialize signal column
-        df['signal'] = 0
+        # BUY when %B < 0.2 (price in lower 20% of band - oversold), SELL when
+        # %B > 0.8 (price in upper 20% of band - overbought), HOLD in the
+        # middle zone; %B on a cutoff is settled exactly from the window prices
+        df['signal'] = percent_b_signals(df['close'], df['percent_b'], self.period, self.std_dev).astype(np.int64)
         
-        # BUY when %B < 0.2 (price in lower 20% of band - oversold)
-        df.loc[df['percent_b'] < 0.2, 'signal'] = 1
+        # Detect signal changes
+        df['position'] = df['signal'].diff()
         
-        # SELL when %B > 0.8 (price in upper 20% of band - overbought)
-        df.loc[df['percent_b'] > 0.8, 'signal'] = -1
+        return df
+    
+    @classmethod
+    def batch_signals(cls, df, params):
+        """
+        Signals of many (period, std_dev) combinations from one family of windows
         
-        # HOLD when in middle zone (0.2 to 0.8)
-        df.loc[(df['percent_b'] >= 0.2) & (df['percent_b'] <= 0.8), 'signal'] = 0
+        Rolling mean and std are computed once for every distinct period from
+        shared prefix sums; bands, %B and the 0.2 / 0.8 cutoffs for every
+        std_dev are then applied by broadcasting over a (bars x combinations)
+        matrix. %B on a cutoff is settled exactly as in generate_signals, so
+        the signals equal those of running each combination on its own.
+        """
+        strategies = [cls(**p) for p in params]
+        periods = sorted({strategy.period for strategy in strategies})
+        mean, std = bollinger_windows(df['close'].to_numpy(dtype=float), periods)
         
-        # Detect signal changes
-        df['position'] = df['signal'].diff()
+        # Column of each combination's period, and its band multiplier
+        column = [periods.index(strategy.period) for strategy in strategies]
+        std_dev = np.array([strategy.std_dev for strategy in strategies], dtype=float)
+        
+        # Same arithmetic as generate_signals, for every combination at once
+        middle = mean[:, column]
+        width = std[:, column] * std_dev
+        upper = middle + width
+        lower = middle - width
+        close = df['close'].to_numpy(dtype=float)[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percent_b = (close - lower) / (upper - lower)
         
-        return df
\ No newline at end of file
+        return percent_b_signals(close[:, 0], percent_b, [strategy.period for strategy in strategies], std_dev)
@@ -1,6 +1,9 @@
 """Moving Average Crossover trading strategy"""
 
 from .base_strategy import BaseStrategy
+from utils.indicator_cache import indicator_cache, sma
+from utils.indicators import crossover_signals, sma_windows
+import numpy as np
 import pandas as pd
 
 
@@ -16,27 +19,49 @@ class MovingAverageCrossover(BaseStrategy):
     def generate_signals(self, df):
         """Generate BUY/SELL signals based on MA crossovers"""
         
-        # Make a copy to avoid modifying original
-        df = df.copy()
+        df = df.copy(deep=False)
+        
+        # Hash prices once, shared by both cached MA lookups
+        fingerprint = indicator_cache.fingerprint(df['close'])
         
         # Calculate short MA if not present
         if f'sma_{self.short_period}' not in df.columns:
-            df[f'sma_{self.short_period}'] = df['close'].rolling(window=self.short_period).mean()
+            df[f'sma_{self.short_period}'] = sma(df['close'], self.short_period, fingerprint=fingerprint)
         
         # Calculate long MA if not present
         if f'sma_{self.long_period}' not in df.columns:
-            df[f'sma_{self.long_period}'] = df['close'].rolling(window=self.long_period).mean()
-        
-        # Initialize signal column to 0 (neutral)
-        df['signal'] = 0
+            df[f'sma_{self.long_period}'] = sma(df['close'], self.long_period, fingerprint=fingerprint)
         
-        # BUY signal (1) when short MA > long MA (uptrend)
-        df.loc[df[f'sma_{self.short_period}'] > df[f'sma_{self.long_period}'], 'signal'] = 1
-        
-        # SELL signal (-1) when short MA < long MA (downtrend)
-        df.loc[df[f'sma_{self.short_period}'] < df[f'sma_{self.long_period}'], 'signal'] = -1
+        # BUY signal (1) when short MA > long MA (uptrend), SELL signal (-1)
+        # when below (downtrend); near-ties are settled from exact window
+        # sums so every SMA kernel gives the same signals
+        df['signal'] = crossover_signals(df['close'], df[f'sma_{self.short_period}'], df[f'sma_{self.long_period}'],
+                                         self.short_period, self.long_period).astype(np.int64)
         
         # Detect crossovers (position = 2 means crossed up, -2 means crossed down)
         df['position'] = df['signal'].diff()
         
-        return df
\ No newline at end of file
+        return df
+    
+    @classmethod
+    def batch_signals(cls, df, params):
+        """
+        Signals of many (short_period, long_period) combinations
+        
+        Every distinct period's SMA comes from one family of windows over
+        shared prefix sums; each combination then compares two columns.
+        Near-ties are settled exactly as in generate_signals, so the signals
+        equal those of running each combination on its own.
+        """
+        strategies = [cls(**p) for p in params]
+        periods = sorted({period for strategy in strategies
+                          for period in (strategy.short_period, strategy.long_period)})
+        close = df['close'].to_numpy(dtype=float)
+        averages = sma_windows(close, periods)
+        
+        short = averages[:, [periods.index(strategy.short_period) for strategy in strategies]]
+        long = averages[:, [periods.index(strategy.long_period) for strategy in strategies]]
+        
+        return crossover_signals(close, short, long,
+                                 [strategy.short_period for strategy in strategies],
+                                 [strategy.long_period for strategy in strategies])
@@ -1,6 +1,9 @@
 """RSI Mean Reversion trading strategy"""
 
 from .base_strategy import BaseStrategy
+from utils.indicator_cache import rsi
+from utils.indicators import rsi_signals, rsi_windows
+import numpy as np
 import pandas as pd
 
 
@@ -17,32 +20,42 @@ class RSIMeanReversion(BaseStrategy):
     def generate_signals(self, df):
         """Generate BUY/SELL signals based on RSI levels"""
         
-        # Make copy to avoid modifying original
-        df = df.copy()
+        df = df.copy(deep=False)
         
-        # Calculate RSI if not present
+        # Calculate RSI if not present (cached across strategies sharing the same prices)
         if f'rsi_{self.rsi_period}' not in df.columns:
-            # Calculate price changes
-            delta = df['close'].diff()
-            
-            # Separate gains and losses
-            gain = (delta.where(delta > 0, 0)).rolling(window=self.rsi_period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=self.rsi_period).mean()
-            
-            # Calculate RSI
-            rs = gain / loss
-            df[f'rsi_{self.rsi_period}'] = 100 - (100 / (1 + rs))
-        
-        # Initialize signal column
-        df['signal'] = 0
-        
-        # BUY when RSI < oversold threshold (price too low, expect bounce)
-        df.loc[df[f'rsi_{self.rsi_period}'] < self.oversold, 'signal'] = 1
-        
-        # SELL when RSI > overbought threshold (price too high, expect drop)
-        df.loc[df[f'rsi_{self.rsi_period}'] > self.overbought, 'signal'] = -1
+            df[f'rsi_{self.rsi_period}'] = rsi(df['close'], self.rsi_period)
+        
+        # BUY when RSI < oversold threshold (price too low, expect bounce),
+        # SELL when RSI > overbought threshold (price too high, expect drop);
+        # RSI values at a threshold are settled exactly from gains and losses
+        df['signal'] = rsi_signals(df['close'], df[f'rsi_{self.rsi_period}'], self.rsi_period,
+                                   self.oversold, self.overbought).astype(np.int64)
         
         # Detect signal changes
         df['position'] = df['signal'].diff()
         
-        return df
\ No newline at end of file
+        return df
+    
+    @classmethod
+    def batch_signals(cls, df, params):
+        """
+        Signals of many (rsi_period, oversold, overbought) combinations
+        
+        RSI is computed once per distinct period from shared prefix sums of
+        gains and losses; each combination's thresholds are applied by
+        broadcasting over a (bars x combinations) matrix. RSI values at a
+        threshold are settled exactly as in generate_signals, so the signals
+        equal those of running each combination on its own.
+        """
+        strategies = [cls(**p) for p in params]
+        periods = sorted({strategy.rsi_period for strategy in strategies})
+        close = df['close'].to_numpy(dtype=float)
+        values = rsi_windows(close, periods)
+        
+        column = [periods.index(strategy.rsi_period) for strategy in strategies]
+        oversold = np.array([strategy.oversold for strategy in strategies], dtype=float)
+        overbought = np.array([strategy.overbought for strategy in strategies], dtype=float)
+        
+        return rsi_signals(close, values[:, column], [strategy.rsi_period for strategy in strategies],
+                           oversold, overbought)
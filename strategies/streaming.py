@@ -0,0 +1,153 @@
+"""Incremental (bar-by-bar) versions of the trading strategies for live loops"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+from utils.indicators import (PERCENT_B_TOLERANCE, TIE_TOLERANCE, exact_mean_order, exact_percent_b_order,
+                              exact_rsi_order)
+from utils.rolling import RollingMean, RollingRSI, RollingPercentB
+
+
+def _near_tie(a: float, b: float, tolerance: float = TIE_TOLERANCE) -> bool:
+    """Whether a and b are within tolerance (relative), where rounding could order them either way"""
+    return abs(a - b) <= tolerance * max(abs(a), abs(b))
+
+
+def bar_close(bar) -> float:
+    """Read the close price from a number, dict/Series bar or MarketBar-like object"""
+    if isinstance(bar, (int, float)):
+        return bar
+    try:
+        return bar['close']
+    except (TypeError, KeyError):
+        return bar.close
+
+
+class StreamingStrategy(ABC):
+    """
+    Interface for strategies that update one bar at a time
+
+    on_bar() does O(1) work per bar by keeping rolling indicator state instead
+    of recomputing over the whole history. Each streaming strategy emits the
+    same signal the batch generate_signals() would give for that bar.
+    """
+
+    def __init__(self, name):
+        """Initialize strategy with a name"""
+        self.name = name
+
+    @abstractmethod
+    def on_bar(self, bar) -> int:
+        """Consume the next bar and return its signal (1=BUY, -1=SELL, 0=HOLD)"""
+        pass
+
+    @abstractmethod
+    def reset(self):
+        """Clear all indicator state"""
+        pass
+
+    def run(self, df: pd.DataFrame) -> pd.Series:
+        """Feed every row of df through on_bar() and collect the signals"""
+        signals = [self.on_bar(close) for close in df['close'].to_numpy(dtype=float)]
+        return pd.Series(np.array(signals, dtype=np.int64), index=df.index, name='signal')
+
+    def __repr__(self):
+        return f"<StreamingStrategy: {self.name}>"
+
+
+class StreamingMovingAverageCrossover(StreamingStrategy):
+    """Bar-by-bar MovingAverageCrossover: 1 while fast MA > slow MA, -1 while below"""
+
+    def __init__(self, short_period=10, long_period=50):
+        """Initialize with short and long MA periods"""
+        super().__init__(f"MA_Crossover_{short_period}_{long_period}")
+        self.short_period = short_period
+        self.long_period = long_period
+        self.reset()
+
+    def reset(self):
+        self.short_ma = RollingMean(self.short_period)
+        self.long_ma = RollingMean(self.long_period)
+
+    def on_bar(self, bar):
+        close = bar_close(bar)
+        short = self.short_ma.update(close)
+        long = self.long_ma.update(close)
+
+        # Near-ties are settled exactly, as in the batch version
+        if _near_tie(short, long):
+            return exact_mean_order(self.short_ma.window, self.long_ma.window)
+        if short > long:
+            return 1
+        if short < long:
+            return -1
+        return 0
+
+
+class StreamingRSIMeanReversion(StreamingStrategy):
+    """Bar-by-bar RSIMeanReversion: 1 when RSI < oversold, -1 when RSI > overbought"""
+
+    def __init__(self, rsi_period=14, oversold=30, overbought=70):
+        """Initialize with RSI parameters"""
+        super().__init__(f"RSI_MeanReversion_{rsi_period}_{oversold}_{overbought}")
+        self.rsi_period = rsi_period
+        self.oversold = oversold
+        self.overbought = overbought
+        self.reset()
+
+    def reset(self):
+        self.rsi = RollingRSI(self.rsi_period, method='simple')
+
+    def on_bar(self, bar):
+        close = bar_close(bar)
+        rsi = self.rsi.update(close)
+
+        # RSI values at a threshold are settled exactly, as in the batch version
+        if _near_tie(rsi, self.oversold) or _near_tie(rsi, self.overbought):
+            gains, losses = self.rsi.avg_gain.window, self.rsi.avg_loss.window
+            below = exact_rsi_order(gains, losses, self.oversold)
+            if below is None:
+                return 0
+            if exact_rsi_order(gains, losses, self.overbought) > 0:
+                return -1
+            return 1 if below < 0 else 0
+
+        # Overbought checked last so it wins, as in the batch version
+        signal = 0
+        if rsi < self.oversold:
+            signal = 1
+        if rsi > self.overbought:
+            signal = -1
+        return signal
+
+
+class StreamingBollingerBands(StreamingStrategy):
+    """Bar-by-bar BollingerBands: 1 when %B < 0.2, -1 when %B > 0.8"""
+
+    def __init__(self, period=20, std_dev=2):
+        """Initialize with band period and width"""
+        super().__init__(f"BollingerBands_{period}_{std_dev}")
+        self.period = period
+        self.std_dev = std_dev
+        self.reset()
+
+    def reset(self):
+        self.percent_b = RollingPercentB(self.period, self.std_dev)
+
+    def on_bar(self, bar):
+        close = bar_close(bar)
+        percent_b = self.percent_b.update(close)
+
+        # %B on a cutoff is settled exactly, as in the batch version
+        if _near_tie(percent_b, 0.2, PERCENT_B_TOLERANCE) or _near_tie(percent_b, 0.8, PERCENT_B_TOLERANCE):
+            window = self.percent_b.middle.window
+            if exact_percent_b_order(window, self.std_dev, 0.8) > 0:
+                return -1
+            return 1 if exact_percent_b_order(window, self.std_dev, 0.2) < 0 else 0
+        if percent_b < 0.2:
+            return 1
+        if percent_b > 0.8:
+            return -1
+        return 0
@@ -5,6 +5,7 @@ from strategies.moving_average import MovingAverageCrossover
 from strategies.rsi_strategy import RSIMeanReversion
 from strategies.bollinger_bands import BollingerBands
 from backtesting.engine import Backtester
+from backtesting.result_store import ResultStore
 from datetime import datetime, timedelta
 import pandas as pd
 
@@ -36,7 +37,9 @@ all_strategies = [
 ]
 
 # Initialize backtester
-backtester = Backtester(initial_capital=10000, commission=0.001, slippage=0.001)
+# Runs stored by one script are reused by the other (same data, same settings)
+backtester = Backtester(initial_capital=10000, commission=0.001, slippage=0.001,
+                        result_store=ResultStore())
 
 # Store all results
 all_results = []
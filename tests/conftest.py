@@ -0,0 +1,26 @@
+"""Shared fixtures for the test suite"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_ohlcv(n_bars=500, seed=0, freq='D'):
+    """Build a random-walk OHLCV DataFrame indexed by timestamp"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.005, n_bars)) * close
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.integers(1_000, 100_000, n_bars),
+    }, index=pd.date_range('2024-01-01', periods=n_bars, freq=freq, name='timestamp'))
+
+
+@pytest.fixture
+def ohlcv():
+    """500 daily bars of synthetic price data"""
+    return make_ohlcv()
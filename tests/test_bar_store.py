@@ -0,0 +1,59 @@
+"""Tests for the columnar bar store"""
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from database.bar_store import ColumnarBarStore
+from database.models import DatabaseManager
+from tests.conftest import make_ohlcv
+
+
+@pytest.fixture(params=['ipc', 'parquet'])
+def store(tmp_path, request):
+    return ColumnarBarStore(tmp_path / 'store', file_format=request.param)
+
+
+def test_append_partitions_by_month_and_reads_back(store):
+    bars = make_ohlcv(100, freq='D')  # spans four months
+
+    assert store.append('SPY', bars, interval='1d') == 100
+    assert store._month_dirs('SPY', '1d') == ['2024-01', '2024-02', '2024-03', '2024-04']
+    assert store.list_series() == [('SPY', '1d')]
+
+    pd.testing.assert_frame_equal(store.read('SPY', interval='1d'), bars, check_index_type=False,
+                                  check_freq=False, check_names=False)
+
+
+def test_append_only_skips_old_bars(store):
+    bars = make_ohlcv(60, freq='D')
+
+    store.append('SPY', bars.iloc[:40], interval='1d')
+    assert store.append('SPY', bars.iloc[30:], interval='1d') == 20
+    assert store.append('SPY', bars, interval='1d') == 0
+    assert len(store.read('SPY', interval='1d')) == 60
+
+
+def test_append_keeps_last_of_repeated_timestamps(store):
+    bars = make_ohlcv(30, freq='D')
+    repeated = bars.iloc[[10]].assign(close=123.0)
+    with_repeat = pd.concat([bars.iloc[:20], repeated, bars.iloc[20:]])
+
+    assert store.append('SPY', with_repeat, interval='1d') == 30
+    stored = store.read('SPY', interval='1d')
+    assert stored.index.is_unique
+    assert stored['close'].iloc[10] == 123.0
+
+
+def test_range_read_matches_database(store, tmp_path):
+    bars = make_ohlcv(3000, freq='h')
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'bars.db'}")
+    db.bulk_save_bars('SPY', bars, interval='1h')
+
+    assert store.import_from_database(db) == {'SPY/1h': 3000}
+
+    start, end = bars.index[700], bars.index[2100]
+    from_store = store.read('SPY', start, end, interval='1h', columns=['close', 'volume'])
+    from_db = db.get_bars_df('SPY', start, end, interval='1h', columns=['close', 'volume'])
+    pd.testing.assert_frame_equal(from_store, from_db, check_index_type=False)
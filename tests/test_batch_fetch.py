@@ -0,0 +1,120 @@
+"""Tests for concurrent multi-symbol fetching"""
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from data.providers.base import DataProvider
+from data.providers.batch import BatchFetcher, RateLimiter
+from database.models import DatabaseManager
+from tests.conftest import make_ohlcv
+
+
+class StubProvider(DataProvider):
+    """Local provider with injected latency and failures"""
+
+    def __init__(self, latency=0.05, failures=None, rate_limit=None):
+        self.latency = latency
+        self.failures = dict(failures or {})  # symbol -> number of failing attempts
+        self.rate_limit = rate_limit
+        self.request_times = []
+        self.lock = threading.Lock()
+
+    def get_bars(self, symbol, start, end, interval='1m'):
+        with self.lock:
+            self.request_times.append(time.monotonic())
+            failing = self.failures.get(symbol, 0)
+            if failing:
+                self.failures[symbol] = failing - 1
+        self.log(f"Fetching {symbol}")
+        time.sleep(self.latency)
+        if failing:
+            raise ConnectionError(f"{symbol} temporarily unavailable")
+        return make_ohlcv(20, seed=hash(symbol) % 1000, freq='min')
+
+
+START, END = datetime(2024, 1, 1), datetime(2024, 1, 2)
+SYMBOLS = [f'SYM{i}' for i in range(16)]
+
+
+def test_fetches_concurrently():
+    provider = StubProvider(latency=0.1)
+
+    started = time.perf_counter()
+    bars = provider.get_bars_batch(SYMBOLS, START, END, max_workers=16)
+    elapsed = time.perf_counter() - started
+
+    assert sorted(bars) == sorted(SYMBOLS)
+    assert elapsed < 0.1 * len(SYMBOLS) / 2
+
+
+def test_retries_with_backoff_and_reports_failures():
+    provider = StubProvider(latency=0, failures={'SYM1': 2, 'SYM2': 10})
+    fetcher = BatchFetcher(provider, max_retries=2, backoff=0.01)
+
+    results = fetcher.fetch_all(SYMBOLS[:4], START, END)
+
+    assert results['SYM0'].ok and results['SYM0'].attempts == 1
+    assert results['SYM1'].ok and results['SYM1'].attempts == 3
+    assert not results['SYM2'].ok
+    assert isinstance(results['SYM2'].error, ConnectionError)
+    assert results['SYM2'].attempts == 3
+
+
+def test_rate_limit_is_shared_per_provider():
+    provider = StubProvider(latency=0, rate_limit=50)
+
+    BatchFetcher(provider, max_workers=8).fetch_all(SYMBOLS[:5], START, END)
+    BatchFetcher(provider, max_workers=8).fetch_all(SYMBOLS[5:10], START, END)
+
+    # 10 requests at 50/s with a burst of 1 take at least 9 intervals
+    times = sorted(provider.request_times)
+    assert times[-1] - times[0] >= 9 / 50 * 0.9
+
+
+def test_rate_limiter_spacing():
+    limiter = RateLimiter(rate=100, burst=2)
+    started = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - started >= 4 / 100 * 0.9
+
+
+def test_streams_results_into_database(tmp_path):
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'bars.db'}")
+    provider = StubProvider(latency=0.01, failures={'SYM3': 10})
+
+    summary = BatchFetcher(provider, max_retries=1, backoff=0).fetch_to_database(db, SYMBOLS[:6], START, END)
+
+    assert summary['inserted'] == 5 * 20
+    assert list(summary['failed']) == ['SYM3']
+    assert len(db.get_bars_df('SYM0')) == 20
+
+
+def test_stopping_early_cancels_pending_downloads():
+    provider = StubProvider(latency=0.05)
+    symbols = [f'SYM{i}' for i in range(200)]
+
+    started = time.perf_counter()
+    for result in BatchFetcher(provider, max_workers=4).fetch(symbols, START, END):
+        break
+    elapsed = time.perf_counter() - started
+
+    time.sleep(0.1)  # let the requests already running finish
+    assert elapsed < 1.0
+    assert len(provider.request_times) < 20
+
+
+def test_batch_fetch_silences_provider_output(capsys):
+    provider = StubProvider(latency=0)
+
+    BatchFetcher(provider).fetch_all(SYMBOLS[:4], START, END)
+    assert capsys.readouterr().out == ''
+
+    BatchFetcher(provider, verbose=True).fetch_all(SYMBOLS[:2], START, END)
+    assert capsys.readouterr().out.count('Fetching') == 2
+
+    provider.get_bars('SYM0', START, END)
+    assert 'Fetching SYM0' in capsys.readouterr().out
@@ -0,0 +1,36 @@
+"""Tests for the benchmark data generators and regression checks"""
+
+import numpy as np
+
+from benchmarks.data import gbm_bars, regime_switching_bars
+from benchmarks.suite import CASES, baseline, find_regressions
+
+
+def test_generators_are_reproducible_and_consistent():
+    for generate in (gbm_bars, regime_switching_bars):
+        df = generate(5000, seed=3)
+        assert df.equals(generate(5000, seed=3))
+        assert (df['high'] >= df[['open', 'close']].max(axis=1)).all()
+        assert (df['low'] <= df[['open', 'close']].min(axis=1)).all()
+        assert df.index.is_monotonic_increasing
+
+    regimes = regime_switching_bars(20000, seed=1, stay_probability=0.99)['regime']
+    assert set(np.unique(regimes)) == {0, 1, 2}
+
+
+def test_regressions_compare_against_median_of_matching_runs():
+    def run(seconds, host='a', scale=1.0):
+        return {'host': host, 'scale': scale, 'results': {'case': {'seconds': seconds}}}
+
+    history = [run(1.0), run(1.2), run(0.8), run(0.1, host='b'), run(0.1, scale=0.1)]
+    assert baseline(history, 'case', 'a', 1.0) == 1.0
+    assert baseline(history, 'missing', 'a', 1.0) is None
+
+    thresholds = {'case': 0.25}
+    assert find_regressions({'case': {'seconds': 1.2}}, history, 'a', 1.0, thresholds) == {}
+    assert find_regressions({'case': {'seconds': 1.5}}, history, 'a', 1.0, thresholds) == {'case': 1.5}
+
+
+def test_suite_covers_every_area():
+    groups = {spec[2] for spec in CASES.values()}
+    assert groups == {'engine', 'strategies', 'indicators', 'storage', 'providers', 'live'}
@@ -0,0 +1,124 @@
+"""Tests for the read-through caching provider"""
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from data.providers.base import DataProvider
+from data.providers.caching import CachingProvider, missing_ranges
+from database.models import DatabaseManager
+from tests.conftest import make_ohlcv
+
+
+class FakeProvider(DataProvider):
+    """Serves slices of a synthetic frame and records every request"""
+
+    def __init__(self, bars):
+        self.bars = bars
+        self.calls = []
+
+    def get_bars(self, symbol, start, end, interval='1m'):
+        self.calls.append((symbol, start, end, interval))
+        return self.bars[(self.bars.index >= start) & (self.bars.index < end)]
+
+
+@pytest.fixture
+def fake():
+    return FakeProvider(make_ohlcv(24 * 60, freq='h'))  # 60 days of hourly bars
+
+
+@pytest.fixture
+def provider(fake, tmp_path):
+    return CachingProvider(fake, DatabaseManager(f"sqlite:///{tmp_path / 'cache.db'}"))
+
+
+def test_missing_ranges():
+    d = lambda day: datetime(2024, 1, day)
+    assert missing_ranges(d(1), d(10), []) == [(d(1), d(10))]
+    assert missing_ranges(d(1), d(10), [(d(3), d(5)), (d(7), d(8))]) == [
+        (d(1), d(3)), (d(5), d(7)), (d(8), d(10))]
+    assert missing_ranges(d(4), d(6), [(d(1), d(5)), (d(5), d(9))]) == []
+
+
+def test_second_request_is_served_locally(provider, fake):
+    start, end = datetime(2024, 1, 5), datetime(2024, 1, 20)
+
+    first = provider.get_bars('SPY', start, end, '1h')
+    second = provider.get_bars('SPY', start, end, '1h')
+
+    assert len(fake.calls) == 1
+    assert len(first) == 15 * 24
+    pd.testing.assert_frame_equal(first, second)
+    pd.testing.assert_frame_equal(first, fake.bars.loc[start:end].iloc[:-1],
+                                  check_freq=False, check_index_type=False)
+
+
+def test_only_gaps_are_fetched(provider, fake):
+    provider.get_bars('SPY', datetime(2024, 1, 5), datetime(2024, 1, 10), '1h')
+    provider.get_bars('SPY', datetime(2024, 1, 15), datetime(2024, 1, 20), '1h')
+    fake.calls.clear()
+
+    merged = provider.get_bars('SPY', datetime(2024, 1, 1), datetime(2024, 1, 25), '1h')
+
+    assert [(call[1].day, call[2].day) for call in fake.calls] == [(1, 5), (10, 15), (20, 25)]
+    assert len(merged) == 24 * 24
+    assert merged.index.is_monotonic_increasing
+
+    # Whole range is now covered in one merged record
+    assert provider.db.get_fetched_ranges('SPY', '1h') == [(datetime(2024, 1, 1), datetime(2024, 1, 25))]
+
+
+def test_ranges_without_bars_are_not_refetched(provider, fake):
+    # Range past the end of the fake data returns nothing but is remembered
+    provider.get_bars('SPY', datetime(2024, 6, 1), datetime(2024, 6, 5), '1h')
+    provider.get_bars('SPY', datetime(2024, 6, 1), datetime(2024, 6, 5), '1h')
+    assert len(fake.calls) == 1
+
+
+class ClockedProvider(FakeProvider):
+    """Only serves bars that have started by the fake clock; the last one is still forming"""
+
+    def __init__(self, bars, now):
+        super().__init__(bars)
+        self.now = now  # Naive New York wall-clock time
+
+    def get_bars(self, symbol, start, end, interval='1h'):
+        bars = super().get_bars(symbol, start, min(end, self.now)).copy()
+        if len(bars) and bars.index[-1] + pd.Timedelta(hours=1) > self.now:
+            bars.iloc[-1, bars.columns.get_loc('close')] = bars['open'].iloc[-1]  # partial bar
+        return bars
+
+
+def test_only_completed_bars_are_marked_fetched(fake, tmp_path):
+    clocked = ClockedProvider(fake.bars, datetime(2024, 1, 10, 10, 30))
+    # 15:30 UTC is 10:30 in New York (a UTC host's local clock is 5 hours ahead of the bars)
+    utc_now = [pd.Timestamp('2024-01-10 15:30', tz='UTC')]
+    provider = CachingProvider(clocked, DatabaseManager(f"sqlite:///{tmp_path / 'cache.db'}"),
+                               clock=lambda: utc_now[0])
+    start, end = datetime(2024, 1, 10), datetime(2024, 1, 11)
+
+    first = provider.get_bars('SPY', start, end, '1h')
+    assert first.index[-1] == datetime(2024, 1, 10, 10)
+    assert first['close'].iloc[-1] == fake.bars.loc['2024-01-10 10:00', 'open']
+    assert provider.db.get_fetched_ranges('SPY', '1h') == [(start, datetime(2024, 1, 10, 9, 30))]
+
+    # Two hours later the 10:00 bar is final: it is fetched again and overwritten
+    clocked.now = datetime(2024, 1, 10, 12, 30)
+    utc_now[0] = pd.Timestamp('2024-01-10 17:30', tz='UTC')
+    second = provider.get_bars('SPY', start, end, '1h')
+    assert clocked.calls[-1][1] == datetime(2024, 1, 10, 9, 30)
+    assert second.loc['2024-01-10 10:00', 'close'] == fake.bars.loc['2024-01-10 10:00', 'close']
+    assert second.index[-1] == datetime(2024, 1, 10, 12)
+    assert provider.db.get_fetched_ranges('SPY', '1h') == [(start, datetime(2024, 1, 10, 11, 30))]
+
+
+def test_interval_width():
+    from data.providers.caching import interval_width
+
+    assert interval_width('1m') == pd.Timedelta(minutes=1)
+    assert interval_width('15m') == pd.Timedelta(minutes=15)
+    assert interval_width('1d') == pd.Timedelta(days=1)
+    assert interval_width('1wk') == pd.Timedelta(weeks=1)
+    with pytest.raises(ValueError):
+        interval_width('fortnight')
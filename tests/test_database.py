@@ -0,0 +1,62 @@
+"""Tests for the database layer"""
+
+import pandas as pd
+import pytest
+
+from database.models import DatabaseManager
+from tests.conftest import make_ohlcv
+from utils.analysis import DataAnalyzer
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseManager(f"sqlite:///{tmp_path / 'bars.db'}")
+
+
+def test_bulk_save_skips_duplicates(db):
+    bars = make_ohlcv(300, freq='min')
+
+    assert db.bulk_save_bars('SPY', bars.iloc[:200], batch_size=64) == {'inserted': 200, 'skipped': 0}
+    assert db.bulk_save_bars('SPY', bars, batch_size=64) == {'inserted': 100, 'skipped': 200}
+
+    # Same timestamps under another interval or symbol are not duplicates
+    assert db.bulk_save_bars('SPY', bars.iloc[:10], interval='5m')['inserted'] == 10
+    assert db.bulk_save_bars('QQQ', bars.iloc[:10])['inserted'] == 10
+
+
+def test_bulk_and_orm_paths_see_each_others_rows(db):
+    bars = make_ohlcv(50, freq='h').tz_localize('America/New_York')
+
+    assert db.save_bars('SPY', bars.iloc[:20], interval='1h') == 20
+    assert db.bulk_save_bars('SPY', bars, interval='1h') == {'inserted': 30, 'skipped': 20}
+    assert db.save_bars('SPY', bars, interval='1h') == 0
+
+    stored = db.get_bars('SPY', interval='1h')
+    assert len(stored) == 50
+    assert stored[25].close == pytest.approx(bars['close'].iloc[25])
+    assert stored[25].timestamp == bars.index[25].tz_localize(None).to_pydatetime()
+
+
+def test_get_bars_df_matches_orm_path(db):
+    bars = make_ohlcv(500, freq='min')
+    db.bulk_save_bars('SPY', bars)
+    analyzer = DataAnalyzer(db)
+
+    start, end = bars.index[100], bars.index[399]
+    orm_df = analyzer.bars_to_dataframe(db.get_bars('SPY', start, end))
+    df = db.get_bars_df('SPY', start, end)
+
+    assert len(df) == 300
+    pd.testing.assert_frame_equal(df, orm_df, check_index_type=False)
+    pd.testing.assert_frame_equal(analyzer.get_df('SPY', start, end), df)
+
+    # Streaming returns the same rows in chunks
+    chunks = list(db.get_bars_df('SPY', start, end, columns=['close'], chunksize=128))
+    assert [len(chunk) for chunk in chunks] == [128, 128, 44]
+    pd.testing.assert_frame_equal(pd.concat(chunks), df[['close']])
+
+
+def test_get_bars_df_empty(db):
+    df = db.get_bars_df('NONE')
+    assert df.empty
+    assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
@@ -0,0 +1,82 @@
+"""Tests for the backtesting engine"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.engine import Backtester
+from strategies.bollinger_bands import BollingerBands
+from strategies.moving_average import MovingAverageCrossover
+from strategies.rsi_strategy import RSIMeanReversion
+
+STRATEGIES = [
+    MovingAverageCrossover(5, 20),
+    RSIMeanReversion(14, 40, 60),
+    BollingerBands(10, 2),
+]
+
+
+@pytest.mark.parametrize('strategy', STRATEGIES, ids=lambda s: s.name)
+def test_vectorized_matches_loop(ohlcv, strategy):
+    backtester = Backtester(initial_capital=10000, commission=0.001, slippage=0.001)
+
+    loop = backtester.run_backtest(strategy, ohlcv)
+    fast = backtester.run_backtest(strategy, ohlcv, vectorized=True)
+
+    assert len(loop['trades']) > 0
+    assert fast['trades'] == loop['trades']
+    pd.testing.assert_frame_equal(fast['equity_curve'], loop['equity_curve'])
+    assert fast['metrics'] == loop['metrics']
+
+
+def test_vectorized_handles_nan_signals_and_no_trades(ohlcv):
+    class Fixed:
+        name = 'fixed'
+
+        def __init__(self, signal):
+            self.signal = signal
+
+        def generate_signals(self, df):
+            df = df.copy()
+            df['signal'] = self.signal
+            return df
+
+    backtester = Backtester()
+    signal = np.full(len(ohlcv), np.nan)
+    signal[[10, 50, 200]] = [1, 0, 1]  # last position stays open
+
+    loop = backtester.run_backtest(Fixed(signal), ohlcv)
+    fast = backtester.run_backtest(Fixed(signal), ohlcv, vectorized=True)
+    assert fast['trades'] == loop['trades']
+    pd.testing.assert_frame_equal(fast['equity_curve'], loop['equity_curve'])
+
+    loop = backtester.run_backtest(Fixed(-1), ohlcv)
+    fast = backtester.run_backtest(Fixed(-1), ohlcv, vectorized=True)
+    pd.testing.assert_frame_equal(fast['equity_curve'], loop['equity_curve'])
+    assert fast['metrics'] == loop['metrics']
+
+
+def test_batch_simulation_matches_single_columns(ohlcv):
+    from backtesting.vectorized import simulate_long_only, simulate_long_only_batch
+
+    close = ohlcv['close'].to_numpy()
+    signals = np.column_stack(
+        [s.generate_signals(ohlcv)['signal'].to_numpy(dtype=float) for s in STRATEGIES]
+        + [np.full(len(ohlcv), -1.0)]  # never trades
+    )
+
+    batch = simulate_long_only_batch(close, signals, 10000, 0.001, 0.001)
+    for k, sim in enumerate(batch):
+        expected = simulate_long_only(close, signals[:, k], 10000, 0.001, 0.001)
+        for key, value in expected.items():
+            np.testing.assert_array_equal(sim[key], value)
+
+
+@pytest.mark.parametrize('max_workers', [None, 2])
+def test_batched_compare_matches_sequential(ohlcv, max_workers):
+    backtester = Backtester(initial_capital=10000, commission=0.001, slippage=0.001)
+
+    sequential = backtester.compare_strategies(STRATEGIES, ohlcv)
+    batched = backtester.compare_strategies(STRATEGIES, ohlcv, batched=True, max_workers=max_workers)
+
+    pd.testing.assert_frame_equal(batched, sequential)
@@ -0,0 +1,71 @@
+"""Tests for the shared indicator cache"""
+
+import pandas as pd
+import pytest
+
+from strategies.bollinger_bands import BollingerBands
+from utils import indicator_cache as indicators
+from utils.indicator_cache import IndicatorCache, indicator_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    indicator_cache.clear()
+    yield
+    indicator_cache.clear()
+
+
+def test_cached_values_match_pandas(ohlcv):
+    close = ohlcv['close']
+    pd.testing.assert_series_equal(indicators.sma(close, 20), close.rolling(20).mean())
+    pd.testing.assert_series_equal(indicators.rolling_std(close, 20), close.rolling(20).std())
+    pd.testing.assert_series_equal(indicators.ema(close, 12), close.ewm(span=12, adjust=False).mean())
+
+
+def test_hits_on_same_data_misses_on_changed_data(ohlcv):
+    indicators.sma(ohlcv['close'], 20)
+    indicators.sma(ohlcv.copy()['close'], 20)
+    assert indicator_cache.hits == 1 and indicator_cache.misses == 1
+
+    changed = ohlcv['close'].copy()
+    changed.iloc[-1] += 1
+    indicators.sma(changed, 20)
+    assert indicator_cache.misses == 2
+
+
+def test_tz_aware_and_string_indexes_fingerprint_by_value(ohlcv):
+    close = ohlcv['close'].tz_localize('America/New_York')
+    assert IndicatorCache.fingerprint(close) == IndicatorCache.fingerprint(close.copy())
+    assert IndicatorCache.fingerprint(close) != IndicatorCache.fingerprint(close.tz_convert('UTC'))
+
+    indicators.sma(close, 20)
+    indicators.sma(ohlcv.copy()['close'].tz_localize('America/New_York'), 20)
+    assert indicator_cache.hits == 1
+
+    labeled = pd.Series([1.0, 2.0], index=['a', 'b'])
+    assert IndicatorCache.fingerprint(labeled) == IndicatorCache.fingerprint(labeled.copy())
+    assert IndicatorCache.fingerprint(labeled) != IndicatorCache.fingerprint(labeled.set_axis(['a', 'c']))
+
+
+def test_bollinger_variants_share_bands(ohlcv):
+    for std_dev in (1.5, 2, 2.5, 3):
+        BollingerBands(20, std_dev).generate_signals(ohlcv)
+
+    # Mean and std computed once, reused by the other three variants
+    assert indicator_cache.misses == 2
+    assert indicator_cache.hits == 6
+
+
+def test_lru_eviction_respects_memory_bound(ohlcv):
+    close = ohlcv['close']
+    cache = IndicatorCache(max_bytes=close.nbytes * 2)
+
+    for period in (5, 10, 20):
+        indicators.sma(close, period, cache=cache)
+
+    assert cache.stats()['entries'] == 2
+    assert cache.evictions == 1
+
+    # Oldest entry (period 5) was evicted
+    indicators.sma(close, 5, cache=cache)
+    assert cache.hits == 0
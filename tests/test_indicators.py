@@ -0,0 +1,226 @@
+"""Tests for the vectorized indicator kernels"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.conftest import make_ohlcv
+from utils import indicators
+from utils.analysis import DataAnalyzer
+from utils.rolling import RollingRSI
+
+
+@pytest.fixture(params=['compiled', 'numpy'])
+def backend(request, monkeypatch):
+    """Run each test with the numba loops and with the NumPy-only fallback"""
+    if request.param == 'numpy':
+        monkeypatch.setattr(indicators, 'HAVE_NUMBA', False)
+    return request.param
+
+
+@pytest.fixture
+def close():
+    close = make_ohlcv(3000, seed=4)['close']
+    # Flat stretch and a gap exercise the identical-values and NaN paths
+    close.iloc[1000:1050] = close.iloc[1000]
+    close.iloc[2000] = np.nan
+    return close
+
+
+def _pandas_rsi(series, period):
+    delta = series.diff()
+    gain = delta.where(delta > 0, 0).rolling(period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(period).mean()
+    return 100 - 100 / (1 + gain / loss)
+
+
+@pytest.mark.parametrize('period', [1, 2, 20, 200])
+def test_rolling_windows_match_pandas(close, backend, period):
+    values = close.to_numpy()
+    np.testing.assert_allclose(indicators.sma(values, period), close.rolling(period).mean(), rtol=1e-12)
+    # Exact two-pass reference (pandas' running variance drifts on flat stretches); both
+    # lose relative precision when the deviation is a millionth of the price
+    if period > 1:
+        exact = np.lib.stride_tricks.sliding_window_view(values, period).std(axis=1, ddof=1)
+        np.testing.assert_allclose(indicators.rolling_std(values, period)[period - 1:], exact,
+                                   rtol=1e-6, atol=1e-6)
+    else:
+        assert np.isnan(indicators.rolling_std(values, period)).all()
+    np.testing.assert_array_equal(indicators.rolling_max(values, period), close.rolling(period).max())
+    np.testing.assert_array_equal(indicators.rolling_min(values, period), close.rolling(period).min())
+
+    # Windows of one repeated value are exact
+    if period <= 50:
+        flat = slice(1000 + period - 1, 1050)
+        assert (indicators.sma(values, period)[flat] == values[flat]).all()
+        if period > 1:
+            assert (indicators.rolling_std(values, period)[flat] == 0).all()
+
+
+def test_long_series_keeps_precision(backend):
+    values = 1e4 + np.cumsum(np.random.default_rng(0).normal(0, 0.01, 200_000))
+    exact = np.lib.stride_tricks.sliding_window_view(values, 30)
+    np.testing.assert_allclose(indicators.sma(values, 30)[29:], exact.mean(axis=1), rtol=1e-12)
+    np.testing.assert_allclose(indicators.rolling_var(values, 30)[29:], exact.var(axis=1, ddof=1), rtol=1e-5)
+
+
+@pytest.mark.parametrize('period', [2, 12, 26])
+def test_ema_matches_pandas(close, backend, period):
+    expected = close.iloc[:2000].ewm(span=period, adjust=False).mean()
+    np.testing.assert_allclose(indicators.ema(close.to_numpy()[:2000], period), expected, rtol=1e-12)
+
+    # Leading NaNs are skipped, later NaNs carry the previous value
+    padded = np.concatenate([[np.nan] * 5, close.to_numpy()])
+    result = indicators.ema(padded, period)
+    assert np.isnan(result[:5]).all()
+    np.testing.assert_allclose(result[5:2005], expected, rtol=1e-12)
+    assert result[2005] == pytest.approx(result[2004], rel=1e-12)
+
+
+def test_rsi_matches_pandas_and_streaming(close, backend):
+    np.testing.assert_allclose(indicators.rsi(close.to_numpy(), 14), _pandas_rsi(close, 14), rtol=1e-9)
+
+    prices = close.iloc[:1900]
+    streaming = RollingRSI(14, method='wilder')
+    expected = [streaming.update(x) for x in prices]
+    np.testing.assert_allclose(indicators.rsi(prices.to_numpy(), 14, method='wilder'), expected, rtol=1e-9)
+
+    with pytest.raises(ValueError):
+        indicators.rsi(prices.to_numpy(), 14, method='ewm')
+
+
+def test_atr_macd_vwap_donchian(backend):
+    df = make_ohlcv(1000, seed=5)
+    high, low, close, volume = (df[col].to_numpy(dtype=float) for col in ['high', 'low', 'close', 'volume'])
+
+    prev_close = df['close'].shift()
+    tr = pd.concat([df['high'] - df['low'], (df['high'] - prev_close).abs(),
+                    (df['low'] - prev_close).abs()], axis=1).max(axis=1)
+    np.testing.assert_allclose(indicators.true_range(high, low, close), tr)
+    np.testing.assert_allclose(indicators.atr(high, low, close, 14, method='simple'), tr.rolling(14).mean())
+    atr = indicators.atr(high, low, close, 14)
+    assert np.isnan(atr[:13]).all()
+    assert atr[13] == pytest.approx(tr.iloc[:14].mean())
+    assert atr[14] == pytest.approx((atr[13] * 13 + tr.iloc[14]) / 14)
+
+    line, signal, histogram = indicators.macd(close)
+    fast = df['close'].ewm(span=12, adjust=False).mean()
+    slow = df['close'].ewm(span=26, adjust=False).mean()
+    np.testing.assert_allclose(line, fast - slow, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(signal, (fast - slow).ewm(span=9, adjust=False).mean(), rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(histogram, line - signal)
+
+    typical = (df['high'] + df['low'] + df['close']) / 3
+    np.testing.assert_allclose(indicators.vwap(high, low, close, volume),
+                               (typical * df['volume']).cumsum() / df['volume'].cumsum())
+    np.testing.assert_allclose(indicators.vwap(high, low, close, volume, 20),
+                               (typical * df['volume']).rolling(20).sum() / df['volume'].rolling(20).sum())
+
+    upper, middle, lower = indicators.donchian(high, low, 20)
+    np.testing.assert_array_equal(upper, df['high'].rolling(20).max())
+    np.testing.assert_array_equal(lower, df['low'].rolling(20).min())
+    np.testing.assert_allclose(middle, (upper + lower) / 2)
+
+
+def test_two_dimensional_inputs_match_columns(backend):
+    frames = [make_ohlcv(800, seed=seed) for seed in range(6)]
+    close = np.column_stack([df['close'] for df in frames])
+    high = np.column_stack([df['high'] for df in frames])
+    low = np.column_stack([df['low'] for df in frames])
+
+    for func, args in [(indicators.sma, (20,)), (indicators.rolling_std, (20,)), (indicators.ema, (12,)),
+                       (indicators.rsi, (14,)), (indicators.rolling_max, (20,))]:
+        result = func(close, *args)
+        assert result.shape == close.shape
+        for col in range(close.shape[1]):
+            np.testing.assert_array_equal(result[:, col], func(close[:, col], *args))
+
+    atr = indicators.atr(high, low, close)
+    for col in range(close.shape[1]):
+        np.testing.assert_array_equal(atr[:, col], indicators.atr(high[:, col], low[:, col], close[:, col]))
+
+    middle, upper, lower = indicators.bollinger_bands(close, 20, 2)
+    np.testing.assert_allclose(upper - middle, 2 * indicators.rolling_std(close, 20))
+
+    with pytest.raises(ValueError):
+        indicators.sma(close[None], 20)
+    with pytest.raises(ValueError):
+        indicators.sma(close, 0)
+
+
+def test_short_series_is_all_nan(backend):
+    assert np.isnan(indicators.sma([1.0, 2.0], 5)).all()
+    assert np.isnan(indicators.rolling_max([1.0, 2.0], 5)).all()
+    assert np.isnan(indicators.rsi([1.0, 2.0, 3.0], 14)).all()
+
+
+def test_analyzer_adds_indicator_columns(ohlcv):
+    analyzer = DataAnalyzer(db=object())
+    df = ohlcv.copy()
+    for method in ['add_atr', 'add_macd', 'add_vwap', 'add_donchian']:
+        df = getattr(analyzer, method)(df)
+
+    expected = ['atr_14', 'macd', 'macd_signal', 'macd_hist', 'vwap', 'dc_upper_20', 'dc_middle_20', 'dc_lower_20']
+    assert set(expected) <= set(df.columns)
+    assert df['atr_14'].iloc[13:].notna().all()
+    assert (df['dc_upper_20'].dropna() >= df['dc_lower_20'].dropna()).all()
+
+
+def test_window_families_match_single_windows(close):
+    values = close.to_numpy()
+    periods = [1, 2, 5, 20, 20, 73]
+    mean, std = indicators.bollinger_windows(values, periods)
+    assert mean.shape == std.shape == (len(values), len(periods))
+    np.testing.assert_array_equal(indicators.sma_windows(values, periods), mean)
+
+    rsi = indicators.rsi_windows(values, periods[1:])
+    for col, period in enumerate(periods):
+        np.testing.assert_allclose(mean[:, col], indicators.sma(values, period), rtol=1e-12)
+        np.testing.assert_allclose(std[:, col], indicators.rolling_std(values, period), rtol=1e-6, atol=1e-6)
+        if period > 1:
+            np.testing.assert_allclose(rsi[:, col - 1], indicators.rsi(values, period), rtol=1e-9)
+            assert (std[1000 + period - 1:1050, col] == 0).all()
+
+    with pytest.raises(ValueError):
+        indicators.sma_windows(values[:, None], [5])
+
+
+def test_threshold_signals_broadcast():
+    values = np.array([[10.0, 50.0], [50.0, 90.0], [np.nan, 25.0]])
+    signals = indicators.threshold_signals(values, np.array([30, 60]), np.array([70, 80]))
+    np.testing.assert_array_equal(signals, [[1, 1], [0, -1], [0, 1]])
+    assert signals.dtype == np.int8
+
+
+def test_near_ties_do_not_depend_on_rounding():
+    # Cent prices around $5: equal averages and RSI at a threshold are common
+    values = np.round(make_ohlcv(5000, seed=3)['close'].to_numpy() / 20, 2)
+    short, long = indicators.sma(values, 5), indicators.sma(values, 20)
+    rsi = indicators.rsi(values, 14)
+    signals = indicators.crossover_signals(values, short, long, 5, 20)
+    rsi_signals = indicators.rsi_signals(values, rsi, 14, 40, 60)
+
+    # Rounding noise far below a tick flips plain comparisons but not the signals
+    for nudge in [1 + 1e-12, 1 - 1e-12]:
+        assert ((short * nudge > long) != (short > long)).any()
+        np.testing.assert_array_equal(indicators.crossover_signals(values, short * nudge, long, 5, 20), signals)
+        assert ((rsi * nudge < 40) != (rsi < 40)).any() or ((rsi * nudge > 60) != (rsi > 60)).any()
+        np.testing.assert_array_equal(indicators.rsi_signals(values, rsi * nudge, 14, 40, 60), rsi_signals)
+
+
+def test_exact_percent_b_order_matches_floats():
+    values = np.round(make_ohlcv(2000, seed=5)['close'].to_numpy() / 20, 2)
+    middle, upper, lower = indicators.bollinger_bands(values, 10, 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent_b = (values - lower) / (upper - lower)
+
+    # Away from a cutoff the exact order is the plain comparison
+    for row in range(9, len(values), 7):
+        window = values[row - 9:row + 1].tolist()
+        for cutoff in [0.2, 0.8]:
+            if abs(percent_b[row] - cutoff) > 1e-6:
+                assert indicators.exact_percent_b_order(window, 2, cutoff) == np.sign(percent_b[row] - cutoff)
+
+    signals = indicators.percent_b_signals(values, percent_b, 10, 2)
+    nudged = indicators.percent_b_signals(values, percent_b * (1 + 1e-7), 10, 2)
+    np.testing.assert_array_equal(nudged, signals)
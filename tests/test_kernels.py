@@ -0,0 +1,105 @@
+"""Tests for the compiled simulation kernel with intrabar stops"""
+
+import numpy as np
+import pytest
+
+from backtesting.engine import Backtester
+from backtesting.kernels import simulate_with_stops
+from backtesting.vectorized import simulate_long_only
+from strategies.bollinger_bands import BollingerBands
+from strategies.moving_average import MovingAverageCrossover
+
+
+def _bars(close, high=None, low=None, open_=None):
+    close = np.asarray(close, dtype=float)
+    return (
+        close if open_ is None else np.asarray(open_, dtype=float),
+        close if high is None else np.asarray(high, dtype=float),
+        close if low is None else np.asarray(low, dtype=float),
+        close,
+    )
+
+
+@pytest.mark.parametrize('strategy', [MovingAverageCrossover(5, 20), BollingerBands(10, 2)],
+                         ids=lambda s: s.name)
+def test_kernel_without_stops_matches_vectorized(ohlcv, strategy):
+    signal = strategy.generate_signals(ohlcv)['signal'].to_numpy(dtype=float)
+    close = ohlcv['close'].to_numpy()
+
+    expected = simulate_long_only(close, signal, 10000, 0.001, 0.001)
+    sim = simulate_with_stops(ohlcv['open'], ohlcv['high'], ohlcv['low'], close,
+                              signal, 10000, 0.001, 0.001)
+
+    np.testing.assert_array_equal(sim['portfolio_value'], expected['portfolio_value'])
+    for key in ['entry_idx', 'exit_idx', 'entry_price', 'exit_price', 'shares', 'exit_commission']:
+        np.testing.assert_array_equal(sim[key], expected[key])
+    assert (sim['exit_reason'] == 0).all()
+
+
+def test_stop_loss_fills_at_stop_or_gap_open():
+    signal = np.full(6, np.nan)
+    signal[0] = 1
+    signal[3] = 1
+
+    # Bar 1 trades through the 10% stop, bar 5 gaps below it
+    open_, high, low, close = _bars(
+        close=[100, 95, 95, 100, 100, 80],
+        low=[100, 85, 95, 100, 100, 80],
+        open_=[100, 99, 95, 100, 100, 80],
+    )
+    sim = simulate_with_stops(open_, high, low, close, signal, 1000, 0, 0, stop_loss=0.1)
+
+    np.testing.assert_array_equal(sim['exit_idx'], [1, 5])
+    np.testing.assert_allclose(sim['exit_price'], [90, 80])
+    np.testing.assert_array_equal(sim['exit_reason'], [1, 1])
+    assert sim['portfolio_value'][-1] == pytest.approx(1000 * 0.9 * 0.8)
+
+
+def test_no_reentry_until_signal_leaves_buy():
+    # Signal stays 1 through the stop on bar 1, drops to 0 on bar 3, buys again on bar 4
+    signal = np.array([1, 1, 1, 0, 1, 1], dtype=float)
+    open_, high, low, close = _bars(close=[100, 95, 96, 97, 98, 99],
+                                    low=[100, 85, 96, 97, 98, 99],
+                                    open_=[100, 99, 96, 97, 98, 99])
+    sim = simulate_with_stops(open_, high, low, close, signal, 1000, 0, 0, stop_loss=0.1)
+
+    np.testing.assert_array_equal(sim['entry_idx'], [0, 4])
+    np.testing.assert_array_equal(sim['exit_idx'], [1])
+    assert sim['portfolio_value'][3] == pytest.approx(900)
+
+
+def test_take_profit_and_trailing_stop():
+    signal = np.full(5, np.nan)
+    signal[0] = 1
+
+    open_, high, low, close = _bars(close=[100, 110, 120, 115, 130],
+                                    high=[100, 112, 125, 121, 135],
+                                    open_=[100, 100, 110, 120, 115])
+
+    sim = simulate_with_stops(open_, high, low, close, signal, 1000, 0, 0, take_profit=0.2)
+    np.testing.assert_array_equal(sim['exit_idx'], [2])
+    np.testing.assert_allclose(sim['exit_price'], [120])
+    np.testing.assert_array_equal(sim['exit_reason'], [2])
+
+    # Peak high 125 on bar 2, a 5% trail exits at 118.75 on bar 3
+    sim = simulate_with_stops(open_, high, low, close, signal, 1000, 0, 0, trailing_stop=0.05)
+    np.testing.assert_array_equal(sim['exit_idx'], [3])
+    np.testing.assert_allclose(sim['exit_price'], [118.75])
+    np.testing.assert_array_equal(sim['exit_reason'], [3])
+
+
+def test_backtester_uses_kernel_for_stops(ohlcv):
+    strategy = MovingAverageCrossover(5, 20)
+    plain = Backtester(commission=0.001, slippage=0.001).run_backtest(strategy, ohlcv)
+    stopped = Backtester(commission=0.001, slippage=0.001, stop_loss=0.02,
+                         trailing_stop=0.03).run_backtest(strategy, ohlcv)
+
+    reasons = {trade['exit_reason'] for trade in stopped['trades']}
+    assert reasons & {'stop_loss', 'trailing_stop'}
+    assert len(stopped['equity_curve']) == len(plain['equity_curve'])
+    assert stopped['metrics']['total_trades'] == len(stopped['trades'])
+
+    # Every stop exit is at or below its protective level
+    for trade in stopped['trades']:
+        if trade['exit_reason'] == 'stop_loss':
+            assert trade['exit_price'] <= trade['entry_price'] * 0.98
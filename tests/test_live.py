@@ -0,0 +1,153 @@
+"""Tests for the paper-trading runtime"""
+
+import asyncio
+import time
+
+import pandas as pd
+import pytest
+
+from backtesting.engine import Backtester
+from database.models import DatabaseManager
+from live import LatencyHistogram, PaperTrader, ReplayFeed
+from strategies.bollinger_bands import BollingerBands
+from strategies.moving_average import MovingAverageCrossover
+from strategies.streaming import StreamingBollingerBands, StreamingMovingAverageCrossover
+from tests.conftest import make_ohlcv
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseManager(f"sqlite:///{tmp_path / 'paper.db'}")
+
+
+def test_paper_trades_match_backtest(db):
+    bars = {'SPY': make_ohlcv(400, seed=1, freq='min'), 'QQQ': make_ohlcv(400, seed=2, freq='min')}
+    for symbol, df in bars.items():
+        db.bulk_save_bars(symbol, df)
+
+    trader = PaperTrader(ReplayFeed(db, ['SPY', 'QQQ']), lambda symbol: StreamingBollingerBands(20, 2), db=db)
+    asyncio.run(trader.run())
+
+    for symbol, df in bars.items():
+        expected = Backtester().run_backtest(BollingerBands(20, 2), df)
+        trades = [trade for trade in trader.broker.trades if trade['symbol'] == symbol]
+        assert len(trades) == len(expected['trades'])
+        for trade, reference in zip(trades, expected['trades']):
+            assert trade['entry_time'] == reference['entry_time']
+            assert trade['exit_time'] == reference['exit_time']
+            assert trade['pnl'] == pytest.approx(reference['pnl'])
+        assert trader.broker.portfolio_value(symbol) == pytest.approx(
+            expected['equity_curve']['portfolio_value'].iloc[-1])
+
+    # Fills and final positions were persisted
+    fills = db.get_paper_fills('paper')
+    assert (fills['side'] == 'sell').sum() == len(trader.broker.trades)
+    positions = db.get_paper_positions('paper')
+    assert sorted(positions.index) == ['QQQ', 'SPY']
+    assert positions.loc['SPY', 'updated'] == bars['SPY'].index[-1]
+
+
+def test_stops_match_kernel():
+    df = make_ohlcv(500, seed=3)
+    backtester = Backtester(stop_loss=0.01, take_profit=0.02, trailing_stop=0.015)
+    expected = backtester.run_backtest(BollingerBands(20, 2), df)
+
+    trader = PaperTrader(ReplayFeed(None, ['SPY'], frames={'SPY': df}),
+                         lambda symbol: StreamingBollingerBands(20, 2), backtester=backtester)
+    asyncio.run(trader.run())
+
+    trades = trader.broker.trades
+    assert [trade['exit_reason'] for trade in trades] == [trade['exit_reason'] for trade in expected['trades']]
+    assert [trade['pnl'] for trade in trades] == pytest.approx([trade['pnl'] for trade in expected['trades']])
+
+
+def test_sustained_signal_waits_after_stop_like_kernel():
+    df = make_ohlcv(500, seed=3)
+    backtester = Backtester(stop_loss=0.01, trailing_stop=0.015)
+    expected = backtester.run_backtest(MovingAverageCrossover(5, 20), df)
+
+    trader = PaperTrader(ReplayFeed(None, ['SPY'], frames={'SPY': df}),
+                         lambda symbol: StreamingMovingAverageCrossover(5, 20), backtester=backtester)
+    asyncio.run(trader.run())
+
+    trades = trader.broker.trades
+    assert [trade['entry_time'] for trade in trades] == [trade['entry_time'] for trade in expected['trades']]
+    assert [trade['exit_reason'] for trade in trades] == [trade['exit_reason'] for trade in expected['trades']]
+
+
+def test_replay_is_time_ordered_and_paced():
+    frames = {
+        'A': make_ohlcv(20, seed=1, freq='min'),
+        'B': make_ohlcv(10, seed=2, freq='2min'),
+    }
+    feed = ReplayFeed(None, ['A', 'B'], frames=frames, speed=600)  # 10 minutes/second
+
+    async def collect():
+        return [bar async for bar in feed]
+
+    started = time.perf_counter()
+    bars = asyncio.run(collect())
+    elapsed = time.perf_counter() - started
+
+    assert len(bars) == 30
+    timestamps = [bar.timestamp for bar in bars]
+    assert timestamps == sorted(timestamps)
+    assert [bar.symbol for bar in bars[:3]] == ['A', 'B', 'A']
+    assert 19 * 60 / 600 * 0.9 <= elapsed < 19 * 60 / 600 + 1
+
+
+def test_latency_summary():
+    frames = {f'S{i}': make_ohlcv(50, seed=i, freq='min') for i in range(20)}
+    trader = PaperTrader(ReplayFeed(None, list(frames), frames=frames), lambda symbol: StreamingBollingerBands(20, 2))
+    asyncio.run(trader.run())
+
+    summary = trader.summary()
+    assert len(summary) == 20
+    assert (summary['bars'] == 50).all()
+    assert (summary['latency_max_us'] > 0).all()
+    assert isinstance(summary, pd.DataFrame)
+
+
+def test_replay_pages_from_database_in_order(db):
+    frames = {symbol: make_ohlcv(250, seed=seed, freq=freq)
+              for seed, (symbol, freq) in enumerate([('A', 'min'), ('B', '3min'), ('C', '7min')])}
+    for symbol, df in frames.items():
+        db.bulk_save_bars(symbol, df)
+
+    seen = []
+    stats = ReplayFeed(db, list(frames), page_size=16).run(lambda bar: seen.append((bar.timestamp, bar.symbol)))
+
+    expected = sorted((ts, symbol) for symbol, df in frames.items() for ts in df.index)
+    assert seen == expected
+    assert stats['events'] == 750
+    assert stats['latency']['count'] == 750
+    assert list(stats['symbols'].index) == ['A', 'B', 'C']
+
+
+def test_paced_replay_keeps_to_schedule():
+    frames = {'A': make_ohlcv(40, freq='min')}
+    feed = ReplayFeed(None, ['A'], frames=frames, speed=3000)  # 20ms per bar
+
+    started = time.perf_counter()
+    stats = feed.run(lambda bar: None)
+    elapsed = time.perf_counter() - started
+
+    assert 39 * 0.02 <= elapsed < 39 * 0.02 + 0.5
+    assert stats['lag']['count'] == 40
+    assert stats['lag']['p50_us'] < 1000
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for value in range(1, 10_001):
+        histogram.record(value * 1000)
+
+    assert histogram.count == 10_000
+    assert histogram.max == 10_000_000
+    assert histogram.percentile(50) == pytest.approx(5_000_000, rel=0.07)
+    assert histogram.percentile(99) == pytest.approx(9_900_000, rel=0.07)
+    assert histogram.percentile(100) == 10_000_000
+
+    other = LatencyHistogram()
+    other.record(50_000_000)
+    assert histogram.merge(other).summary()['max_us'] == 50_000
@@ -0,0 +1,72 @@
+"""Tests for the streaming metrics accumulator"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.engine import Backtester
+from backtesting.metrics import MetricsAccumulator
+from strategies.bollinger_bands import BollingerBands
+from tests.conftest import make_ohlcv
+
+
+def _reference_metrics(values, trades, initial_capital):
+    """Post-hoc pandas calculation the accumulator replaces"""
+    equity = pd.Series(values)
+    cummax = equity.cummax()
+    returns = equity.pct_change()
+    wins = [t for t in trades if t['return_pct'] > 0]
+    losses = [t for t in trades if t['return_pct'] <= 0]
+    return {
+        'total_return': (equity.iloc[-1] - initial_capital) / initial_capital * 100,
+        'avg_win': np.mean([t['return_pct'] for t in wins]),
+        'avg_loss': np.mean([t['return_pct'] for t in losses]),
+        'profit_factor': sum(t['pnl'] for t in wins) / abs(sum(t['pnl'] for t in losses)),
+        'max_drawdown': ((equity - cummax) / cummax * 100).min(),
+        'sharpe_ratio': returns.mean() / returns.std() * np.sqrt(252),
+    }
+
+
+def test_accumulator_matches_pandas_calculation():
+    df = make_ohlcv(n_bars=3000)
+    result = Backtester().run_backtest(BollingerBands(10, 2), df, vectorized=True)
+    values = result['equity_curve']['portfolio_value'].to_numpy()
+
+    # Small blocks so several folds happen
+    accumulator = MetricsAccumulator(10000, block_size=256)
+    for trade in result['trades']:
+        accumulator.add_trade(trade['return_pct'], trade['pnl'])
+    accumulator.update_many(values)
+    metrics = accumulator.metrics()
+
+    for key, expected in _reference_metrics(values, result['trades'], 10000).items():
+        assert metrics[key] == pytest.approx(expected, rel=1e-9), key
+
+
+def test_bar_by_bar_and_array_updates_are_identical():
+    values = 10000 * np.exp(np.cumsum(np.random.default_rng(1).normal(0, 0.01, 1000)))
+
+    one_by_one = MetricsAccumulator(10000, block_size=64)
+    chunked = MetricsAccumulator(10000, block_size=64)
+    one_by_one.add_trade(1.0, 10.0)
+    one_by_one.add_trade(-0.5, -5.0)
+    chunked.add_trades([1.0, -0.5], [10.0, -5.0])
+
+    for value in values:
+        one_by_one.update(value)
+    for chunk in np.array_split(values, 7):
+        chunked.update_many(chunk)
+
+    assert one_by_one.metrics() == chunked.metrics()
+
+
+@pytest.mark.parametrize('vectorized', [False, True])
+def test_metrics_without_equity_curve(ohlcv, vectorized):
+    backtester = Backtester()
+    full = backtester.run_backtest(BollingerBands(10, 2), ohlcv, vectorized=vectorized)
+    lean = backtester.run_backtest(BollingerBands(10, 2), ohlcv, vectorized=vectorized,
+                                   keep_equity_curve=False)
+
+    assert lean['equity_curve'] is None
+    assert lean['trades'] == full['trades']
+    assert lean['metrics'] == full['metrics']
@@ -0,0 +1,68 @@
+"""Tests for Monte Carlo resampling"""
+
+import numpy as np
+import pytest
+
+from backtesting.engine import Backtester
+from backtesting.monte_carlo import MonteCarlo, path_metrics, resample_indices, trade_returns
+from strategies.bollinger_bands import BollingerBands
+
+
+def test_resample_indices_shapes_and_rules():
+    rng = np.random.default_rng(0)
+
+    shuffled = resample_indices(rng, 50, 20, 'shuffle')
+    assert (np.sort(shuffled, axis=1) == np.arange(20)).all()
+
+    blocks = resample_indices(rng, 50, 23, 'block', block_size=5)
+    assert blocks.shape == (50, 23)
+    steps = np.diff(blocks[:, :5], axis=1) % 23
+    assert (steps == 1).all()  # each block is consecutive (circular)
+
+    assert resample_indices(rng, 10, 7, 'bootstrap').max() < 7
+    with pytest.raises(ValueError):
+        resample_indices(rng, 1, 5, 'jackknife')
+
+
+def test_path_metrics_match_engine_conventions():
+    returns = np.array([[0.1, -0.2, 0.05]])
+    metrics = path_metrics(returns, 252)
+
+    assert metrics['total_return'][0] == pytest.approx((1.1 * 0.8 * 1.05 - 1) * 100)
+    assert metrics['max_drawdown'][0] == pytest.approx(-20.0)
+
+
+def test_trade_returns_from_backtest(ohlcv):
+    backtester = Backtester(commission=0.001, slippage=0.001)
+    result = backtester.run_backtest(BollingerBands(10, 2), ohlcv)
+
+    returns = trade_returns(result['trades'])
+    assert len(returns) == len(result['trades'])
+    np.testing.assert_allclose(returns, trade_returns(list(result['trades'])))
+
+    # Compounding the trade returns gives (almost) the final portfolio value;
+    # only the entry commission isn't part of the capital base
+    growth = np.prod(1 + returns) * backtester.initial_capital
+    assert growth == pytest.approx(result['metrics']['final_portfolio_value'], rel=0.01)
+
+
+def test_shuffle_keeps_total_return_and_is_reproducible(ohlcv):
+    result = Backtester().run_backtest(BollingerBands(10, 2), ohlcv)
+
+    shuffled = MonteCarlo(2000, method='shuffle', seed=7).run_trades(result['trades'])
+    assert np.allclose(shuffled['samples']['total_return'], shuffled['observed']['total_return'])
+    assert (shuffled['samples']['max_drawdown'] <= 0).all()
+
+    first = MonteCarlo(3000, seed=1, batch_size=500).run_trades(result['trades'])
+    second = MonteCarlo(3000, seed=1, batch_size=500, max_workers=2).run_trades(result['trades'])
+    assert first['samples'].equals(second['samples'])
+    assert list(first['summary'].index) == ['mean', 'std', 'p5', 'p25', 'p50', 'p75', 'p95']
+    assert 0 <= first['probability_of_loss'] <= 1
+
+
+def test_block_bootstrap_on_equity_curve(ohlcv):
+    result = Backtester().run_backtest(BollingerBands(10, 2), ohlcv, vectorized=True)
+
+    mc = MonteCarlo(1000, method='block', block_size=10, seed=3).run_equity(result['equity_curve'])
+    assert len(mc['samples']) == 1000
+    assert mc['summary'].loc['p5', 'total_return'] <= mc['summary'].loc['p95', 'total_return']
@@ -0,0 +1,66 @@
+"""Tests for run profiling and cross-worker aggregation"""
+
+import pytest
+
+from backtesting.engine import Backtester
+from backtesting.profiling import Profiler, format_report
+from backtesting.sweep import ParameterSweep, parameter_grid
+from backtesting.walk_forward import WalkForward
+from strategies.bollinger_bands import BollingerBands
+from tests.conftest import make_ohlcv
+from utils.indicator_cache import indicator_cache
+
+
+@pytest.mark.parametrize('vectorized', [False, True])
+def test_run_backtest_reports_stages_and_counters(ohlcv, vectorized):
+    indicator_cache.clear()
+    backtester = Backtester()
+
+    plain = backtester.run_backtest(BollingerBands(10, 2), ohlcv, vectorized=vectorized)
+    profiled = backtester.run_backtest(BollingerBands(10, 2), ohlcv, vectorized=vectorized, profile=True)
+
+    assert 'profile' not in plain
+    assert profiled['metrics'] == plain['metrics']
+
+    report = profiled['profile']
+    assert set(report['timings']) == {'signals', 'simulation', 'metrics'}
+    assert report['counters']['bars'] == len(ohlcv)
+    assert report['counters']['trades'] == len(profiled['trades'])
+    assert report['counters']['cache_hits'] == 2  # mean and std computed by the first run
+    assert report['bottleneck'] in report['timings']
+    assert 'simulation' in format_report(report)
+
+
+def test_shared_profiler_with_cprofile_and_memory(ohlcv):
+    profiler = Profiler(cprofile=True, memory=True)
+    with profiler.stage('data_load'):
+        df = ohlcv.copy()
+
+    result = Backtester().run_backtest(BollingerBands(10, 2), df, profile=profiler)
+
+    report = result['profile']
+    assert 'data_load' in report['timings']
+    assert 'generate_signals' in report['profile']
+    assert report['memory_peak'] > 0
+
+
+def test_sweep_merges_worker_reports(ohlcv):
+    params = parameter_grid({'period': [10, 20], 'std_dev': [2, 3]})
+    sweep = ParameterSweep(BollingerBands, max_workers=2, profile=True)
+    ranked = sweep.run(ohlcv, params)
+
+    assert sweep.profile['runs'] == len(params)
+    assert 1 <= len(sweep.profile['processes']) <= 2
+    assert sweep.profile['counters']['bars'] == len(ohlcv) * len(params)
+    assert sweep.profile['counters']['trades'] == ranked['total_trades'].sum()
+
+
+def test_walk_forward_profile():
+    params = parameter_grid({'period': [10, 20], 'std_dev': [2]})
+    runner = WalkForward(BollingerBands, params, train_size=200, test_size=100, max_workers=1, profile=True)
+    result = runner.run(make_ohlcv(n_bars=600))
+
+    report = result['profile']
+    assert report['runs'] == 1 + len(result['windows'])
+    assert {'signals', 'simulation', 'metrics', 'stitch'} <= set(report['timings'])
+    assert report['counters']['trades'] == len(result['trades'])
@@ -0,0 +1,155 @@
+"""Tests for materialized higher-timeframe bars"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.providers.caching import CachingProvider
+from database.models import DatabaseManager
+from database.resample import BarAggregator, Resampler, bucket_start, resample_bars
+from tests.conftest import make_ohlcv
+from tests.test_caching_provider import FakeProvider
+
+AGG = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+RULES = {'5m': '5min', '15m': '15min', '1h': '1h', '1d': '1D'}
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseManager(f"sqlite:///{tmp_path / 'bars.db'}")
+
+
+def minute_bars(n_bars=3000, seed=0):
+    """Minute bars with a few holes so some buckets are empty or partial"""
+    bars = make_ohlcv(n_bars, seed=seed, freq='min')
+    keep = np.ones(n_bars, dtype=bool)
+    keep[100:170] = False
+    keep[1500:1503] = False
+    return bars[keep]
+
+
+def expected(bars, interval):
+    return bars.resample(RULES[interval]).agg(AGG).dropna()
+
+
+@pytest.mark.parametrize('interval', ['5m', '15m', '1h', '1d'])
+def test_resample_bars_matches_pandas(interval):
+    bars = minute_bars()
+    result = resample_bars(bars, interval)
+    pd.testing.assert_frame_equal(result, expected(bars, interval), check_freq=False, check_names=False,
+                                  check_dtype=False)
+
+
+def test_aggregator_chunking_does_not_change_bars():
+    bars = minute_bars()
+    aggregator = BarAggregator('15m')
+    parts = [aggregator.push(bars.iloc[i:i + 37]) for i in range(0, len(bars), 37)]
+    chunked = pd.concat(parts + [aggregator.flush()])
+    pd.testing.assert_frame_equal(chunked, resample_bars(bars, '15m'))
+
+
+def test_bucket_offset():
+    assert bucket_start('2024-01-02 10:29', '1h') == pd.Timestamp('2024-01-02 10:00')
+    assert bucket_start('2024-01-02 10:29', '1h', offset='30min') == pd.Timestamp('2024-01-02 09:30')
+    assert bucket_start('2024-01-02 10:29', '1d') == pd.Timestamp('2024-01-02')
+
+
+def test_incremental_update_matches_full_rebuild(db):
+    bars = minute_bars()
+    resampler = Resampler(db, chunksize=250)
+
+    # Minute bars arrive in pieces that end mid-bucket
+    for start, end in [(0, 1007), (1007, 1913), (1913, len(bars))]:
+        db.bulk_save_bars('SPY', bars.iloc[start:end])
+        resampler.update('SPY')
+
+    for interval in resampler.intervals:
+        stored = db.get_bars_df('SPY', interval=interval)
+        pd.testing.assert_frame_equal(stored, expected(bars, interval), check_freq=False, check_names=False,
+                                      check_dtype=False, check_index_type=False)
+
+
+def test_update_restarts_at_last_bucket(db):
+    bars = minute_bars()
+    db.bulk_save_bars('SPY', bars.iloc[:1000])
+    resampler = Resampler(db, intervals=['1h'])
+    resampler.update('SPY')
+
+    db.bulk_save_bars('SPY', bars.iloc[1000:1100])
+    written = resampler.update('SPY')
+
+    # Only the partial last hour and the new ones are rewritten
+    assert written['1h'] == len(expected(bars.iloc[:1100], '1h').loc[bars.index[999].floor('h'):])
+
+
+def test_backfill_with_start(db):
+    bars = minute_bars()
+    db.bulk_save_bars('SPY', bars.iloc[1000:])
+    resampler = Resampler(db, intervals=['5m'])
+    resampler.update('SPY')
+
+    db.bulk_save_bars('SPY', bars.iloc[:1000])
+    resampler.update('SPY', start=bars.index[0])
+
+    stored = db.get_bars_df('SPY', interval='5m')
+    pd.testing.assert_frame_equal(stored, expected(bars, '5m'), check_freq=False, check_names=False,
+                                  check_dtype=False, check_index_type=False)
+
+
+def test_bulk_save_update_overwrites(db):
+    bars = make_ohlcv(10, freq='5min')
+    db.bulk_save_bars('SPY', bars, interval='5m')
+
+    changed = bars.copy()
+    changed['close'] += 1
+    assert db.bulk_save_bars('SPY', changed, interval='5m')['inserted'] == 0
+    assert db.bulk_save_bars('SPY', changed, interval='5m', on_conflict='update')['inserted'] == 10
+    np.testing.assert_allclose(db.get_bars_df('SPY', interval='5m')['close'], changed['close'])
+
+    with pytest.raises(ValueError):
+        db.bulk_save_bars('SPY', bars, on_conflict='replace')
+
+
+def test_bulk_save_update_on_other_databases(db, monkeypatch):
+    # Other dialects take the delete-then-insert path; run it on SQLite
+    monkeypatch.setattr(db.engine.dialect, 'name', 'generic')
+    bars = make_ohlcv(2500, freq='5min')
+    db.bulk_save_bars('SPY', bars.iloc[:2000], interval='5m', on_conflict='update')
+
+    changed = bars.copy()
+    changed['close'] += 1
+    assert db.bulk_save_bars('SPY', changed, interval='5m', on_conflict='update') == {'inserted': 2500, 'skipped': 0}
+    stored = db.get_bars_df('SPY', interval='5m')
+    assert len(stored) == 2500
+    np.testing.assert_allclose(stored['close'], changed['close'])
+
+
+def test_postgresql_upsert_statement():
+    from sqlalchemy.dialects import postgresql
+
+    from database.models import _bar_upsert_statement
+
+    sql = str(_bar_upsert_statement('postgresql').compile(dialect=postgresql.dialect()))
+    assert 'ON CONFLICT (symbol, interval, timestamp) DO UPDATE SET' in sql
+    assert 'close = excluded.close' in sql
+    assert _bar_upsert_statement('mysql') is None
+
+
+def test_caching_provider_serves_higher_timeframes_from_minutes(db):
+    bars = make_ohlcv(3 * 24 * 60, freq='min')
+    fake = FakeProvider(bars)
+    provider = CachingProvider(fake, db, resampler=Resampler(db))
+
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 3)
+    hourly = provider.get_bars('SPY', start, end, interval='1h')
+
+    # Only minute bars were downloaded
+    assert [call[3] for call in fake.calls] == ['1m']
+    assert len(hourly) == 48
+    pd.testing.assert_frame_equal(hourly, expected(bars[bars.index < end], '1h'), check_freq=False,
+                                  check_names=False, check_dtype=False, check_index_type=False)
+
+    provider.get_bars('SPY', start, end, interval='1d')
+    assert len(fake.calls) == 1
@@ -0,0 +1,188 @@
+"""Tests for the on-disk backtest result store"""
+
+import importlib
+import os
+import pickle
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.engine import Backtester
+from backtesting.result_store import ResultStore, data_fingerprint
+from strategies.bollinger_bands import BollingerBands
+from strategies.moving_average import MovingAverageCrossover
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(tmp_path / 'results')
+
+
+def _assert_same_result(cached, fresh):
+    assert cached['strategy_name'] == fresh['strategy_name']
+    assert cached['metrics'] == fresh['metrics']
+    assert cached['trades'] == fresh['trades']
+    pd.testing.assert_frame_equal(cached['equity_curve'], fresh['equity_curve'])
+
+
+@pytest.mark.parametrize('stops', [False, True])
+def test_second_run_is_loaded_from_disk(ohlcv, store, stops, monkeypatch):
+    settings = {'stop_loss': 0.03, 'trailing_stop': 0.05} if stops else {}
+    fresh = Backtester(**settings).run_backtest(BollingerBands(10, 2), ohlcv)
+
+    backtester = Backtester(result_store=store, **settings)
+    first = backtester.run_backtest(BollingerBands(10, 2), ohlcv)
+    _assert_same_result(first, fresh)
+    assert store.stats()['entries'] == 1
+
+    # A new store on the same directory (another script) serves the run without simulating
+    monkeypatch.setattr(BollingerBands, 'generate_signals', lambda self, df: pytest.fail('simulated again'))
+    reopened = ResultStore(store.root)
+    cached = Backtester(result_store=reopened, **settings).run_backtest(BollingerBands(10, 2), ohlcv.copy())
+    _assert_same_result(cached, fresh)
+    assert reopened.stats()['hits'] == 1
+    if stops:
+        assert cached['trades'][0]['exit_reason'] == fresh['trades'][0]['exit_reason']
+
+
+def test_key_changes_with_params_settings_and_data(ohlcv, store):
+    backtester = Backtester(result_store=store)
+    base = store.key(BollingerBands(10, 2), backtester, ohlcv)
+
+    assert store.key(BollingerBands(10, 2), Backtester(), ohlcv.copy()) == base
+    assert store.key(BollingerBands(10, 3), backtester, ohlcv) != base
+    assert store.key(MovingAverageCrossover(10, 2), backtester, ohlcv) != base
+    assert store.key(BollingerBands(10, 2), Backtester(commission=0.002), ohlcv) != base
+
+    changed = ohlcv.copy()
+    changed.iloc[100, changed.columns.get_loc('close')] += 0.01
+    assert data_fingerprint(changed) != data_fingerprint(ohlcv)
+    assert store.key(BollingerBands(10, 2), backtester, changed) != base
+    assert data_fingerprint(ohlcv.iloc[1:]) != data_fingerprint(ohlcv)
+
+
+def test_key_covers_non_scalar_params(ohlcv, store):
+    backtester = Backtester()
+
+    def keyed(**params):
+        strategy = BollingerBands(10, 2)
+        vars(strategy).update(params)
+        return store.key(strategy, backtester, ohlcv)
+
+    weights = np.linspace(0, 1, 5000)
+    changed = weights.copy()
+    changed[2500] += 1e-9
+    assert keyed(weights=weights) == keyed(weights=weights.copy())
+    assert keyed(weights=weights) != keyed(weights=changed)
+    assert keyed(weights=weights) != keyed()
+    assert keyed(levels=[0.2, 0.8]) != keyed(levels=[0.2, 0.9])
+    assert keyed(mask=pd.Series([1.0, 2.0])) != keyed(mask=pd.Series([1.0, 3.0]))
+
+    # Values that can only be told apart by identity are refused, not dropped
+    with pytest.raises(TypeError, match='filter'):
+        keyed(filter=lambda df: df)
+    with pytest.raises(TypeError, match='helper'):
+        keyed(helper=object())
+
+
+def test_key_changes_with_strategy_code(ohlcv, store, tmp_path, monkeypatch):
+    source = (
+        "from strategies.bollinger_bands import BollingerBands\n\n"
+        "class EditedBands(BollingerBands):\n"
+        "    def generate_signals(self, df):\n"
+        "        return super().generate_signals(df)\n"
+    )
+    (tmp_path / 'edited_strategy.py').write_text(source)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module('edited_strategy')
+    try:
+        base = store.key(module.EditedBands(10, 2), Backtester(), ohlcv)
+        assert store.key(module.EditedBands(10, 2), Backtester(), ohlcv) == base
+
+        # Same class name and parameters, different code
+        (tmp_path / 'edited_strategy.py').write_text(source.replace('return super()', 'df = df.copy()\n        return super()'))
+        module = importlib.reload(module)
+        assert store.key(module.EditedBands(10, 2), Backtester(), ohlcv) != base
+    finally:
+        sys.modules.pop('edited_strategy', None)
+
+
+def test_equity_curve_flag(ohlcv, store):
+    backtester = Backtester(result_store=store)
+    backtester.run_backtest(BollingerBands(10, 2), ohlcv, keep_equity_curve=False)
+
+    # Stored without an equity curve: a run that needs one simulates and replaces it
+    result = backtester.run_backtest(BollingerBands(10, 2), ohlcv)
+    assert store.stats()['hits'] == 0
+    assert len(result['equity_curve']) == len(ohlcv)
+
+    metrics_only = backtester.run_backtest(BollingerBands(10, 2), ohlcv, keep_equity_curve=False)
+    assert store.stats()['hits'] == 1
+    assert metrics_only['equity_curve'] is None
+    assert metrics_only['metrics'] == result['metrics']
+
+
+def test_profiled_runs_bypass_store(ohlcv, store):
+    backtester = Backtester(result_store=store)
+    backtester.run_backtest(BollingerBands(10, 2), ohlcv)
+
+    result = backtester.run_backtest(BollingerBands(10, 2), ohlcv, profile=True)
+    assert 'profile' in result
+    assert store.stats()['hits'] == 0
+
+
+def test_invalidate_and_missing_files(ohlcv, store):
+    backtester = Backtester(result_store=store)
+    for period in [10, 20]:
+        backtester.run_backtest(BollingerBands(period, 2), ohlcv)
+    backtester.run_backtest(MovingAverageCrossover(5, 20), ohlcv)
+    assert store.stats()['entries'] == 3
+
+    assert store.invalidate(strategy=MovingAverageCrossover) == 1
+    assert store.invalidate(fingerprint='unknown') == 0
+    assert set(store.entries()['strategy_name']) == {'BollingerBands_10_2', 'BollingerBands_20_2'}
+
+    # A deleted array file is treated as a miss and the entry dropped
+    key = store.key(BollingerBands(10, 2), backtester, ohlcv)
+    os.remove(store._path(key))
+    assert store.load(key) is None
+    assert store.stats()['entries'] == 1
+
+    store.clear()
+    assert store.stats() == {'hits': 0, 'misses': 0, 'evictions': 0, 'entries': 0, 'bytes': 0}
+    assert not any(name.endswith('.npz') for _, _, files in os.walk(store.root) for name in files)
+
+
+def test_least_recently_used_results_are_evicted(ohlcv, store):
+    backtester = Backtester(result_store=store)
+    periods = [10, 15, 20]
+    for period in periods:
+        backtester.run_backtest(BollingerBands(period, 2), ohlcv)
+    sizes = store.entries().set_index('strategy_name')['n_bytes']
+
+    # Touch the oldest entry, then shrink the bound to two results
+    backtester.run_backtest(BollingerBands(10, 2), ohlcv)
+    store.max_bytes = sizes.sum() - sizes.min()
+    backtester.run_backtest(BollingerBands(25, 2), ohlcv)
+
+    remaining = set(store.entries()['strategy_name'])
+    assert 'BollingerBands_25_2' in remaining
+    assert 'BollingerBands_15_2' not in remaining
+    assert store.stats()['bytes'] <= store.max_bytes
+    assert store.evictions >= 1
+
+
+def test_store_pickles_into_sweep_workers(ohlcv, store):
+    from backtesting.sweep import ParameterSweep, parameter_grid
+
+    params = parameter_grid({'period': [10, 20], 'std_dev': [2]})
+    backtester = Backtester(result_store=store)
+    assert pickle.loads(pickle.dumps(backtester)).result_store.root == store.root
+
+    first = ParameterSweep(BollingerBands, backtester, max_workers=2).run(ohlcv, params)
+    second = ParameterSweep(BollingerBands, backtester, max_workers=1).run(ohlcv, params)
+    assert store.stats()['entries'] == 2
+    assert store.hits == 2
+    np.testing.assert_array_equal(first['total_return'], second['total_return'])
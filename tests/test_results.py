@@ -0,0 +1,67 @@
+"""Tests for the array-backed trade log and lazy result dictionary"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from backtesting.engine import Backtester
+from backtesting.results import BacktestResult, TradeLog
+from strategies.bollinger_bands import BollingerBands
+
+
+def test_trade_log_behaves_like_list_of_dicts(ohlcv):
+    result = Backtester().run_backtest(BollingerBands(10, 2), ohlcv)
+    trades = result['trades']
+
+    assert isinstance(trades, TradeLog)
+    assert len(trades) > 1
+    first = trades[0]
+    assert set(first) == {'entry_time', 'exit_time', 'entry_price', 'exit_price',
+                          'shares', 'return_pct', 'pnl'}
+    assert isinstance(first['entry_time'], pd.Timestamp)
+    assert trades[:2] == [trades[0], trades[1]]
+    assert trades == list(trades)
+
+    df = trades.to_dataframe()
+    assert len(df) == len(trades)
+    np.testing.assert_array_equal(df['pnl'].to_numpy(), trades.column('pnl'))
+    assert df['exit_time'].iloc[-1] == trades[-1]['exit_time']
+
+
+def test_equity_curve_is_built_on_access(ohlcv):
+    result = Backtester().run_backtest(BollingerBands(10, 2), ohlcv, vectorized=True)
+
+    assert isinstance(result, BacktestResult)
+    assert 'equity_curve' in result
+    assert result._lazy  # not built yet
+    np.testing.assert_array_equal(result.equity_values, result['equity_curve']['portfolio_value'])
+    assert not result._lazy
+    assert list(result['equity_curve'].columns) == ['timestamp', 'portfolio_value']
+
+
+def test_result_pickles_with_pending_equity_curve(ohlcv):
+    result = Backtester().run_backtest(BollingerBands(10, 2), ohlcv, vectorized=True)
+
+    restored = pickle.loads(pickle.dumps(result))
+    assert restored['trades'] == result['trades']
+    pd.testing.assert_frame_equal(restored['equity_curve'], result['equity_curve'])
+
+
+def test_copies_and_merges_build_equity_curve(ohlcv):
+    backtester = Backtester()
+    expected = backtester.run_backtest(BollingerBands(10, 2), ohlcv, vectorized=True)['equity_curve']
+
+    copies = [
+        lambda result: dict(result),
+        lambda result: {**result},
+        lambda result: result.copy(),
+    ]
+    for make_copy in copies:
+        result = backtester.run_backtest(BollingerBands(10, 2), ohlcv, vectorized=True)
+        pd.testing.assert_frame_equal(make_copy(result)['equity_curve'], expected)
+
+    result = backtester.run_backtest(BollingerBands(10, 2), ohlcv, vectorized=True)
+    assert result.copy().equity_values is result.equity_values
+    pd.testing.assert_frame_equal(result.pop('equity_curve'), expected)
+    assert 'equity_curve' not in result
@@ -0,0 +1,118 @@
+"""Tests for shared-memory price arrays"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.engine import Backtester
+from backtesting.shared_data import SharedArrays, attach_arrays, attach_frame, attach_index, share_frame, shareable
+from backtesting.sweep import ParameterSweep, parameter_grid
+from backtesting.walk_forward import WalkForward
+from strategies.bollinger_bands import BollingerBands
+from tests.conftest import make_ohlcv
+
+
+def _close_sum(spec):
+    """Runs in a worker: sum the shared close column and report whether it was a view"""
+    df = attach_frame(spec)
+    return float(df['close'].sum()), df['close'].to_numpy().flags.writeable
+
+
+@pytest.mark.parametrize('backend', ['shm', 'memmap'])
+def test_attach_frame_round_trip(backend, tmp_path):
+    df = make_ohlcv(300).tz_localize('America/New_York')
+
+    with share_frame(df, backend=backend, directory=str(tmp_path)) as shared:
+        attached = attach_frame(shared.spec)
+        pd.testing.assert_frame_equal(attached, df)
+
+        # Read-only views, not copies
+        close = attached['close'].to_numpy()
+        assert not close.flags.writeable
+        assert not close.flags.owndata
+        with pytest.raises(ValueError):
+            close[0] = 0
+
+    if backend == 'memmap':
+        assert list(tmp_path.iterdir()) == []
+
+
+def test_arrays_with_index():
+    index = pd.date_range('2024-01-01', periods=50, freq='min', name='timestamp')
+    signals = np.random.default_rng(0).integers(-1, 2, (50, 7)).astype(float)
+
+    with SharedArrays({'signals': signals}, index=index) as shared:
+        arrays = attach_arrays(shared.spec)
+        assert list(arrays) == ['signals']
+        np.testing.assert_array_equal(arrays['signals'], signals)
+        pd.testing.assert_index_equal(attach_index(shared.spec), index)
+
+
+def test_object_columns_are_rejected():
+    df = make_ohlcv(10).assign(symbol='SPY')
+    with pytest.raises(TypeError):
+        share_frame(df)
+
+
+def test_string_index_falls_back_to_pickling():
+    df = make_ohlcv(400)
+    labeled = df.set_axis([f"bar{i}" for i in range(len(df))])
+    assert shareable(df) and shareable(df.tz_localize('UTC'))
+    assert not shareable(labeled)
+
+    params = parameter_grid({'period': [10, 20], 'std_dev': [2]})
+    serial = ParameterSweep(BollingerBands, max_workers=1).run(labeled, params)
+    parallel = ParameterSweep(BollingerBands, max_workers=2).run(labeled, params)
+    pd.testing.assert_frame_equal(parallel, serial)
+
+    batched = Backtester().compare_strategies([BollingerBands(10, 2), BollingerBands(20, 2)], labeled,
+                                              batched=True, max_workers=2)
+    assert len(batched) == 2
+
+    walk_forward = WalkForward(BollingerBands, params, train_size=200, test_size=100, max_workers=2).run(labeled)
+    assert len(walk_forward['equity_curve']) == 200
+
+
+def test_workers_attach_without_copies():
+    df = make_ohlcv(1000)
+
+    with share_frame(df) as shared:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(_close_sum, [shared.spec] * 4))
+
+    assert all(total == pytest.approx(df['close'].sum()) for total, _ in results)
+    assert not any(writeable for _, writeable in results)
+
+
+def test_backtest_on_shared_frame_matches():
+    df = make_ohlcv(500)
+    expected = Backtester().run_backtest(BollingerBands(20, 2), df)
+
+    with share_frame(df) as shared:
+        result = Backtester().run_backtest(BollingerBands(20, 2), attach_frame(shared.spec), vectorized=True)
+
+    assert result['metrics'] == pytest.approx(expected['metrics'], nan_ok=True)
+
+
+@pytest.mark.parametrize('share_data', ['shm', 'memmap', None])
+def test_sweep_results_do_not_depend_on_sharing(share_data):
+    df = make_ohlcv(600)
+    params = parameter_grid({'period': [10, 20], 'std_dev': [1.5, 2]})
+
+    serial = ParameterSweep(BollingerBands, max_workers=1).run(df, params)
+    parallel = ParameterSweep(BollingerBands, max_workers=2, share_data=share_data).run(df, params)
+
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+def test_walk_forward_shared_matches_in_process():
+    df = make_ohlcv(800)
+    params = parameter_grid({'period': [10, 20], 'std_dev': [2]})
+
+    serial = WalkForward(BollingerBands, params, train_size=200, test_size=100, max_workers=1).run(df)
+    shared = WalkForward(BollingerBands, params, train_size=200, test_size=100, max_workers=2).run(df)
+
+    pd.testing.assert_frame_equal(shared['windows'], serial['windows'])
+    pd.testing.assert_frame_equal(shared['equity_curve'], serial['equity_curve'])
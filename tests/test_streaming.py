@@ -0,0 +1,106 @@
+"""Tests for streaming indicators and strategies"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.bollinger_bands import BollingerBands
+from strategies.moving_average import MovingAverageCrossover
+from strategies.rsi_strategy import RSIMeanReversion
+from strategies.streaming import (StreamingBollingerBands, StreamingMovingAverageCrossover,
+                                  StreamingRSIMeanReversion)
+from tests.conftest import make_ohlcv
+from utils import indicators
+from utils.indicator_cache import indicator_cache
+from utils.rolling import RollingMean, RollingStd, RollingRSI
+
+
+def _rsi(series, period):
+    """RSI from pandas rolling means of gains and losses"""
+    delta = series.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+
+@pytest.fixture
+def prices():
+    close = make_ohlcv(2000, seed=7)['close']
+    # Include a flat stretch to exercise the identical-values path
+    close.iloc[500:540] = close.iloc[500]
+    return close
+
+
+@pytest.mark.parametrize('period', [1, 2, 20])
+def test_rolling_state_matches_pandas(prices, period):
+    mean, std, rsi = RollingMean(period), RollingStd(period), RollingRSI(period)
+    streamed = pd.DataFrame(
+        [(mean.update(x), std.update(x), rsi.update(x)) for x in prices],
+        index=prices.index, columns=['mean', 'std', 'rsi'])
+
+    np.testing.assert_array_equal(streamed['mean'], prices.rolling(period).mean())
+    # pandas' variance algorithm differs between versions, so only compare closely
+    np.testing.assert_allclose(streamed['std'], prices.rolling(period).std(), rtol=1e-6, atol=1e-5)
+    np.testing.assert_array_equal(streamed['rsi'], _rsi(prices, period))
+
+
+def test_wilder_rsi_matches_ewm(prices):
+    rsi = RollingRSI(14, method='wilder')
+    streamed = np.array([rsi.update(x) for x in prices])
+
+    delta = prices.diff().fillna(0)
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+    # Wilder smoothing seeded with the first simple average
+    avg_gain = gain.copy()
+    avg_loss = loss.copy()
+    avg_gain.iloc[:14] = np.nan
+    avg_loss.iloc[:14] = np.nan
+    avg_gain.iloc[13] = gain.iloc[:14].mean()
+    avg_loss.iloc[13] = loss.iloc[:14].mean()
+    avg_gain = avg_gain.iloc[13:].ewm(alpha=1 / 14, adjust=False).mean()
+    avg_loss = avg_loss.iloc[13:].ewm(alpha=1 / 14, adjust=False).mean()
+    expected = 100 - 100 / (1 + avg_gain / avg_loss)
+
+    assert np.isnan(streamed[:13]).all()
+    np.testing.assert_allclose(streamed[13:], expected, rtol=1e-10)
+
+
+@pytest.mark.parametrize('batch, streaming', [
+    (MovingAverageCrossover(5, 20), StreamingMovingAverageCrossover(5, 20)),
+    (RSIMeanReversion(14, 40, 60), StreamingRSIMeanReversion(14, 40, 60)),
+    (BollingerBands(20, 2), StreamingBollingerBands(20, 2)),
+], ids=lambda s: s.name)
+def test_streaming_signals_match_batch(prices, batch, streaming):
+    df = prices.to_frame()
+    expected = batch.generate_signals(df)['signal']
+
+    assert streaming.name == batch.name
+    pd.testing.assert_series_equal(streaming.run(df), expected, check_dtype=False)
+
+    # Bars can also be passed as dicts one at a time
+    streaming.reset()
+    assert [streaming.on_bar({'close': x}) for x in prices[:100]] == list(expected[:100])
+
+
+@pytest.mark.parametrize('backend', ['compiled', 'numpy'])
+@pytest.mark.parametrize('batch, streaming', [
+    (MovingAverageCrossover(5, 20), StreamingMovingAverageCrossover(5, 20)),
+    (MovingAverageCrossover(10, 50), StreamingMovingAverageCrossover(10, 50)),
+    (RSIMeanReversion(14, 30, 70), StreamingRSIMeanReversion(14, 30, 70)),
+    (RSIMeanReversion(14, 40, 60), StreamingRSIMeanReversion(14, 40, 60)),
+    (BollingerBands(5, 2), StreamingBollingerBands(5, 2)),
+], ids=lambda s: s.name)
+def test_streaming_signals_match_batch_on_tick_prices(batch, streaming, backend, monkeypatch):
+    # Cent prices around $5 make equal averages (and RSI exactly at a
+    # threshold) common, where differently rounded kernels disagree
+    close = make_ohlcv(20000, seed=3)['close']
+    df = (close / close.mean() * 5).round(2).to_frame()
+    if backend == 'numpy':
+        monkeypatch.setattr(indicators, 'HAVE_NUMBA', False)
+    indicator_cache.clear()
+
+    expected = batch.generate_signals(df)['signal']
+    streaming.reset()
+    pd.testing.assert_series_equal(streaming.run(df), expected, check_dtype=False)
+    indicator_cache.clear()
@@ -0,0 +1,116 @@
+"""Tests for parameter sweeps"""
+
+import numpy as np
+import pytest
+
+from backtesting.engine import Backtester
+from backtesting.sweep import ParameterSweep, parameter_grid, random_samples, latin_hypercube
+from strategies.base_strategy import BaseStrategy
+from strategies.bollinger_bands import BollingerBands
+from strategies.moving_average import MovingAverageCrossover
+from strategies.rsi_strategy import RSIMeanReversion
+from tests.conftest import make_ohlcv
+
+
+def test_parameter_grid_expands_all_combinations():
+    params = parameter_grid({'period': [10, 20], 'std_dev': [2, 3, 4]})
+    assert len(params) == 6
+    assert {'period': 20, 'std_dev': 4} in params
+
+
+def test_samplers_respect_ranges():
+    space = {'period': (5, 50), 'std_dev': (1.5, 3.0), 'kind': ['a', 'b']}
+
+    for samples in (random_samples(space, 40, seed=1), latin_hypercube(space, 40, seed=1)):
+        assert len(samples) == 40
+        assert all(5 <= s['period'] <= 50 and isinstance(s['period'], int) for s in samples)
+        assert all(1.5 <= s['std_dev'] <= 3.0 for s in samples)
+        assert {s['kind'] for s in samples} == {'a', 'b'}
+
+    # Latin hypercube puts exactly one sample in each stratum
+    samples = latin_hypercube({'x': (0.0, 1.0)}, 10, seed=3)
+    assert sorted(int(s['x'] * 10) for s in samples) == list(range(10))
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_sweep_ranks_configurations(ohlcv, max_workers):
+    backtester = Backtester(commission=0.001, slippage=0.001)
+    params = parameter_grid({'period': [10, 20], 'std_dev': [2, 3]})
+
+    ranked = ParameterSweep(BollingerBands, backtester, max_workers=max_workers).run(ohlcv, params)
+
+    assert list(ranked['rank']) == [1, 2, 3, 4]
+    assert ranked['sharpe_ratio'].is_monotonic_decreasing
+
+    # Same metrics as a direct backtest
+    best = ranked.iloc[0]
+    direct = backtester.run_backtest(BollingerBands(best['period'], best['std_dev']), ohlcv)
+    assert best['total_return'] == pytest.approx(direct['metrics']['total_return'])
+
+
+GRIDS = [
+    (BollingerBands, {'period': [5, 10, 20, 50], 'std_dev': [1, 1.5, 2, 3]}),
+    (RSIMeanReversion, {'rsi_period': [7, 14], 'oversold': [20, 30], 'overbought': [70, 80]}),
+    (MovingAverageCrossover, {'short_period': [5, 10], 'long_period': [20, 50]}),
+]
+
+
+@pytest.mark.parametrize('strategy_cls, grid', GRIDS, ids=lambda value: getattr(value, '__name__', ''))
+def test_batch_signals_match_generate_signals(strategy_cls, grid):
+    df = make_ohlcv(1500, seed=11)
+    df.iloc[700:740, df.columns.get_loc('close')] = df['close'].iloc[700]
+    params = parameter_grid(grid)
+
+    signals = strategy_cls.batch_signals(df, params)
+    assert signals.shape == (len(df), len(params))
+
+    # Same as the generic one-combination-at-a-time implementation
+    expected = BaseStrategy.batch_signals.__func__(strategy_cls, df, params)
+    np.testing.assert_array_equal(signals, expected)
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_batched_sweep_matches_sweep(ohlcv, max_workers, monkeypatch):
+    # Small batches so the sweep is split across several of them
+    monkeypatch.setattr('backtesting.sweep.BATCH_ELEMENTS', len(ohlcv) * 3)
+    backtester = Backtester(commission=0.001, slippage=0.001)
+    params = parameter_grid(GRIDS[0][1])
+
+    expected = ParameterSweep(BollingerBands, backtester, max_workers=1).run(ohlcv, params)
+    sweep = ParameterSweep(BollingerBands, backtester, max_workers=max_workers, batched=True, profile=True)
+    ranked = sweep.run(ohlcv, params)
+
+    assert list(ranked['strategy']) == list(expected['strategy'])
+    for column in ['total_return', 'sharpe_ratio', 'max_drawdown', 'total_trades']:
+        np.testing.assert_allclose(ranked[column], expected[column])
+    assert sweep.profile['runs'] == 6
+    assert sweep.profile['counters']['bars'] == len(ohlcv) * len(params)
+
+
+@pytest.mark.parametrize('strategy_cls, grid', GRIDS, ids=lambda value: getattr(value, '__name__', ''))
+def test_batched_sweep_trades_match_on_tick_prices(strategy_cls, grid):
+    # Cent prices around $5: indicators often tie each other or a cutoff,
+    # where the window-family kernels round differently from single windows
+    df = make_ohlcv(20000, seed=3)
+    prices = ['open', 'high', 'low', 'close']
+    df[prices] = (df[prices] / df['close'].mean() * 5).round(2)
+    params = parameter_grid(grid)
+
+    expected = ParameterSweep(strategy_cls, max_workers=1).run(df, params).set_index('strategy')
+    ranked = ParameterSweep(strategy_cls, max_workers=1, batched=True).run(df, params).set_index('strategy')
+    expected = expected.loc[ranked.index]
+
+    np.testing.assert_array_equal(ranked['total_trades'], expected['total_trades'])
+    for column in ['total_return', 'win_rate', 'max_drawdown']:
+        np.testing.assert_allclose(ranked[column], expected[column])
+
+
+def test_batched_sweep_with_stops(ohlcv):
+    backtester = Backtester(stop_loss=0.02, trailing_stop=0.03)
+    params = parameter_grid(GRIDS[1][1])
+
+    expected = ParameterSweep(RSIMeanReversion, backtester, max_workers=1).run(ohlcv, params)
+    ranked = ParameterSweep(RSIMeanReversion, backtester, max_workers=1, batched=True).run(ohlcv, params)
+
+    assert list(ranked['strategy']) == list(expected['strategy'])
+    np.testing.assert_allclose(ranked['total_return'], expected['total_return'])
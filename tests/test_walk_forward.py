@@ -0,0 +1,93 @@
+"""Tests for walk-forward optimization"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.engine import Backtester
+from backtesting.sweep import parameter_grid
+from backtesting.walk_forward import WalkForward, walk_forward_windows
+from strategies.bollinger_bands import BollingerBands
+from tests.conftest import make_ohlcv
+
+
+def test_rolling_and_anchored_windows():
+    rolling = walk_forward_windows(100, train_size=40, test_size=20)
+    assert [(w['train'], w['test']) for w in rolling] == [
+        ((0, 40), (40, 60)), ((20, 60), (60, 80)), ((40, 80), (80, 100))]
+
+    anchored = walk_forward_windows(100, train_size=40, test_size=20, anchored=True)
+    assert [w['train'] for w in anchored] == [(0, 40), (0, 60), (0, 80)]
+
+    with pytest.raises(ValueError):
+        walk_forward_windows(100, 40, 20, step=10)
+
+
+@pytest.fixture
+def runner():
+    params = parameter_grid({'period': [10, 20], 'std_dev': [1.5, 2, 2.5]})
+    backtester = Backtester(commission=0.001, slippage=0.001)
+    return WalkForward(BollingerBands, params, backtester, train_size=200, test_size=100)
+
+
+def test_out_of_sample_run_is_stitched(runner):
+    df = make_ohlcv(1000, seed=3)
+    result = runner.run(df)
+
+    windows = result['windows']
+    assert len(windows) == 8
+    assert set(windows['strategy']) <= {f"BollingerBands_{p}_{s}" for p in (10, 20) for s in (1.5, 2, 2.5)}
+
+    # Combined curve covers every test bar exactly once
+    equity = result['equity_curve']
+    assert len(equity) == 800
+    assert equity['timestamp'].is_unique
+    assert equity['timestamp'].iloc[0] == df.index[200]
+
+    # Each window's return compounds into the total
+    compounded = np.prod(1 + windows['test_total_return'] / 100) - 1
+    assert result['metrics']['total_return'] == pytest.approx(compounded * 100)
+    assert result['metrics']['total_trades'] == windows['test_total_trades'].sum()
+
+
+class _AlwaysLong:
+    """Buys on the first bar and never signals an exit"""
+
+    def __init__(self):
+        self.name = 'AlwaysLong'
+
+    def generate_signals(self, df):
+        return df.assign(signal=1)
+
+
+def test_open_positions_close_at_window_end():
+    df = make_ohlcv(600, seed=7)
+    backtester = Backtester(commission=0.001, slippage=0.001)
+    result = WalkForward(_AlwaysLong, [{}], backtester, train_size=200, test_size=100).run(df)
+
+    # One round trip per window, sold at the window's last close with exit costs
+    trades = result['trades']
+    windows = result['windows']
+    assert len(trades) == len(windows) == 4
+    assert [trade['exit_time'] for trade in trades] == list(windows['test_end'])
+    for trade in trades:
+        assert trade['exit_price'] == pytest.approx(df.loc[trade['exit_time'], 'close'] * 0.999)
+    assert result['metrics']['total_trades'] == 4
+
+    # Each window starts from the cash the previous one ended with
+    equity = result['equity_curve']['portfolio_value']
+    for number in range(1, 4):
+        assert equity.iloc[number * 100 - 1] == pytest.approx(
+            trades[number - 1]['exit_price'] * trades[number - 1]['shares'] * 0.999)
+
+
+def test_parallel_matches_in_process(runner):
+    df = make_ohlcv(800, seed=5)
+
+    runner.max_workers = 1
+    serial = runner.run(df)
+    runner.max_workers = 2
+    parallel = runner.run(df)
+
+    pd.testing.assert_frame_equal(serial['windows'], parallel['windows'])
+    pd.testing.assert_frame_equal(serial['equity_curve'], parallel['equity_curve'])
@@ -3,14 +3,16 @@
 import pandas as pd
 import numpy as np
 from database.models import DatabaseManager
+from utils import indicator_cache as indicators
+from utils import indicators as kernels
 
 
 class DataAnalyzer:
     """Provides functions for loading data and adding technical indicators"""
     
-    def __init__(self):
-        """Initialize with database connection"""
-        self.db = DatabaseManager()
+    def __init__(self, db=None):
+        """Initialize with database connection (defaults to the local SQLite database)"""
+        self.db = db or DatabaseManager()
     
     def bars_to_dataframe(self, bars):
         """Convert list of MarketBar objects to pandas DataFrame"""
@@ -32,13 +34,8 @@ class DataAnalyzer:
         return df
     
     def get_df(self, symbol, start, end, interval='1m'):
-        """Load bars from database as DataFrame"""
-        
-        # Get bars from database
-        bars = self.db.get_bars(symbol, start, end, interval)
-        
-        # Convert to DataFrame
-        return self.bars_to_dataframe(bars)
+        """Load bars from database as DataFrame (columnar read, no ORM objects)"""
+        return self.db.get_bars_df(symbol, start, end, interval)
     
     def add_returns(self, df):
         """Add percentage returns column (period-over-period change)"""
@@ -47,38 +44,30 @@ class DataAnalyzer:
     
     def add_sma(self, df, period, column='close'):
         """Add Simple Moving Average for given period"""
-        df[f'sma_{period}'] = df[column].rolling(window=period).mean()
+        df[f'sma_{period}'] = indicators.sma(df[column], period)
         return df
     
     def add_ema(self, df, period, column='close'):
         """Add Exponential Moving Average (weighted towards recent prices)"""
-        df[f'ema_{period}'] = df[column].ewm(span=period, adjust=False).mean()
+        df[f'ema_{period}'] = indicators.ema(df[column], period)
         return df
     
     def add_rsi(self, df, period=14, column='close'):
         """Add Relative Strength Index (0-100 momentum indicator)"""
-        
-        # Calculate price changes
-        delta = df[column].diff()
-        
-        # Separate gains and losses
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        # Calculate relative strength and RSI
-        rs = gain / loss
-        df[f'rsi_{period}'] = 100 - (100 / (1 + rs))
-        
+        df[f'rsi_{period}'] = indicators.rsi(df[column], period)
         return df
     
     def add_bollinger_bands(self, df, period=20, std=2, column='close'):
         """Add Bollinger Bands (volatility channel around SMA)"""
         
+        # Hash the column once for both cached lookups
+        fingerprint = indicators.indicator_cache.fingerprint(df[column])
+        
         # Middle band is the SMA
-        df[f'bb_middle_{period}'] = df[column].rolling(window=period).mean()
+        df[f'bb_middle_{period}'] = indicators.sma(df[column], period, fingerprint=fingerprint)
         
         # Calculate standard deviation
-        rolling_std = df[column].rolling(window=period).std()
+        rolling_std = indicators.rolling_std(df[column], period, fingerprint=fingerprint)
         
         # Upper band = middle + (std_multiplier * rolling_std)
         df[f'bb_upper_{period}'] = df[f'bb_middle_{period}'] + (rolling_std * std)
@@ -88,6 +77,33 @@ class DataAnalyzer:
         
         return df
     
+    def add_atr(self, df, period=14):
+        """Add Average True Range (Wilder-smoothed volatility in price units)"""
+        df[f'atr_{period}'] = kernels.atr(df['high'], df['low'], df['close'], period)
+        return df
+    
+    def add_macd(self, df, fast=12, slow=26, signal=9, column='close'):
+        """Add MACD line, signal line and histogram"""
+        line, signal_line, histogram = kernels.macd(df[column], fast, slow, signal)
+        df['macd'] = line
+        df['macd_signal'] = signal_line
+        df['macd_hist'] = histogram
+        return df
+    
+    def add_vwap(self, df, period=None):
+        """Add Volume-Weighted Average Price (cumulative, or rolling over period bars)"""
+        name = 'vwap' if period is None else f'vwap_{period}'
+        df[name] = kernels.vwap(df['high'], df['low'], df['close'], df['volume'], period)
+        return df
+    
+    def add_donchian(self, df, period=20):
+        """Add Donchian Channel (highest high / lowest low breakout levels)"""
+        upper, middle, lower = kernels.donchian(df['high'], df['low'], period)
+        df[f'dc_upper_{period}'] = upper
+        df[f'dc_middle_{period}'] = middle
+        df[f'dc_lower_{period}'] = lower
+        return df
+    
     def calculate_metrics(self, df):
         """Calculate summary performance metrics"""
         
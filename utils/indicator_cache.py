@@ -0,0 +1,173 @@
+"""Memoized technical indicators shared by strategies and DataAnalyzer"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils import indicators as kernels
+
+
+class IndicatorCache:
+    """
+    LRU cache of indicator results keyed by (indicator, params, data fingerprint)
+
+    The fingerprint is a hash of the input column's values and index, so any
+    two DataFrames holding the same prices share cached indicators no matter
+    how many times they were copied. Memory is bounded by max_bytes; the least
+    recently used entries are evicted first.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize cache
+
+        Args:
+            max_bytes: Upper bound on memory held by cached indicator arrays
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> numpy array of indicator values
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        # Counters for monitoring
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def fingerprint(series: pd.Series) -> str:
+        """Hash a column's values and index (changes if either changes)"""
+
+        digest = hashlib.blake2b(digest_size=16)
+        values = np.ascontiguousarray(series.to_numpy())
+        digest.update(str(values.dtype).encode())
+        digest.update(values.tobytes())
+
+        index = series.index
+        if isinstance(index, pd.RangeIndex):
+            digest.update(f"range:{index.start}:{index.stop}:{index.step}".encode())
+        elif isinstance(index, pd.DatetimeIndex):
+            # Tz-aware indexes convert to object arrays; hash the int64 times and the zone
+            digest.update(f"{index.dtype}".encode())
+            digest.update(index.asi8.tobytes())
+        elif index.dtype.kind in 'biufcmM':
+            digest.update(np.ascontiguousarray(index.to_numpy()).tobytes())
+        else:
+            # Object/string indexes: hash the contents, not the pointers
+            digest.update(pd.util.hash_pandas_object(index).to_numpy().tobytes())
+
+        return digest.hexdigest()
+
+    def get_or_compute(self, name: str, params: tuple, series: pd.Series,
+                       compute: Callable[[pd.Series], pd.Series],
+                       fingerprint: Optional[str] = None) -> pd.Series:
+        """
+        Return cached indicator or compute and store it
+
+        Args:
+            name: Indicator name (e.g. 'sma')
+            params: Tuple of indicator parameters
+            series: Input column
+            compute: Function that calculates the indicator from series
+                (returning a Series or an aligned array)
+            fingerprint: Precomputed fingerprint of series (saves re-hashing
+                when several indicators are built from the same column)
+
+        Returns:
+            Indicator values as a Series aligned with series
+        """
+
+        key = (name, params, fingerprint or self.fingerprint(series))
+
+        with self._lock:
+            values = self._entries.get(key)
+            if values is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if values is None:
+            values = np.asarray(compute(series), dtype=float)
+            self._store(key, values)
+            with self._lock:
+                self.misses += 1
+
+        # Hand out a copy so callers can't modify the cached array
+        return pd.Series(values.copy(), index=series.index, name=series.name)
+
+    def _store(self, key, values: np.ndarray):
+        """Add entry and evict least recently used ones past the memory bound"""
+
+        if values.nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = values
+            self._bytes += values.nbytes
+
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all cached indicators and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict:
+        """Return cache counters and memory usage"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+        }
+
+
+# Process-wide cache used by strategies and DataAnalyzer
+indicator_cache = IndicatorCache()
+
+
+def _values(series: pd.Series) -> np.ndarray:
+    return series.to_numpy(dtype=float)
+
+
+def sma(series: pd.Series, period: int, cache: Optional[IndicatorCache] = None,
+        fingerprint: Optional[str] = None) -> pd.Series:
+    """Simple Moving Average"""
+    cache = cache or indicator_cache
+    return cache.get_or_compute('sma', (period,), series,
+                                lambda s: kernels.sma(_values(s), period), fingerprint)
+
+
+def rolling_std(series: pd.Series, period: int, cache: Optional[IndicatorCache] = None,
+                fingerprint: Optional[str] = None) -> pd.Series:
+    """Rolling sample standard deviation"""
+    cache = cache or indicator_cache
+    return cache.get_or_compute('rolling_std', (period,), series,
+                                lambda s: kernels.rolling_std(_values(s), period), fingerprint)
+
+
+def ema(series: pd.Series, period: int, cache: Optional[IndicatorCache] = None,
+        fingerprint: Optional[str] = None) -> pd.Series:
+    """Exponential Moving Average (span=period, not adjusted)"""
+    cache = cache or indicator_cache
+    return cache.get_or_compute('ema', (period,), series,
+                                lambda s: kernels.ema(_values(s), period), fingerprint)
+
+
+def rsi(series: pd.Series, period: int = 14, cache: Optional[IndicatorCache] = None,
+        fingerprint: Optional[str] = None) -> pd.Series:
+    """Relative Strength Index (0-100) from simple rolling averages of gains and losses"""
+    cache = cache or indicator_cache
+    return cache.get_or_compute('rsi', (period,), series,
+                                lambda s: kernels.rsi(_values(s), period), fingerprint)
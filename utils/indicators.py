@@ -0,0 +1,959 @@
+"""Vectorized technical indicators on NumPy arrays
+
+Every indicator works along axis 0 of a 1-D array (one series) or a 2-D
+array (time x symbols, or time x parameter sets) and returns arrays of the
+same shape, NaN during warm-up like the pandas equivalents:
+
+    sma(x, 20)          ~ pd.Series(x).rolling(20).mean()
+    rolling_std(x, 20)  ~ pd.Series(x).rolling(20).std()
+    ema(x, 12)          ~ pd.Series(x).ewm(span=12, adjust=False).mean()
+
+Rolling means and variances are running window sums (each bar adds one
+value and drops one), so their cost does not depend on the window length.
+The sums are kept relative to a reference price that is reset every block
+of rows, which keeps cancellation error small on long series and for the
+sums of squares behind the variance. Rolling max/min use block-wise running
+extremes (van Herk / Gil-Werman), also independent of the window.
+Exponential smoothing is a recursion.
+
+The window sums and recursions are JIT-compiled single passes with numba
+when it is installed (pip install numba). Without numba the window sums come
+from prefix sums (np.cumsum) over cache-sized blocks and the recursions from
+a log-step scan of whole-array operations: same results up to rounding,
+fewer bars per second. Signal helpers (crossover_signals, threshold_signals,
+rsi_signals, percent_b_signals) settle comparisons that rounding could flip
+exactly, so signals do not depend on the backend.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Fallback when numba is missing: run the function as plain Python"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Values per prefix-sum block: bounds the running sums and keeps blocks in cache
+BLOCK_ELEMENTS = 1 << 16
+
+# Rows per block of a window family (one long column, so shorter blocks keep
+# the running sums of squares precise)
+FAMILY_BLOCK_ROWS = 1 << 14
+
+# Rows between resets of the compiled running sums (at least 4 windows)
+ANCHOR_ROWS = 1024
+
+# The scan stops once older values are weighted below this
+SCAN_TOLERANCE = 1e-18
+
+
+# --- Array helpers ----------------------------------------------------------
+
+def _as_2d(values) -> Tuple[np.ndarray, bool]:
+    """Float array with time along axis 0, and whether the input was 1-D"""
+    # Column-major, so every column's time series is contiguous
+    array = np.asfortranarray(values, dtype=float)
+    if array.ndim == 1:
+        return array[:, None], True
+    if array.ndim != 2:
+        raise ValueError(f"Indicators take 1-D or 2-D arrays, got {array.ndim} dimensions")
+    return array, False
+
+
+def _restore(array: np.ndarray, squeeze: bool) -> np.ndarray:
+    return array[:, 0] if squeeze else array
+
+
+def _check_period(period: int):
+    if int(period) != period or period < 1:
+        raise ValueError(f"Period must be a positive integer, got {period}")
+
+
+def _first_valid(x: np.ndarray) -> np.ndarray:
+    """Row of the first non-NaN value in each column (len(x) if there is none)"""
+    valid = ~np.isnan(x)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), len(x))
+
+
+# --- Rolling windows --------------------------------------------------------
+
+def _window_counts(flags: np.ndarray, window: int) -> np.ndarray:
+    """Number of True flags in each trailing window (one row per full window)"""
+    counts = np.zeros((len(flags) + 1, flags.shape[1]), dtype=np.int64, order='F')
+    np.cumsum(flags, axis=0, out=counts[1:])
+    return counts[window:] - counts[:-window]
+
+
+@njit(cache=True)
+def _moments_loop(x, window, mean, var, variance, anchor_rows):
+    """
+    Running window sums down each column (compiled single pass)
+
+    Sums are kept relative to a reference price and rebuilt from the window
+    every anchor_rows rows, which bounds the rounding drift of adding and
+    removing values.
+    """
+    n_rows, n_cols = x.shape
+    for col in range(n_cols):
+        sum1 = 0.0
+        sum2 = 0.0
+        n_missing = 0
+        run = 0
+        reference = 0.0
+        for t in range(n_rows):
+            value = x[t, col]
+            run = run + 1 if t > 0 and value == x[t - 1, col] else 1
+
+            if t % anchor_rows == 0:
+                reference = value if value == value else 0.0
+                sum1 = 0.0
+                sum2 = 0.0
+                n_missing = 0
+                for j in range(max(0, t - window + 1), t + 1):
+                    old = x[j, col]
+                    if old != old:
+                        n_missing += 1
+                    else:
+                        sum1 += old - reference
+                        sum2 += (old - reference) * (old - reference)
+            else:
+                if value != value:
+                    n_missing += 1
+                else:
+                    sum1 += value - reference
+                    sum2 += (value - reference) * (value - reference)
+                if t >= window:
+                    old = x[t - window, col]
+                    if old != old:
+                        n_missing -= 1
+                    else:
+                        sum1 -= old - reference
+                        sum2 -= (old - reference) * (old - reference)
+
+            if t < window - 1 or n_missing > 0:
+                continue
+            if run >= window:
+                # Windows of one repeated value are exact (as in pandas)
+                mean[t, col] = value
+                if variance:
+                    var[t, col] = 0.0
+                continue
+            window_mean = sum1 / window
+            mean[t, col] = window_mean + reference
+            if variance:
+                var[t, col] = max((sum2 - sum1 * window_mean) / (window - 1), 0.0)
+
+
+def _rolling_moments(x: np.ndarray, window: int, variance: bool):
+    """Rolling mean (and sample variance) of a 2-D array; NaN unless the window is full"""
+
+    _check_period(window)
+    n_rows, n_cols = x.shape
+    mean = np.full((n_rows, n_cols), np.nan, order='F')
+    var = np.full((n_rows, n_cols), np.nan, order='F') if variance else None
+    if n_rows < window:
+        return mean, var
+    if window == 1:
+        # Mean of one value is the value; sample variance is undefined
+        mean[:] = x
+        return mean, var
+
+    if HAVE_NUMBA:
+        _moments_loop(x, window, mean, mean if var is None else var, variance,
+                      max(ANCHOR_ROWS, 4 * window))
+        return mean, var
+    return _prefix_moments(x, window, mean, var)
+
+
+def _prefix_moments(x: np.ndarray, window: int, mean: np.ndarray, var: Optional[np.ndarray]):
+    """Rolling mean and variance from prefix sums over blocks of rows (NumPy only)"""
+
+    n_rows, n_cols = x.shape
+    variance = var is not None
+    missing = np.isnan(x)
+    has_missing = missing.any()
+    # Windows of one repeated value are made exact (as in pandas)
+    has_repeats = bool((x[1:] == x[:-1]).any())
+
+    # Blocks sized to stay in cache, with scratch buffers reused across blocks
+    block_rows = max(BLOCK_ELEMENTS // n_cols, 4 * window)
+    scratch_rows = min(block_rows + window - 1, n_rows)
+    shifted_buffer = np.empty((scratch_rows, n_cols), order='F')
+    sums_buffer = np.zeros((scratch_rows + 1, n_cols), order='F')
+    diff_buffer = np.empty((block_rows, n_cols), order='F')
+
+    for start in range(window - 1, n_rows, block_rows):
+        stop = min(start + block_rows, n_rows)
+        block = x[start - window + 1:stop]
+        rows = len(block)
+        shifted = shifted_buffer[:rows]
+        sums = sums_buffer[:rows + 1]
+        window_sum = diff_buffer[:stop - start]
+        out_mean = mean[start:stop]
+
+        # Sums relative to a reference price keep the prefix sums small
+        reference = np.nan_to_num(block[0])
+        np.subtract(block, reference, out=shifted)
+        if has_missing:
+            shifted[missing[start - window + 1:stop]] = 0.0
+
+        np.cumsum(shifted, axis=0, out=sums[1:])
+        np.subtract(sums[window:], sums[:-window], out=window_sum)
+        np.divide(window_sum, window, out=out_mean)
+
+        if variance:
+            # (sum of squares - sum * mean) / (window - 1)
+            out_var = var[start:stop]
+            np.multiply(shifted, shifted, out=shifted)
+            window_sum *= out_mean
+            np.cumsum(shifted, axis=0, out=sums[1:])
+            np.subtract(sums[window:], sums[:-window], out=out_var)
+            out_var -= window_sum
+            out_var /= window - 1
+            np.maximum(out_var, 0.0, out=out_var)
+
+        out_mean += reference
+
+        if has_missing:
+            incomplete = _window_counts(missing[start - window + 1:stop], window) > 0
+            out_mean[incomplete] = np.nan
+            if variance:
+                var[start:stop][incomplete] = np.nan
+
+        if has_repeats:
+            changes = block[1:] != block[:-1]
+            constant = _window_counts(changes, window - 1) == 0
+            if constant.any():
+                out_mean[constant] = block[window - 1:][constant]
+                if variance:
+                    var[start:stop][constant] = 0.0
+
+    return mean, var
+
+
+def sma(values, period: int) -> np.ndarray:
+    """
+    Simple Moving Average
+
+    Args:
+        values: 1-D series or 2-D array with time along axis 0
+        period: Window length in bars
+
+    Returns:
+        Array like values, NaN until the window is full (or holds a NaN)
+    """
+    x, squeeze = _as_2d(values)
+    mean, _ = _rolling_moments(x, period, variance=False)
+    return _restore(mean, squeeze)
+
+
+def rolling_sum(values, period: int) -> np.ndarray:
+    """Rolling sum over period bars (NaN until the window is full)"""
+    return sma(values, period) * period
+
+
+def rolling_var(values, period: int) -> np.ndarray:
+    """Rolling sample variance (ddof=1)"""
+    x, squeeze = _as_2d(values)
+    _, var = _rolling_moments(x, period, variance=True)
+    return _restore(var, squeeze)
+
+
+def rolling_std(values, period: int) -> np.ndarray:
+    """Rolling sample standard deviation (ddof=1)"""
+    return np.sqrt(rolling_var(values, period))
+
+
+def _rolling_extreme(values, period: int, ufunc, identity: float) -> np.ndarray:
+    """Rolling max or min from running extremes within blocks of period rows"""
+
+    _check_period(period)
+    x, squeeze = _as_2d(values)
+    n_rows, n_cols = x.shape
+    result = np.full((n_rows, n_cols), np.nan, order='F')
+
+    if n_rows >= period:
+        # Work on rows of the transpose (one contiguous row per column of x)
+        n_blocks = -(-n_rows // period)
+        padded = np.full((n_cols, n_blocks * period), identity)
+        padded[:, :n_rows] = x.T
+        blocks = padded.reshape(n_cols, n_blocks, period)
+
+        # Each window is the tail of one block plus the head of the next
+        head = ufunc.accumulate(blocks, axis=2).reshape(n_cols, -1)
+        tail = ufunc.accumulate(blocks[:, :, ::-1], axis=2)[:, :, ::-1].reshape(n_cols, -1)
+        ufunc(tail[:, :n_rows - period + 1], head[:, period - 1:n_rows], out=result.T[:, period - 1:])
+
+    return _restore(result, squeeze)
+
+
+def rolling_max(values, period: int) -> np.ndarray:
+    """Highest value over period bars (NaN if the window holds a NaN)"""
+    return _rolling_extreme(values, period, np.maximum, -np.inf)
+
+
+def rolling_min(values, period: int) -> np.ndarray:
+    """Lowest value over period bars (NaN if the window holds a NaN)"""
+    return _rolling_extreme(values, period, np.minimum, np.inf)
+
+
+# --- Exponential smoothing --------------------------------------------------
+
+@njit(cache=True)
+def _smooth_loop(x, alpha, seed, out):
+    """Exponential smoothing down each column (compiled single pass, see _smooth)"""
+    n_rows, n_cols = x.shape
+    for col in range(n_cols):
+        y = np.nan
+        for t in range(n_rows):
+            if y != y:
+                # Not started yet: begin at the first seed value
+                y = seed[t, col]
+            elif x[t, col] == x[t, col]:
+                y = alpha * x[t, col] + (1.0 - alpha) * y
+            out[t, col] = y
+
+
+def _recurrence_scan(b: np.ndarray, decay) -> np.ndarray:
+    """
+    y[t] = decay[t] * y[t-1] + b[t] as a log-step scan (decay scalar or array like b)
+
+    After k passes each row holds the sum of its last 2**k decayed terms;
+    passes stop once the weight of anything older is negligible.
+    """
+    y = b.copy()
+    factor, step = decay, 1
+    while step < len(y) and np.max(factor[step:] if np.ndim(factor) else factor) > SCAN_TOLERANCE:
+        if np.ndim(factor):
+            y[step:] = y[step:] + factor[step:] * y[:-step]
+            factor = factor.copy()
+            factor[step:] = factor[step:] * factor[:-step]
+        else:
+            y[step:] = y[step:] + factor * y[:-step]
+            factor *= factor
+        step *= 2
+    return y
+
+
+def _smooth(x: np.ndarray, alpha: float, seed: np.ndarray) -> np.ndarray:
+    """
+    Exponential smoothing y[t] = alpha * x[t] + (1 - alpha) * y[t-1]
+
+    The recursion starts in each column at the first non-NaN value of seed,
+    taking that value as y. NaNs after the start carry the previous value.
+    """
+    if HAVE_NUMBA:
+        result = np.empty(x.shape, order='F')
+        _smooth_loop(x, alpha, seed, result)
+        return result
+
+    n_rows = len(x)
+    rows = np.arange(n_rows)[:, None]
+    start = _first_valid(seed)
+
+    # A NaN row keeps the previous value: weight 1 on it, nothing added
+    missing = np.isnan(x)
+    b = np.where(missing, 0.0, alpha * x)
+    decay = np.where(missing, 1.0, 1.0 - alpha) if missing.any() else 1.0 - alpha
+    before = rows < start
+    b[before] = 0.0
+    started = np.flatnonzero(start < n_rows)
+    b[start[started], started] = seed[start[started], started]
+
+    result = _recurrence_scan(b, decay)
+    result[before] = np.nan
+    return result
+
+
+def ema(values, period: int) -> np.ndarray:
+    """
+    Exponential Moving Average (span=period, not adjusted)
+
+    Starts at the first value, like pandas ewm(span=period, adjust=False).
+
+    Args:
+        values: 1-D series or 2-D array with time along axis 0
+        period: Span in bars (alpha = 2 / (period + 1))
+
+    Returns:
+        Array like values
+    """
+    _check_period(period)
+    x, squeeze = _as_2d(values)
+    return _restore(_smooth(x, 2.0 / (period + 1), x), squeeze)
+
+
+def wilder(values, period: int) -> np.ndarray:
+    """
+    Wilder's smoothing (alpha = 1 / period), seeded with the simple average of the first period
+
+    Returns:
+        Array like values, NaN until the first full window
+    """
+    x, squeeze = _as_2d(values)
+    seed, _ = _rolling_moments(x, period, variance=False)
+    return _restore(_smooth(x, 1.0 / period, seed), squeeze)
+
+
+# --- Indicators -------------------------------------------------------------
+
+def bollinger_bands(values, period: int = 20, std_dev: float = 2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger Bands: SMA plus/minus std_dev rolling standard deviations
+
+    Returns:
+        (middle, upper, lower) arrays like values
+    """
+    x, squeeze = _as_2d(values)
+    middle, var = _rolling_moments(x, period, variance=True)
+    width = std_dev * np.sqrt(var)
+    return _restore(middle, squeeze), _restore(middle + width, squeeze), _restore(middle - width, squeeze)
+
+
+def rsi(values, period: int = 14, method: str = 'simple') -> np.ndarray:
+    """
+    Relative Strength Index (0-100)
+
+    Args:
+        values: Closing prices, 1-D or 2-D with time along axis 0
+        period: Averaging period
+        method: 'simple' averages gains and losses over a rolling window (the
+            formula used by RSIMeanReversion); 'wilder' uses Wilder's smoothing
+
+    Returns:
+        Array like values, NaN during warm-up (and where price never moved)
+    """
+    if method not in ('simple', 'wilder'):
+        raise ValueError(f"Unknown RSI method: {method}")
+
+    x, squeeze = _as_2d(values)
+
+    # The first bar has no change: zero gain and loss, as with pandas diff()
+    delta = np.zeros_like(x)
+    delta[1:] = x[1:] - x[:-1]
+    gain = np.fmax(delta, 0.0)  # fmax: a NaN change counts as no gain
+    loss = np.fmax(-delta, 0.0)
+
+    if method == 'simple':
+        avg_gain, _ = _rolling_moments(gain, period, variance=False)
+        avg_loss, _ = _rolling_moments(loss, period, variance=False)
+    else:
+        avg_gain, avg_loss = wilder(gain, period), wilder(loss, period)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = 100 - 100 / (1 + avg_gain / avg_loss)
+    return _restore(result, squeeze)
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """Greatest of high - low and the gaps from the previous close (high - low on the first bar)"""
+    high, squeeze = _as_2d(high)
+    low, _ = _as_2d(low)
+    close, _ = _as_2d(close)
+
+    result = high - low
+    prev_close = close[:-1]
+    result[1:] = np.maximum(result[1:], np.abs(high[1:] - prev_close))
+    result[1:] = np.maximum(result[1:], np.abs(low[1:] - prev_close))
+    return _restore(result, squeeze)
+
+
+def atr(high, low, close, period: int = 14, method: str = 'wilder') -> np.ndarray:
+    """
+    Average True Range
+
+    Args:
+        high, low, close: Price arrays of the same shape
+        period: Averaging period
+        method: 'wilder' (standard) or 'simple' rolling mean of the true range
+
+    Returns:
+        Array like close, NaN until the first full window
+    """
+    if method not in ('simple', 'wilder'):
+        raise ValueError(f"Unknown ATR method: {method}")
+    tr = true_range(high, low, close)
+    return wilder(tr, period) if method == 'wilder' else sma(tr, period)
+
+
+def macd(values, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Moving Average Convergence Divergence
+
+    Returns:
+        (macd, signal, histogram): fast EMA - slow EMA, its signal-period EMA
+        and their difference
+    """
+    x, squeeze = _as_2d(values)
+    line = ema(x, fast) - ema(x, slow)
+    signal_line = ema(line, signal)
+    return _restore(line, squeeze), _restore(signal_line, squeeze), _restore(line - signal_line, squeeze)
+
+
+def vwap(high, low, close, volume, period: Optional[int] = None) -> np.ndarray:
+    """
+    Volume-Weighted Average Price of the typical price (high + low + close) / 3
+
+    Args:
+        high, low, close, volume: Arrays of the same shape
+        period: Rolling window in bars (None = cumulative from the first bar)
+
+    Returns:
+        Array like close (NaN where no volume traded)
+    """
+    high, squeeze = _as_2d(high)
+    low, _ = _as_2d(low)
+    close, _ = _as_2d(close)
+    volume, _ = _as_2d(volume)
+
+    typical = (high + low + close) / 3
+    if period is None:
+        traded = np.cumsum(typical * volume, axis=0)
+        total_volume = np.cumsum(volume, axis=0)
+    else:
+        traded = rolling_sum(typical * volume, period)
+        total_volume = rolling_sum(volume, period)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(total_volume > 0, traded / total_volume, np.nan)
+    return _restore(result, squeeze)
+
+
+def donchian(high, low, period: int = 20) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Donchian Channel: highest high and lowest low over period bars
+
+    Returns:
+        (upper, middle, lower) arrays like high
+    """
+    upper = rolling_max(high, period)
+    lower = rolling_min(low, period)
+    return upper, (upper + lower) / 2, lower
+
+
+# --- Window families (many periods of one series) ---------------------------
+
+def _window_family(values, periods, variance: bool):
+    """
+    Rolling mean (and sample variance) of one series for many window lengths
+
+    Every window comes from the same prefix sums of x and x**2 (taken over
+    blocks of rows relative to a reference price, like _prefix_moments), so
+    each extra period costs one subtraction pass instead of a new rolling pass.
+    """
+    x = np.asarray(values, dtype=float)
+    if x.ndim != 1:
+        raise ValueError(f"Window families take a 1-D series, got {x.ndim} dimensions")
+    periods = list(periods)
+    for period in periods:
+        _check_period(period)
+
+    n_rows = len(x)
+    mean = np.empty((n_rows, len(periods)), order='F')
+    var = np.empty((n_rows, len(periods)), order='F') if variance else None
+    for col, period in enumerate(periods):
+        mean[:period - 1, col] = np.nan
+        if variance:
+            var[:period - 1 if period > 1 else n_rows, col] = np.nan
+    if not periods or n_rows == 0:
+        return mean, var
+
+    longest = max(periods)
+    missing = np.isnan(x)
+    has_missing = missing.any()
+    # Windows of one repeated value are made exact (as in pandas)
+    has_repeats = bool((x[1:] == x[:-1]).any())
+    block_rows = max(FAMILY_BLOCK_ROWS, 4 * longest)
+    scratch = np.empty(block_rows)
+
+    for start in range(0, n_rows, block_rows):
+        stop = min(start + block_rows, n_rows)
+        first_row = max(start - longest + 1, 0)
+        block = x[first_row:stop]
+
+        # Shared prefix sums for every period, relative to a reference price
+        reference = np.nan_to_num(block[0])
+        shifted = block - reference
+        if has_missing:
+            shifted[missing[first_row:stop]] = 0.0
+        sums = np.zeros(len(block) + 1)
+        np.cumsum(shifted, out=sums[1:])
+        if variance:
+            squares = np.zeros(len(block) + 1)
+            np.multiply(shifted, shifted, out=shifted)
+            np.cumsum(shifted, out=squares[1:])
+        block_missing = has_missing and missing[first_row:stop].any()
+        if block_missing:
+            gaps = np.zeros(len(block) + 1, dtype=np.int64)
+            np.cumsum(missing[first_row:stop], out=gaps[1:])
+        if has_repeats:
+            # Length of the run of identical values ending at each row
+            rows = np.arange(len(block))
+            run_start = np.where(np.concatenate(([True], block[1:] != block[:-1])), rows, 0)
+            np.maximum.accumulate(run_start, out=run_start)
+            runs = rows - run_start + 1
+            longest_run = runs.max()
+
+        for col, period in enumerate(periods):
+            first = max(start, period - 1)
+            if first >= stop:
+                continue
+            if period == 1:
+                mean[first:stop, col] = x[first:stop]
+                continue
+
+            # Prefix-sum rows bracketing each window ending in first..stop-1
+            high = slice(first - first_row + 1, stop - first_row + 1)
+            low = slice(high.start - period, high.stop - period)
+
+            # Written in place: out_mean holds the window sums first
+            out_mean = mean[first:stop, col]
+            np.subtract(sums[high], sums[low], out=out_mean)
+            if variance:
+                # (sum of squares - sum**2 / period) / (period - 1)
+                out_var = var[first:stop, col]
+                correction = scratch[:stop - first]
+                np.multiply(out_mean, out_mean, out=correction)
+                correction /= period
+                np.subtract(squares[high], squares[low], out=out_var)
+                out_var -= correction
+                out_var /= period - 1
+                np.maximum(out_var, 0.0, out=out_var)
+            out_mean /= period
+            out_mean += reference
+
+            if block_missing:
+                incomplete = np.flatnonzero(gaps[high] - gaps[low] > 0) + first
+                mean[incomplete, col] = np.nan
+                if variance:
+                    var[incomplete, col] = np.nan
+            if has_repeats and longest_run >= period:
+                constant = np.flatnonzero(runs[first - first_row:stop - first_row] >= period) + first
+                mean[constant, col] = x[constant]
+                if variance:
+                    var[constant, col] = 0.0
+
+    return mean, var
+
+
+def sma_windows(values, periods) -> np.ndarray:
+    """
+    Simple Moving Averages of one series for many periods at once
+
+    Args:
+        values: 1-D series
+        periods: Window lengths
+
+    Returns:
+        (bars x periods) array, column j equal to sma(values, periods[j])
+        up to floating-point rounding
+    """
+    mean, _ = _window_family(values, periods, variance=False)
+    return mean
+
+
+def bollinger_windows(values, periods) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling mean and sample standard deviation for many periods at once
+
+    Bands for any std_dev multiplier follow by broadcasting, e.g. for
+    multipliers k of shape (K,): upper = mean[:, :, None] + std[:, :, None] * k.
+
+    Returns:
+        (mean, std), each a (bars x periods) array
+    """
+    mean, var = _window_family(values, periods, variance=True)
+    return mean, np.sqrt(var, out=var)
+
+
+def rsi_windows(values, periods) -> np.ndarray:
+    """
+    RSI (simple rolling averages, as rsi()) of one series for many periods at once
+
+    Returns:
+        (bars x periods) array
+    """
+    x = np.asarray(values, dtype=float)
+    delta = np.zeros_like(x)
+    delta[1:] = x[1:] - x[:-1]
+    avg_gain, _ = _window_family(np.fmax(delta, 0.0), periods, variance=False)
+    avg_loss, _ = _window_family(np.fmax(-delta, 0.0), periods, variance=False)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+# --- Signal comparisons -----------------------------------------------------
+#
+# Different kernels round the same average differently in the last bits, so
+# on tick-rounded prices a short and long SMA (or an RSI and its threshold)
+# that are equal or nearly so can compare either way depending on the kernel.
+# Comparisons closer than TIE_TOLERANCE (PERCENT_B_TOLERANCE for %B) are
+# settled from the window values (the float prices as given) in exact
+# rational arithmetic, which gives the same signals whichever kernel produced
+# the indicator (compiled, NumPy, window family or streaming).
+
+# Relative gap under which two values are compared exactly: over 1000x the
+# rounding of any rolling mean or RSI kernel (the window families drift
+# furthest, under 1e-9), yet rarely reached outside true ties
+TIE_TOLERANCE = 1e-6
+
+# %B carries the rounding of the variance, which the window families' sums
+# of squares amplify on low-volatility windows (up to ~1e-6 absolute), so
+# it is compared exactly within a wider band
+PERCENT_B_TOLERANCE = 1e-4
+
+
+def _near_cutoff(values: np.ndarray, cutoff, tolerance: float) -> np.ndarray:
+    """Where values are within tolerance (relative) of a fixed cutoff"""
+    cutoff = np.asarray(cutoff, dtype=float)
+    margin = tolerance * np.abs(cutoff)
+    return (values >= cutoff - margin) & (values <= cutoff + margin)
+
+
+def _compare(a, b) -> Tuple[np.ndarray, np.ndarray]:
+    """int8 sign of a - b (0 for NaN), and where a and b are within TIE_TOLERANCE (relative)"""
+    gap = np.subtract(a, b)
+    sign = (gap > 0).view(np.int8) - (gap < 0).view(np.int8)
+    np.abs(gap, out=gap)
+    return sign, gap <= TIE_TOLERANCE * np.abs(a)
+
+
+def _sign(value) -> int:
+    return (value > 0) - (value < 0)
+
+
+def _integer_sums(values, squares: bool = False) -> Tuple[int, int, int, int]:
+    """
+    Exact sums of floats as integers over a common denominator
+
+    Returns:
+        (total, sum of squares (0 unless squares), last value, denominator):
+        the sum is total / denominator, the sum of squares squares / denominator**2
+    """
+    # Floats are integers over powers of two: scale them to the largest one
+    ratios = [value.as_integer_ratio() for value in values]
+    denominator = max(d for _, d in ratios)
+    scaled = [n * (denominator // d) for n, d in ratios]
+    return sum(scaled), sum(n * n for n in scaled) if squares else 0, scaled[-1], denominator
+
+
+def _mean_order(short_sums, short_n: int, long_sums, long_n: int) -> int:
+    """Sign of short mean - long mean from _integer_sums of the two windows"""
+    return _sign(short_sums[0] * long_sums[3] * long_n - long_sums[0] * short_sums[3] * short_n)
+
+
+def _rsi_order(gain_sums, loss_sums, cutoff: float) -> Optional[int]:
+    """Sign of RSI - cutoff from _integer_sums of gains and losses (None where price never moved)"""
+    gain, loss = gain_sums[0] * loss_sums[3], loss_sums[0] * gain_sums[3]
+    if gain == 0 and loss == 0:
+        return None
+    # 100 * gain / (gain + loss) - cutoff has the sign of (100 - cutoff) * gain - cutoff * loss
+    numerator, denominator = cutoff.as_integer_ratio()
+    return _sign((100 * denominator - numerator) * gain - numerator * loss)
+
+
+def _percent_b_order(sums, n: int, std_dev: float, cutoff: float) -> int:
+    """
+    Sign of Bollinger %B - cutoff from _integer_sums (with squares) of the window
+
+    %B - cutoff has the sign of (close - mean) - (2 * cutoff - 1) * std_dev * std,
+    settled by comparing squares, so no square root is taken.
+    """
+    total, squares, last, _ = sums
+    offset = n * last - total  # (close - mean) * n * denominator
+    spread = n * squares - total * total  # variance * n * (n - 1) * denominator**2
+
+    cutoff_n, cutoff_d = cutoff.as_integer_ratio()
+    std_n, std_d = float(std_dev).as_integer_ratio()
+    scale_n, scale_d = (2 * cutoff_n - cutoff_d) * std_n, cutoff_d * std_d
+
+    # Sign of offset - scale * sqrt(spread * n / (n - 1)), comparing squares
+    # when both sides share a sign
+    offset_sign = _sign(offset)
+    band_sign = _sign(scale_n) if spread > 0 else 0
+    if offset_sign != band_sign:
+        return _sign(offset_sign - band_sign)
+    return offset_sign * _sign(offset * offset * (n - 1) * scale_d * scale_d - scale_n * scale_n * spread * n)
+
+
+def exact_mean_order(short_window, long_window) -> int:
+    """Sign of mean(short_window) - mean(long_window), computed exactly"""
+    return _mean_order(_integer_sums(short_window), len(short_window), _integer_sums(long_window), len(long_window))
+
+
+def exact_rsi_order(gains, losses, cutoff: float) -> Optional[int]:
+    """Sign of the RSI of one window of gains and losses minus cutoff, computed exactly (None for NaN)"""
+    return _rsi_order(_integer_sums(gains), _integer_sums(losses), float(cutoff))
+
+
+def exact_percent_b_order(window, std_dev: float, cutoff: float) -> int:
+    """Sign of Bollinger %B - cutoff for the close ending window, computed exactly"""
+    return _percent_b_order(_integer_sums(window, squares=True), len(window), std_dev, float(cutoff))
+
+
+def _columns(array: np.ndarray, parameter) -> np.ndarray:
+    """A per-column parameter (scalar or (configs,)) as one value per column of array"""
+    n_cols = array.shape[1] if array.ndim == 2 else 1
+    return np.broadcast_to(np.asarray(parameter), (n_cols,))
+
+
+def _cells(mask: np.ndarray):
+    """(row, column) of every True cell, column 0 for 1-D masks"""
+    n_cols = mask.shape[1] if mask.ndim == 2 else 1
+    for index in np.flatnonzero(mask):
+        yield divmod(int(index), n_cols)
+
+
+def _window_sums(x: np.ndarray, squares: bool = False):
+    """_integer_sums of the window of period values ending at row (memoized per call)"""
+    sums = {}
+
+    def window_sums(row, period):
+        key = (row, period)
+        if key not in sums:
+            sums[key] = _integer_sums(x[row - period + 1:row + 1].tolist(), squares)
+        return sums[key]
+
+    return window_sums
+
+
+def threshold_signals(values, buy_below, sell_above, exact_order=None,
+                      tolerance: float = TIE_TOLERANCE) -> np.ndarray:
+    """
+    1 where values < buy_below, -1 where values > sell_above, else 0 (NaN gives 0)
+
+    Thresholds broadcast against values, so one call turns a (bars x configs)
+    indicator matrix and per-config cutoffs of shape (configs,) into signals.
+
+    Args:
+        values: Indicator array (bars,) or (bars x configs)
+        buy_below: Buy cutoffs (scalar or (configs,))
+        sell_above: Sell cutoffs (scalar or (configs,))
+        exact_order: Optional callable (row, column, cutoff) -> sign of the
+            exact indicator value minus cutoff (None where it is NaN), used
+            for cells within tolerance of a cutoff
+        tolerance: Relative distance from a cutoff settled by exact_order
+
+    Returns:
+        int8 array of signals
+    """
+    values = np.asarray(values)
+    signal = np.where(values > sell_above, np.int8(-1), (values < buy_below).view(np.int8))
+
+    if exact_order is not None:
+        tied = _near_cutoff(values, buy_below, tolerance)
+        tied |= _near_cutoff(values, sell_above, tolerance)
+        if tied.any():
+            buy, sell = _columns(values, buy_below), _columns(values, sell_above)
+            cells = signal.reshape(len(signal), -1)
+            for row, col in _cells(tied):
+                below = exact_order(row, col, float(buy[col]))
+                if below is None:
+                    cells[row, col] = 0
+                elif exact_order(row, col, float(sell[col])) > 0:
+                    cells[row, col] = -1
+                else:
+                    cells[row, col] = 1 if below < 0 else 0
+
+    return signal
+
+
+def crossover_signals(values, short, long, short_period, long_period) -> np.ndarray:
+    """
+    1 where short > long, -1 where short < long, else 0, for two SMAs of values
+
+    Args:
+        values: 1-D prices the averages were taken over
+        short: Short SMA array (bars,) or (bars x configs)
+        long: Long SMA array like short
+        short_period: Short window length (scalar or (configs,))
+        long_period: Long window length (scalar or (configs,))
+
+    Returns:
+        int8 array of signals (near-ties settled from exact window sums)
+    """
+    short = np.asarray(short, dtype=float)
+    long = np.asarray(long, dtype=float)
+    signal, tied = _compare(short, long)
+
+    short_periods, long_periods = _columns(short, short_period), _columns(short, long_period)
+    if tied.ndim == 2:
+        # Equal periods give identical columns, already 0
+        tied[:, short_periods == long_periods] = False
+    elif short_periods[0] == long_periods[0]:
+        tied[:] = False
+
+    if tied.any():
+        window_sums = _window_sums(np.asarray(values, dtype=float))
+        cells = signal.reshape(len(signal), -1)
+        for row, col in _cells(tied):
+            short_n, long_n = int(short_periods[col]), int(long_periods[col])
+            cells[row, col] = _mean_order(window_sums(row, short_n), short_n, window_sums(row, long_n), long_n)
+
+    return signal
+
+
+def rsi_signals(values, rsi_values, period, buy_below, sell_above) -> np.ndarray:
+    """
+    threshold_signals on the simple RSI of values, near-threshold cells settled exactly
+
+    Args:
+        values: 1-D prices the RSI was taken over
+        rsi_values: RSI array (bars,) or (bars x configs), as rsi() or rsi_windows()
+        period: RSI period (scalar or (configs,))
+        buy_below: Buy cutoffs (scalar or (configs,))
+        sell_above: Sell cutoffs (scalar or (configs,))
+
+    Returns:
+        int8 array of signals
+    """
+    periods = _columns(np.asarray(rsi_values), period)
+    gain_sums = loss_sums = None
+
+    def exact_order(row, col, cutoff):
+        nonlocal gain_sums, loss_sums
+        if gain_sums is None:
+            # Gains and losses as rsi() takes them, built on the first near-tie
+            x = np.asarray(values, dtype=float)
+            delta = np.zeros_like(x)
+            delta[1:] = x[1:] - x[:-1]
+            gain_sums, loss_sums = _window_sums(np.fmax(delta, 0.0)), _window_sums(np.fmax(-delta, 0.0))
+        n = int(periods[col])
+        return _rsi_order(gain_sums(row, n), loss_sums(row, n), cutoff)
+
+    return threshold_signals(rsi_values, buy_below, sell_above, exact_order)
+
+
+def percent_b_signals(values, percent_b, period, std_dev, buy_below=0.2, sell_above=0.8) -> np.ndarray:
+    """
+    threshold_signals on Bollinger %B of values, near-cutoff cells settled exactly
+
+    Args:
+        values: 1-D prices the bands were taken over
+        percent_b: %B array (bars,) or (bars x configs)
+        period: Band period (scalar or (configs,))
+        std_dev: Band width in standard deviations (scalar or (configs,))
+        buy_below: Buy cutoff
+        sell_above: Sell cutoff
+
+    Returns:
+        int8 array of signals
+    """
+    percent_b = np.asarray(percent_b)
+    periods, std_devs = _columns(percent_b, period), _columns(percent_b, std_dev)
+    window_sums = _window_sums(np.asarray(values, dtype=float), squares=True)
+
+    def exact_order(row, col, cutoff):
+        n = int(periods[col])
+        return _percent_b_order(window_sums(row, n), n, float(std_devs[col]), cutoff)
+
+    return threshold_signals(percent_b, buy_below, sell_above, exact_order, PERCENT_B_TOLERANCE)
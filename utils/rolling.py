@@ -0,0 +1,298 @@
+"""O(1) rolling-state indicators for bar-by-bar (streaming) updates
+
+Each indicator keeps only the state needed to produce its next value, so
+adding a bar costs the same no matter how much history came before. The add
+and remove steps follow pandas' rolling window algorithms (compensated sums,
+Welford variance, exact results for runs of identical values), so a stream
+of updates yields the same numbers as pandas' .rolling() (to floating-point
+noise for the standard deviation).
+
+The batch strategies use the kernels in utils.indicators, which can differ
+from these values in the last bits. Signals therefore do not compare the
+rounded values at near-ties: both sides settle them exactly from the window
+contents (see utils.indicators.TIE_TOLERANCE), so the streaming strategies
+emit the same signals as the batch ones.
+"""
+
+import math
+from collections import deque
+
+NAN = float('nan')
+
+
+class RollingMean:
+    """Simple Moving Average over the last `period` values"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        """Forget all history"""
+        self.window = deque()
+        self.nobs = 0
+        self.sum = 0.0
+        self.neg_count = 0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.same_count = 0
+        self.prev_value = NAN
+        self.value = NAN
+
+    def _add(self, x):
+        if x != x:
+            return
+        self.nobs += 1
+        y = x - self.comp_add
+        t = self.sum + y
+        self.comp_add = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, x) < 0:
+            self.neg_count += 1
+
+        # Track runs of identical values (mean is then exactly that value)
+        if x == self.prev_value:
+            self.same_count += 1
+        else:
+            self.same_count = 1
+        self.prev_value = x
+
+    def _remove(self, x):
+        if x != x:
+            return
+        self.nobs -= 1
+        y = -x - self.comp_remove
+        t = self.sum + y
+        self.comp_remove = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, x) < 0:
+            self.neg_count -= 1
+
+    def update(self, x: float) -> float:
+        """Add a value and return the current mean (NaN until the window is full)"""
+
+        x = float(x)
+        self.window.append(x)
+
+        if len(self.window) == 1 or self.period == 1:
+            # Fresh window: start from scratch like the first pandas window
+            if len(self.window) > self.period:
+                self.window.popleft()
+            self.nobs = 0
+            self.sum = self.comp_add = self.comp_remove = 0.0
+            self.neg_count = 0
+            self.same_count = 0
+            self.prev_value = self.window[0]
+            for value in self.window:
+                self._add(value)
+        else:
+            if len(self.window) > self.period:
+                self._remove(self.window.popleft())
+            self._add(x)
+
+        if len(self.window) >= self.period and self.nobs > 0:
+            result = self.sum / self.nobs
+            if self.same_count >= self.nobs:
+                result = self.prev_value
+            elif self.neg_count == 0 and result < 0:
+                result = 0.0
+            elif self.neg_count == self.nobs and result > 0:
+                result = 0.0
+        else:
+            result = NAN
+
+        self.value = result
+        return result
+
+
+class RollingStd:
+    """Rolling sample standard deviation (ddof=1) over the last `period` values"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        """Forget all history"""
+        self.window = deque()
+        self.nobs = 0
+        self.mean = 0.0
+        self.ssqdm = 0.0  # Sum of squared differences from the mean
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.same_count = 0
+        self.prev_value = NAN
+        self.value = NAN
+
+    def _add(self, x):
+        if x != x:
+            return
+        if x == self.prev_value:
+            self.same_count += 1
+        else:
+            self.same_count = 1
+        self.prev_value = x
+
+        # Welford update with compensation
+        self.nobs += 1
+        prev_mean = self.mean - self.comp_add
+        y = x - self.comp_add
+        t = y - self.mean
+        self.comp_add = t + self.mean - y
+        self.mean = self.mean + t / self.nobs
+        self.ssqdm = self.ssqdm + (x - prev_mean) * (x - self.mean)
+
+    def _remove(self, x):
+        if x != x:
+            return
+        self.nobs -= 1
+        if self.nobs:
+            prev_mean = self.mean - self.comp_remove
+            y = x - self.comp_remove
+            t = y - self.mean
+            self.comp_remove = t + self.mean - y
+            self.mean = self.mean - t / self.nobs
+            self.ssqdm = self.ssqdm - (x - prev_mean) * (x - self.mean)
+        else:
+            self.mean = 0.0
+            self.ssqdm = 0.0
+
+    def update(self, x: float) -> float:
+        """Add a value and return the current std (NaN until the window is full)"""
+
+        x = float(x)
+        self.window.append(x)
+
+        if len(self.window) == 1 or self.period == 1:
+            if len(self.window) > self.period:
+                self.window.popleft()
+            self.nobs = 0
+            self.mean = self.ssqdm = self.comp_add = self.comp_remove = 0.0
+            self.same_count = 0
+            self.prev_value = self.window[0]
+            for value in self.window:
+                self._add(value)
+        else:
+            if len(self.window) > self.period:
+                self._remove(self.window.popleft())
+            self._add(x)
+
+        if len(self.window) >= self.period and self.nobs > 1:
+            if self.same_count >= self.nobs:
+                variance = 0.0
+            else:
+                variance = self.ssqdm / (self.nobs - 1)
+            result = math.sqrt(variance) if variance > 0 else 0.0
+        else:
+            result = NAN
+
+        self.value = result
+        return result
+
+
+class RollingRSI:
+    """
+    Relative Strength Index (0-100)
+
+    method='simple' averages gains and losses over a rolling window (the
+    formula used by RSIMeanReversion and DataAnalyzer.add_rsi); method='wilder'
+    uses Wilder's smoothing (seeded with a simple average of the first period).
+    """
+
+    def __init__(self, period: int = 14, method: str = 'simple'):
+        if method not in ('simple', 'wilder'):
+            raise ValueError(f"Unknown RSI method: {method}")
+        self.period = period
+        self.method = method
+        self.reset()
+
+    def reset(self):
+        """Forget all history"""
+        self.prev_close = None
+        self.avg_gain = RollingMean(self.period)
+        self.avg_loss = RollingMean(self.period)
+        self.wilder_gain = NAN
+        self.wilder_loss = NAN
+        self.count = 0
+        self.value = NAN
+
+    def update(self, close: float) -> float:
+        """Add a closing price and return the current RSI (NaN during warm-up)"""
+
+        close = float(close)
+
+        # First bar has no change; batch RSI treats it as zero gain and loss
+        delta = 0.0 if self.prev_close is None else close - self.prev_close
+        self.prev_close = close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if self.method == 'simple':
+            avg_gain = self.avg_gain.update(gain)
+            avg_loss = self.avg_loss.update(loss)
+        else:
+            self.count += 1
+            if self.count <= self.period:
+                # Seed with a simple average of the first period
+                avg_gain = self.avg_gain.update(gain)
+                avg_loss = self.avg_loss.update(loss)
+                self.wilder_gain, self.wilder_loss = avg_gain, avg_loss
+            else:
+                self.wilder_gain = (self.wilder_gain * (self.period - 1) + gain) / self.period
+                self.wilder_loss = (self.wilder_loss * (self.period - 1) + loss) / self.period
+                avg_gain, avg_loss = self.wilder_gain, self.wilder_loss
+
+        self.value = _rsi_from_averages(avg_gain, avg_loss)
+        return self.value
+
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    """RSI = 100 - 100 / (1 + avg_gain / avg_loss), with NumPy's division semantics"""
+
+    if avg_gain != avg_gain or avg_loss != avg_loss:
+        return NAN
+    if avg_loss == 0:
+        if avg_gain == 0:
+            return NAN
+        return 100.0  # rs = inf
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+class RollingPercentB:
+    """Bollinger %B: where the close sits between the lower (0) and upper (1) band"""
+
+    def __init__(self, period: int = 20, std_dev: float = 2):
+        self.period = period
+        self.std_dev = std_dev
+        self.reset()
+
+    def reset(self):
+        """Forget all history"""
+        self.middle = RollingMean(self.period)
+        self.std = RollingStd(self.period)
+        self.upper = NAN
+        self.lower = NAN
+        self.value = NAN
+
+    def update(self, close: float) -> float:
+        """Add a closing price and return the current %B (NaN during warm-up)"""
+
+        close = float(close)
+        middle = self.middle.update(close)
+        std = self.std.update(close)
+
+        self.upper = middle + (std * self.std_dev)
+        self.lower = middle - (std * self.std_dev)
+        band_width = self.upper - self.lower
+        position = close - self.lower
+
+        # Mirror NumPy division (x/0 = +-inf, 0/0 = NaN)
+        if band_width == 0:
+            if position == 0 or position != position:
+                self.value = NAN
+            else:
+                self.value = math.copysign(math.inf, position)
+        else:
+            self.value = position / band_width
+        return self.value
@@ -6,6 +6,7 @@ from utils.analysis import DataAnalyzer
 from strategies.bollinger_bands import BollingerBands
 from strategies.moving_average import MovingAverageCrossover
 from backtesting.engine import Backtester
+from backtesting.result_store import ResultStore
 from datetime import datetime, timedelta
 import pandas as pd
 
@@ -18,7 +19,9 @@ symbol = 'NVDA'
 df = analyzer.get_df(symbol, start, end, interval='1d')
 
 # Run backtests
-backtester = Backtester(initial_capital=10000, commission=0.001, slippage=0.001)
+# Runs stored by one script are reused by the other (same data, same settings)
+backtester = Backtester(initial_capital=10000, commission=0.001, slippage=0.001,
+                        result_store=ResultStore())
 
 strategies = [
     BollingerBands(period=10, std_dev=2),